@@ -0,0 +1,57 @@
+"""
+File Name: __init__.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: PyImOGuizmo, an interactive orientation gizmo for ImGui in Python.
+
+             The Camera and the view matrix math (camera.py) only need glm and
+             are imported with the package. The gizmo itself (gizmo.py) needs
+             imgui_bundle, and is only imported the first time one of its names
+             is accessed, e.g. `PyImOGuizmo.config` or `PyImOGuizmo.draw_gizmo`
+             (PEP 562). The global GizmoConfig is built then too, so a script
+             that only uses the Camera never loads ImGui (nor NumPy, unless
+             its math backend is selected, see math_backend.py):
+
+                 import PyImOGuizmo
+                 camera = PyImOGuizmo.Camera(16 / 9)   # imgui_bundle not imported
+
+TODO:
+    -
+"""
+
+import importlib
+
+from .camera import (Camera, DEFAULT_POSITION, DEFAULT_YAW, DEFAULT_PITCH,
+                     DEFAULT_AXIS_UP, DEFAULT_AXIS_RIGHT, DEFAULT_AXIS_FORWARD, PITCH_MAX,
+                     extract_vectors_from_view_matrix, compute_euler_angles_from_view_matrix, build_view_matrix)
+from .math_backend import GlmBackend, NumpyBackend, get_math_backend, set_math_backend, backend_of, to_glm
+
+
+
+def __getattr__(name):
+    """
+    Loads the gizmo module on first access to a name not defined yet, and
+    keeps the name in the package so the next access is a plain lookup.
+    """
+
+    if name.startswith('__'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    gizmo = importlib.import_module('.gizmo', __name__)
+
+    try:
+        value = getattr(gizmo, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    globals()[name] = value
+    return value
+
+
+
+def __dir__():
+
+    names = set(globals())
+    names.update(name for name in vars(importlib.import_module('.gizmo', __name__)) if not name.startswith('__'))
+    return sorted(names)
@@ -0,0 +1,349 @@
+"""
+File Name: camera.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the Camera of PyImOGuizmo and the view
+             matrix math of the gizmo. It only needs glm, not ImGui, so
+             batch scripts and worker processes can import it (through
+             `import PyImOGuizmo`) without loading imgui_bundle.
+
+TODO:
+    -
+"""
+
+import glm
+import math
+
+from .math_backend import get_math_backend, backend_of
+
+
+DEFAULT_POSITION = (0, 0, 10)
+DEFAULT_YAW      = -90
+DEFAULT_PITCH    = 0
+
+DEFAULT_AXIS_UP      = glm.vec3( 0,  1,   0)
+DEFAULT_AXIS_RIGHT   = glm.vec3( 1,  0,   0)
+DEFAULT_AXIS_FORWARD = glm.vec3( 0,  0,  -1)
+
+PITCH_MAX = 89.9 # degrees
+
+
+class Camera:
+    """
+    Camera class
+
+    Orbits around its target. Its vectors and matrices are those of its math
+    backend (see math_backend.py): glm objects by default, or float32 NumPy
+    arrays with `backend="numpy"` (or after `set_math_backend("numpy")`).
+    
+    The projection is perspective or, with `orthographic`, orthographic and
+    `ortho_size` high (half the visible height, in world units). It is only
+    rebuilt when one of its parameters changed, see `get_projection_matrix()`.
+    """
+    
+    def __init__(self, aspect_ratio, position = DEFAULT_POSITION, yaw=DEFAULT_YAW, pitch=DEFAULT_PITCH, backend=None):
+        
+        self.backend = get_math_backend(backend)
+                
+        self.aspect_ratio = aspect_ratio
+        
+        self.position = self.backend.vec3(position)
+        self.up       = self.backend.vec3(DEFAULT_AXIS_UP)
+        self.right    = self.backend.vec3(DEFAULT_AXIS_RIGHT)
+        self.forward  = self.backend.vec3(DEFAULT_AXIS_FORWARD)
+        self._up      = self.backend.vec3( 0, 1, 0) # World Up Vector
+        self.target   = self.backend.vec3( 0, 0, 0)
+        
+        self.yaw      = yaw
+        self.pitch    = pitch
+
+        self.FOV         = 60.0  # deg
+        self.NEAR        = 0.1
+        self.FAR         = 1000.0
+        self.SPEED       = 0.005
+        self.SENSITIVITY = 0.001 #0.04
+        
+        self._orthographic = False
+        self.ortho_size    = self.get_distance() * math.tan(math.radians(self.FOV) * 0.5)
+        
+        self._projection     = None
+        self._projection_key = None
+
+        self.update_camera_vectors()
+        self.m_view = self.get_view_matrix()
+        self.m_proj = self.get_projection_matrix()
+                
+        
+    def rotate(self, rel_x, rel_y):
+        
+        self.yaw   += rel_x * self.SENSITIVITY
+        self.pitch -= rel_y * self.SENSITIVITY
+        self.pitch  = max(-89, min(89, self.pitch))
+        
+
+
+    def update(self, delta_time): 
+        self._velocity = self.SPEED * delta_time
+        self.update_camera_vectors()
+        self.m_view = self.get_view_matrix()
+        self.m_proj = self.get_projection_matrix()
+        
+        
+    def update_camera_vectors(self):
+        
+        self.pitch = glm.clamp(self.pitch, -PITCH_MAX, PITCH_MAX)
+        yaw    = glm.radians(self.yaw) 
+        pitch  = glm.radians(self.pitch)
+
+        forward = self.backend.vec3(glm.cos(yaw) * glm.cos(pitch),
+                                    glm.sin(pitch),
+                                    glm.sin(yaw) * glm.cos(pitch))
+
+        self.forward = self.backend.normalize(forward) 
+        self.right   = self.backend.normalize( self.backend.cross( self.forward, self._up ) )
+        self.up      = self.backend.normalize( self.backend.cross( self.right, self.forward ) ) 
+        
+        
+    def rotate_pich(self, delta_pitch):
+        self.pitch -= delta_pitch
+        self.pitch = glm.clamp(self.pitch, -PITCH_MAX, PITCH_MAX)
+        
+        
+    def rotate_yaw(self, delta_yaw):
+            self.yaw +=delta_yaw
+        
+        
+    def move_forward(self):
+        self.position += self.forward * self._velocity
+        
+            
+    def move_backward(self):
+        self.position -= self.forward * self._velocity
+
+    
+    def move_right(self):
+        self.position += self.right * self._velocity
+    
+    
+    def move_left(self):
+        self.position -= self.right * self._velocity
+
+
+    def move_up(self):
+        self.position += self.up * self._velocity
+        
+        
+    def move_down(self):
+        self.position -= self.up * self._velocity
+
+    
+    def get_view_matrix(self):
+        # return glm.lookAt(self.position, self.position + self.forward, self._up)
+        return self.backend.look_at(self.target + self.forward * self.get_distance(), self.target, self.up)
+        
+    
+    @property
+    def orthographic(self) -> bool:
+        return self._orthographic
+    
+    
+    @orthographic.setter
+    def orthographic(self, value:bool):
+        """
+        Switches the projection. The plane of the target keeps its size on
+        screen: the orthographic view is as high as the perspective one is
+        at the target, and back in perspective the camera is moved to the
+        distance where it is as high as the orthographic view was.
+        """
+        
+        value = bool(value)
+        if value == self._orthographic:
+            return
+        
+        tan_half_fov = math.tan(math.radians(self.FOV) * 0.5)
+        
+        if value:
+            self.ortho_size = self.get_distance() * tan_half_fov
+        else:
+            self._set_distance(self.ortho_size / tan_half_fov)
+            
+        self._orthographic = value
+        
+
+    def get_projection_matrix(self):
+        """
+        Returns the projection matrix. It is cached, and only rebuilt when the
+        mode, the zoom (`FOV` or `ortho_size`), the aspect ratio or the clip
+        planes changed. The matrix is shared, do not modify it.
+        """
+        
+        key = (self._orthographic, self.ortho_size if self._orthographic else self.FOV, 
+               self.aspect_ratio, self.NEAR, self.FAR)
+        
+        if key != self._projection_key:
+            
+            if self._orthographic:
+                half_height = self.ortho_size
+                half_width  = self.ortho_size * self.aspect_ratio
+                self._projection = self.backend.ortho(-half_width, half_width, -half_height, half_height, self.NEAR, self.FAR)
+            else:
+                self._projection = self.backend.perspective(glm.radians(self.FOV), self.aspect_ratio, self.NEAR, self.FAR)
+                
+            self._projection_key = key
+            
+        return self._projection
+    
+    
+    def zoom_to_fit(self, bounds_min, bounds_max, margin:float=0.05) -> bool:
+        """
+        Frames a set of axis aligned bounding boxes without rotating the view:
+        the target is moved to their center and the zoom (`ortho_size`, and
+        the distance for the perspective projection) set to the tightest one 
+        showing all of them, in both projections.
+        
+        The corners of all the boxes are projected onto the axes of the view 
+        in one vectorized pass, so it takes as long for one box as for a 
+        scene of thousands. It needs NumPy, imported on the first call.
+        
+        Args:
+            bounds_min (array_like): The (N, 3) minimum corners of the boxes.
+            bounds_max (array_like): The (N, 3) maximum corners of the boxes.
+            margin (float, optional): Extra space around them, a fraction of
+                                      the extent.
+        
+        Returns:
+            bool: False if there was nothing to fit.
+        """
+        
+        import numpy as np
+        
+        bounds_min = np.asarray(bounds_min, dtype='f8').reshape(-1, 3)
+        bounds_max = np.asarray(bounds_max, dtype='f8').reshape(-1, 3)
+        if len(bounds_min) == 0:
+            return False
+        
+        # The 8 corners of every box, (N, 8, 3)
+        selectors = np.array([((i >> 2) & 1, (i >> 1) & 1, i & 1) for i in range(8)], dtype=bool)
+        corners   = np.where(selectors, bounds_max[:, None, :], bounds_min[:, None, :]).reshape(-1, 3)
+        
+        # Their coordinates along the right, up and forward axes of the view
+        axes   = np.array((tuple(self.right), tuple(self.up), tuple(self.forward)), dtype='f8')
+        target = np.array(tuple(self.target), dtype='f8')
+        
+        projected = (corners - target) @ axes.T
+        low       = projected.min(axis=0)
+        high      = projected.max(axis=0)
+        
+        middle      = 0.5 * (low + high)
+        half_extent = 0.5 * (high - low) * (1.0 + margin)
+        
+        self.ortho_size = max(half_extent[1], half_extent[0] / self.aspect_ratio, 1e-6)
+        
+        # The closest distance to the new target where every corner is within
+        # the field of view: a corner `z` closer than the target, `x` and `y`
+        # off its center, needs `z + x / tan(fov_x / 2)` (and likewise in y)
+        tan_half_fov_y = math.tan(math.radians(self.FOV) * 0.5)
+        tan_half_fov_x = tan_half_fov_y * self.aspect_ratio
+        
+        relative = (projected - middle) * (1.0 + margin, 1.0 + margin, 1.0)
+        needed   = relative[:, 2] + np.maximum(np.abs(relative[:, 0]) / tan_half_fov_x, 
+                                               np.abs(relative[:, 1]) / tan_half_fov_y)
+        distance = max(needed.max(), relative[:, 2].max() + self.NEAR)
+        
+        self._set_distance(distance, self.backend.vec3(*(target + middle @ axes).tolist()))
+        return True
+    
+    
+    def _set_distance(self, distance:float, target=None):
+        """
+        Moves the camera to `distance` from its target (or a new one), on the 
+        same side of it.
+        """
+        
+        offset = self.position - self.target
+        length = self.get_distance()
+        
+        if target is not None:
+            self.target = target
+        
+        if length > 0.0:
+            self.position = self.target + offset * (distance / length)
+        else:
+            self.position = self.target - self.forward * distance
+        
+
+    def get_distance(self):    
+        return math.dist(self.position, self.target)
+        
+    
+    def reset_model_view(self, position=DEFAULT_POSITION, pitch=DEFAULT_PITCH, yaw=DEFAULT_YAW):
+        self.position = self.backend.vec3(position)
+        self.up       = self.backend.vec3(DEFAULT_AXIS_UP)
+        self.right    = self.backend.vec3(DEFAULT_AXIS_RIGHT)
+        self.forward  = self.backend.vec3(DEFAULT_AXIS_FORWARD)
+        self.yaw      = yaw
+        self.pitch    = pitch
+        
+
+
+
+def extract_vectors_from_view_matrix(view_matrix):
+    """
+    Extracts the right, up, and forward vectors from a view matrix.
+
+    Args:
+        view_matrix (glm.mat4): The view matrix, of any math backend.
+
+    Returns:
+        tuple: A tuple containing the right, up, and forward vectors, in the backend of the matrix.
+    """
+    
+    backend = backend_of(view_matrix)
+    
+    right   = backend.vec3(view_matrix[0][0], view_matrix[1][0], view_matrix[2][0])
+    up      = backend.vec3(view_matrix[0][1], view_matrix[1][1], view_matrix[2][1])
+    forward = backend.vec3(view_matrix[0][2], view_matrix[1][2], view_matrix[2][2])
+        
+    # right   = glm.vec3(view_matrix[0][0], view_matrix[0][1], view_matrix[0][2])
+    # up      = glm.vec3(view_matrix[1][0], view_matrix[1][1], view_matrix[1][2])
+    # forward = glm.vec3(view_matrix[2][0], view_matrix[2][1], view_matrix[2][2])
+    return right, up, forward
+
+
+def compute_euler_angles_from_view_matrix(view_matrix):
+    """
+    Computes the Euler angles (yaw, pitch, roll) from a view matrix.
+
+    Args:
+        view_matrix (glm.mat4): The view matrix.
+
+    Returns:
+        tuple: A tuple containing the Euler angles (yaw, pitch, roll) in radians.
+    """
+    
+    right, up, forward = extract_vectors_from_view_matrix(view_matrix)
+
+    forward_x, forward_y, forward_z = (float(value) for value in forward)
+    up_x, up_y, up_z                = (float(value) for value in up)
+
+    sy = math.sqrt(forward_x**2 + forward_z**2)
+    
+    if sy >1e-4: #1e-6:
+        yaw   = math.atan2(forward_z, forward_x)
+        pitch = math.atan2(-forward_y, sy)
+        roll  = math.atan2(up_y, up_x)
+    else: 
+        yaw = math.atan2(-up_z, up_x)
+        pitch = math.atan2(-forward_y, sy)
+        roll = 0
+    
+    return yaw, pitch, roll
+    
+    
+
+def build_view_matrix(eye, at, up):
+    
+    # return glm.lookAtRH(eye, at, up) if right_handed else glm.lookAtLH(eye, at, up)
+    return backend_of(eye).look_at(eye, at, up)
+    
@@ -0,0 +1,1137 @@
+"""
+File Name: gizmo.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2025-02-15
+Last Modified: 2026-10-19
+Description: This module provides functionalities for an interactive orientation 
+             gizmo for ImGui in Python. It includes classes and functions to handle 
+             camera movements, rotations, and view matrix generations, as well as 
+             drawing and interacting with gizmo elements. 
+             
+             The Camera and the view matrix math live in camera.py, which
+             does not import ImGui. This module is loaded on first access
+             to any of its names through the package (see __init__.py).
+             
+TODO: 
+    - Fix draw_gizmo() [DONE]
+    - Clean Up the code
+    - Use quaternions for the rotations
+    - Add option to setup the Y or Z axis as up vector. 
+    - Add more customizations 
+"""
+
+from imgui_bundle import imgui, IM_COL32
+import glm
+import math
+import functools
+
+from .camera import Camera, extract_vectors_from_view_matrix, compute_euler_angles_from_view_matrix, build_view_matrix
+from .math_backend import backend_of, to_glm
+
+
+class LabelMetrics:
+    """
+    The font, size and offset of the axis labels, computed once per font
+    and size instead of measuring the six labels every frame.
+    
+    `update()` is called once per gizmo, and only measures them again when
+    the current font, its size (which includes the FontScale of the window 
+    and the global one) or the configured label sizes changed. The labels 
+    are drawn with `add_text(font, size, ...)`, which scales the glyphs of
+    the font (ImGui 1.92 bakes the new size into the atlas on demand), so a
+    label size never rebuilds the font atlas.
+    
+    Attributes:
+        key (tuple): What the metrics were computed for.
+        font (imgui.ImFont): The font of the labels.
+        font_sizes (dict): The font size of each label.
+        offsets (dict): The offset of each label from the center of its 
+                        handle to its top-left corner.
+    """
+    
+    POSITIVE_LABELS = ("X", "Y", "Z")
+    NEGATIVE_LABELS = ("-X", "-Y", "-Z")
+    
+    def __init__(self):
+        
+        self.key                = None
+        self.font:imgui.ImFont  = None
+        self.font_sizes:dict    = {}
+        self.offsets:dict       = {}
+        
+        
+    def update(self, positive_font_size:float=0.0, negative_font_size:float=0.0):
+        """
+        Measures the labels again if the font or the sizes changed.
+
+        Args:
+            positive_font_size (float, optional): The size of the X, Y and Z 
+                                                  labels, 0 for the size of 
+                                                  the current font.
+            negative_font_size (float, optional): The size of the -X, -Y and 
+                                                  -Z labels, 0 for the size 
+                                                  of the current font.
+        """
+        
+        font      = imgui.get_font()
+        font_size = imgui.get_font_size()
+        
+        # Before ImGui 1.92 the fonts have no id, the object stands for it (kept
+        # in self.font, so the same one is returned). The stamp of the atlas 
+        # measures them again when its fonts are rebuilt
+        key = (getattr(font, 'font_id', id(font)), _get_font_atlas_stamp(), 
+               font_size, positive_font_size, negative_font_size)
+        if key == self.key:
+            return
+        
+        self.key  = key
+        self.font = font
+        
+        for labels, label_font_size, center_y in ((self.POSITIVE_LABELS, positive_font_size, 0.5), 
+                                                  (self.NEGATIVE_LABELS, negative_font_size, 0.35)):
+            
+            label_font_size = label_font_size if label_font_size > 0.0 else font_size
+            scale           = label_font_size / font_size
+            
+            for text in labels:
+                label_size = imgui.calc_text_size(text) * scale
+                self.font_sizes[text] = label_font_size
+                self.offsets[text]    = glm.vec2(-0.5 * label_size.x, -center_y * label_size.y)
+                
+                
+    def invalidate(self):
+        """
+        Measures the labels again on the next update. A rebuilt font atlas
+        is detected by `update()`, this is for anything else that changes 
+        the glyphs, e.g. a font loader with other settings.
+        """
+        self.key = None
+        
+
+
+# Slots of each axis in GizmoConfig.color_table
+COLOR_FRONT               = 0
+COLOR_BACK                = 1
+COLOR_NEGATIVE_FRONT_FILL = 2
+COLOR_NEGATIVE_BACK_FILL  = 3
+
+NEGATIVE_FILL_OPACITY = 0.3
+
+AXIS_LABELS = ("X", "Y", "Z", "-X", "-Y", "-Z")
+
+# The selection of the center of the gizmo, after the six handles
+HANDLE_CENTER = 6
+
+
+class _GizmoColor:
+    """
+    A colour attribute of GizmoConfig. Setting it compiles the colour table
+    again, so the draw code only indexes packed values.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+        
+        
+    def __get__(self, instance, owner=None):
+        return self if instance is None else getattr(instance, self.attribute)
+    
+    
+    def __set__(self, instance, color:int):
+        setattr(instance, self.attribute, color)
+        instance.compile_colors()
+        
+        
+class GizmoConfig:
+    
+    mColorWhite          = _GizmoColor()
+    mColorBlack          = _GizmoColor()
+    x_circle_front_color = _GizmoColor()
+    x_circle_back_color  = _GizmoColor()
+    y_circle_front_color = _GizmoColor()
+    y_circle_back_color  = _GizmoColor()
+    z_circle_front_color = _GizmoColor()
+    z_circle_back_color  = _GizmoColor()
+    hover_circle_color   = _GizmoColor()
+    
+    def __init__(self):
+        
+        self.mDrawList:imgui.ImDrawList = None
+        self.mID                        = "imoguizmo"
+        
+        # (min, max) screen rectangle to clip the gizmo to, see begin_overlay()
+        self.clip_rect:tuple            = None
+        
+        self.mX:float             = 0.0
+        self.mY:float             = 0.0
+        self.mSize:float          = 10.0
+        
+        # Degrees per pixel dragged, for both draw_gizmo() and draw_gizmo_camera()
+        self.pitch_rotation_speed:float = 0.25
+        self.yaw_rotation_speed:float   = 0.25
+        
+        # Keep rotating after the drag is released, slowing down 
+        # exponentially at this rate (1/s)
+        self.inertia:bool               = False
+        self.inertia_damping:float      = 5.0
+        
+        # Clicking the center switches the camera of draw_gizmo_camera() 
+        # between perspective and orthographic (see GizmoState.center_clicked)
+        self.center_toggles_projection:bool = True
+        
+        
+        
+        # In relation to half the rect size
+        self.line_thickness_scale:float      = 0.017
+        self.axis_length_scale:float         = 0.45 
+        self.positive_radius_scale:float     = 0.12
+        self.negative_radius_scale:float     = 0.085
+        self.hover_circle_radius_scale:float = 0.77
+        self.center_radius_scale:float       = 0.1
+        
+        # Level of detail: the circles get as many segments as keep them 
+        # within `circle_max_error` pixels of a true circle (0 leaves it to 
+        # ImGui), and below these sizes (mSize, in pixels) the labels and 
+        # the negative handles on the back are not drawn
+        self.circle_max_error:float          = 0.3
+        self.min_label_size:float            = 32.0
+        self.min_back_handle_size:float      = 24.0
+        
+        # The colours are compiled into `color_table` once they are all set
+        self.color_table:tuple               = None
+        self.colors_version:int              = 0
+        
+        self._mColorWhite                    = IM_COL32( 255, 255, 255, 255)
+        self._mColorBlack                    = IM_COL32(   0,   0,   0, 255)
+        
+        self._x_circle_front_color           = IM_COL32(255,  54,  83, 255)
+        self._x_circle_back_color            = IM_COL32(255,  54,  83,  50)
+        self._y_circle_front_color           = IM_COL32(138, 219,   0, 255)
+        self._y_circle_back_color            = IM_COL32(138, 219,   0,  50)
+        self._z_circle_front_color           = IM_COL32( 44, 143, 255, 255)
+        self._z_circle_back_color            = IM_COL32( 44, 143, 255,  50)
+        self._hover_circle_color             = IM_COL32(100, 100, 100, 130)
+        
+        self.compile_colors()
+        
+        # 0 for the size of the current font
+        self.label_font_size:float           = 0.0
+        self.negative_label_font_size:float  = 0.0
+        self.labels:LabelMetrics             = LabelMetrics()
+        
+        # Optional GizmoCache, to draw the gizmo from a texture while static
+        self.cache:GizmoCache = None
+        
+        
+    def compile_colors(self):
+        """
+        Packs the colours of each axis into `color_table`, indexed by axis 
+        (0 X, 1 Y, 2 Z) and slot (COLOR_FRONT, COLOR_BACK, 
+        COLOR_NEGATIVE_FRONT_FILL, COLOR_NEGATIVE_BACK_FILL), and bumps 
+        `colors_version`. Called by the colour setters.
+        """
+        
+        # The fill of the negative handles is their colour at a fixed 
+        # opacity, IM_COL32 packs the alpha in the high byte
+        fill_alpha = int(NEGATIVE_FILL_OPACITY * 255) << 24
+        
+        self.color_table = tuple((front, back, (front & 0x00FFFFFF) | fill_alpha, (back & 0x00FFFFFF) | fill_alpha)
+                                 for front, back in ((self._x_circle_front_color, self._x_circle_back_color),
+                                                     (self._y_circle_front_color, self._y_circle_back_color),
+                                                     (self._z_circle_front_color, self._z_circle_back_color)))
+        self.colors_version += 1
+        
+        
+    def get_style_key(self) -> tuple:
+        """
+        Returns everything the look of the gizmo depends on, besides its 
+        orientation and state, to tell when a cached image is outdated.
+        """
+        
+        return (self.mSize,
+                self.circle_max_error,
+                self.min_label_size,
+                self.min_back_handle_size,
+                self.line_thickness_scale,
+                self.axis_length_scale,
+                self.positive_radius_scale,
+                self.negative_radius_scale,
+                self.hover_circle_radius_scale,
+                self.center_radius_scale,
+                self.colors_version,
+                self.labels.key)
+        
+
+
+class GizmoCache:
+    """
+    Draws the gizmo from a texture while nothing it depends on changes.
+    
+    Every frame the gizmo computes a key from its orientation, its state 
+    (selected handle, hover circle), `GizmoConfig.get_style_key()` and the
+    DPI scale. The first frame with a new key the gizmo is drawn as usual, 
+    which also loads the glyphs of its labels into the font atlas. If the 
+    next frame has the same key, the gizmo is drawn into an offscreen draw 
+    list instead, which `renderer` renders into a texture, and from then on
+    it is a single `add_image` quad until the key changes. While the view 
+    is dragged the key changes every frame, and nothing is rendered.
+    
+    The textures of the last `capacity` keys are kept, so e.g. hovering the
+    gizmo and leaving it again does not render it again.
+    
+    `renderer` does the GPU side, as it depends on the rendering backend
+    (see example/gizmo_texture.py for a moderngl one):
+    
+        renderer.render(draw_list, display_size, framebuffer_scale) -> texture id
+        renderer.release(texture_id)
+    
+    Attributes:
+        renderer: Renders an ImDrawList into a texture.
+        enabled (bool): Use the cached textures. When False the gizmo is drawn
+                        as usual.
+        capacity (int): The number of textures kept.
+        renders (int): The number of textures rendered so far.
+        hits (int): The number of frames drawn from a texture so far.
+    """
+    
+    def __init__(self, renderer, capacity:int=4):
+        
+        self.renderer = renderer
+        self.enabled  = True
+        self.capacity = capacity
+        self.renders  = 0
+        self.hits     = 0
+        
+        self._textures:dict = {}  # key -> (texture id, texture ref), the most recently used last
+        self._seen:dict     = {}  # key -> frame it was last drawn without texture
+        
+        
+    def draw(self, key, origin, extent:float, draw) -> bool:
+        """
+        Draws the image of `key` into `config.mDrawList`, rendering it first
+        when it was also drawn the previous frame.
+
+        Args:
+            key (tuple): Identifies the image.
+            origin (tuple): The top-left corner of the image, in screen coordinates.
+            extent (float): The width and height of the image.
+            draw (callable): Draws the image into `config.mDrawList`, given 
+                             its origin.
+
+        Returns:
+            bool: The image was drawn. When False the caller draws it.
+        """
+        
+        scale = imgui.get_io().display_framebuffer_scale
+        key   = (key, extent, scale.x, scale.y)
+        
+        texture = self._textures.pop(key, None)
+        
+        if texture is None:
+            
+            frame = imgui.get_frame_count()
+            if self._seen.get(key) != frame - 1:
+                if len(self._seen) > 4 * self.capacity:
+                    self._seen.clear()
+                self._seen[key] = frame
+                return False
+            
+            del self._seen[key]
+            texture_id = self._render(draw, extent, scale)
+            texture    = (texture_id, _get_texture_ref(texture_id))
+            
+            if len(self._textures) >= self.capacity:
+                oldest = next(iter(self._textures))
+                self.renderer.release(self._textures.pop(oldest)[0])
+        else:
+            self.hits += 1
+        
+        self._textures[key] = texture
+        
+        # OpenGL's Bottom-Left origin to ImGui's Top-Left one
+        config.mDrawList.add_image(texture[1], 
+                                   (origin[0], origin[1]), 
+                                   (origin[0] + extent, origin[1] + extent), 
+                                   (0, 1), (1, 0))
+        return True
+    
+    
+    def _render(self, draw, extent, scale):
+        
+        draw_list = imgui.ImDrawList(imgui.get_draw_list_shared_data())
+        draw_list._reset_for_new_frame()
+        draw_list.push_clip_rect((0, 0), (extent, extent))
+        
+        # The labels sample the font atlas
+        font_texture = _get_font_texture()
+        if hasattr(draw_list, 'push_texture'):
+            draw_list.push_texture(font_texture)
+        else:
+            draw_list.push_texture_id(font_texture)
+        
+        target = config.mDrawList
+        config.mDrawList = draw_list
+        try:
+            draw(glm.vec2(0, 0))
+        finally:
+            config.mDrawList = target
+        
+        self.renders += 1
+        return self.renderer.render(draw_list, (extent, extent), (scale.x, scale.y))
+    
+    
+    def clear(self):
+        """
+        Releases the textures, e.g. when the font atlas was rebuilt.
+        """
+        
+        for texture_id, _ in self._textures.values():
+            self.renderer.release(texture_id)
+        self._textures.clear()
+        self._seen.clear()
+        
+
+config = GizmoConfig()
+
+              
+def color_change_opacity(color, opacity:float):
+    
+    color_float = imgui.color_convert_u32_to_float4(color)
+    return IM_COL32(int(color_float.x * 255), 
+                    int(color_float.y * 255), 
+                    int(color_float.z * 255), 
+                    int(opacity * 255) )
+
+
+def check_inside_circle(center, radius, point):
+    return (point.x - center.x) **2 + (point.y - center.y) **2 <= radius ** 2
+
+
+@functools.lru_cache(maxsize=256)
+def circle_segment_count(radius:float, max_error:float) -> int:
+    """
+    Returns the segments of a circle that keep it within `max_error` of a 
+    true circle, the same rule ImGui uses with its global 
+    `circle_tessellation_max_error`.
+
+    Args:
+        radius (float): The radius of the circle, in pixels.
+        max_error (float): The largest distance from the true circle, in pixels.
+
+    Returns:
+        int: The number of segments, even and between 4 and 512, or 0 
+             (ImGui's own count) when `max_error` is 0.
+    """
+    
+    if max_error <= 0.0 or radius <= 0.0:
+        return 0
+    
+    segments = math.ceil(math.pi / math.acos(1.0 - min(max_error, radius) / radius))
+    return min(max(segments + (segments & 1), 4), 512)
+
+
+def draw_positive_line(center, axis, color, radius, thickness, text, selected, num_segments=0):
+    
+    line_end_positive = (center + axis).to_tuple()
+    
+    if math.isnan( line_end_positive[0] ) :
+        return
+    
+    config.mDrawList.add_line( (center.x, center.y), line_end_positive, color, thickness)
+    config.mDrawList.add_circle_filled(line_end_positive, radius, color, num_segments)
+    
+    # No label, e.g. when the gizmo is too small to read it
+    if not text:
+        return
+    
+    labels   = config.labels
+    offset   = labels.offsets[text]
+    text_pos = (math.floor(line_end_positive[0] + offset.x),
+                math.floor(line_end_positive[1] + offset.y))
+            
+    config.mDrawList.add_text(labels.font, 
+                              labels.font_sizes[text], 
+                              text_pos, 
+                              config.mColorWhite if selected else config.mColorBlack, 
+                              text)
+
+
+def draw_negative_line(center, axis, color, radius, text, selected, fill_color=None, num_segments=0):
+    
+    line_end_negative = center - axis
+    
+    if math.isnan( line_end_negative[0] ) :
+        return
+    
+    if fill_color is None:
+        fill_color = color_change_opacity(color, NEGATIVE_FILL_OPACITY)
+    
+    config.mDrawList.add_circle_filled((line_end_negative.x, line_end_negative.y) , radius, fill_color, num_segments)
+    config.mDrawList.add_circle((line_end_negative.x, line_end_negative.y), radius, color, num_segments, 1.1)
+    
+    if selected:
+        config.mDrawList.add_circle((line_end_negative.x, line_end_negative.y), radius, config.mColorWhite, num_segments, 1.1)
+    
+    if selected and text:
+        labels   = config.labels
+        offset   = labels.offsets[text]
+        text_pos = (math.floor(line_end_negative.x + offset.x),
+                    math.floor(line_end_negative.y + offset.y))
+        
+        config.mDrawList.add_text(labels.font, 
+                                  labels.font_sizes[text],
+                                  text_pos, 
+                                  config.mColorWhite, 
+                                  text)
+
+
+def _draw_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle):
+    
+    size = config.mSize
+    
+    # The error budget is in pixels, the radii in ImGui units
+    max_error = config.circle_max_error / imgui.get_io().display_framebuffer_scale.x
+    
+    if show_hover_circle:
+        hover_circle_radius = size * 0.75 * config.hover_circle_radius_scale
+        config.mDrawList.add_circle_filled((center.x, center.y), 
+                                           hover_circle_radius, 
+                                           config.hover_circle_color, 
+                                           circle_segment_count(hover_circle_radius, max_error))
+    
+    if selection == HANDLE_CENTER:
+        center_radius   = size * config.center_radius_scale
+        center_segments = circle_segment_count(center_radius, max_error)
+        config.mDrawList.add_circle_filled((center.x, center.y), center_radius, config.hover_circle_color, center_segments)
+        config.mDrawList.add_circle((center.x, center.y), center_radius, config.mColorWhite, center_segments, 1.1)
+    
+    positive_radius   = size * config.positive_radius_scale
+    negative_radius   = size * config.negative_radius_scale
+    positive_segments = circle_segment_count(positive_radius, max_error)
+    negative_segments = circle_segment_count(negative_radius, max_error)
+    
+    labels       = AXIS_LABELS if size >= config.min_label_size else (None,) * 6
+    back_handles = size >= config.min_back_handle_size
+    
+    # The projected axes, and whether their positive end is the closer one
+    axes   = (glm.vec2(x_axis.x, -x_axis.y), glm.vec2(y_axis.x, -y_axis.y), glm.vec2(z_axis.x, -z_axis.y))
+    closer = (0.0 <= x_axis.z, 0.0 <= y_axis.z, 0.0 <= z_axis.z)
+    
+    line_thickness = size * config.line_thickness_scale
+    color_table    = config.color_table
+    
+    for handle, _ in pairs:
+        
+        axis   = handle % 3
+        colors = color_table[axis]
+        
+        if handle < 3:
+            draw_positive_line(center, 
+                               axes[axis], 
+                               colors[COLOR_FRONT] if closer[axis] else colors[COLOR_BACK], 
+                               positive_radius, 
+                               line_thickness, 
+                               labels[handle], 
+                               selection == handle,
+                               positive_segments)
+        else:
+            front = not closer[axis]
+            if not front and not back_handles:
+                continue
+            
+            draw_negative_line(center, 
+                               axes[axis], 
+                               colors[COLOR_FRONT] if front else colors[COLOR_BACK], 
+                               negative_radius, 
+                               labels[handle], 
+                               selection == handle, 
+                               colors[COLOR_NEGATIVE_FRONT_FILL] if front else colors[COLOR_NEGATIVE_BACK_FILL],
+                               negative_segments)
+
+
+def _get_font_texture():
+    
+    fonts = imgui.get_io().fonts
+    
+    # ImGui 1.92 creates and updates the font texture on demand
+    if hasattr(fonts, 'tex_data'):
+        return fonts.tex_data.get_tex_ref()
+    return fonts.tex_id
+
+
+def _get_font_atlas_stamp():
+    
+    fonts = imgui.get_io().fonts
+    
+    # Adding a font or a new texture (the atlas grew or was rebuilt) bumps 
+    # the unique ids. Before ImGui 1.92 a rebuild creates a new texture
+    if hasattr(fonts, 'tex_data'):
+        return (fonts.font_next_unique_id, fonts.tex_data.unique_id if fonts.tex_data else 0)
+    return (fonts.tex_id, fonts.tex_width, fonts.tex_height)
+
+
+def _get_texture_ref(texture_id):
+    
+    # Since ImGui 1.92 the draw lists take an ImTextureRef
+    return imgui.ImTextureRef(texture_id) if hasattr(imgui, 'ImTextureRef') else texture_id
+
+
+def draw_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle):
+    """
+    Draws the hover circle and the handles into `config.mDrawList`, back to 
+    front, from the texture of `config.cache` when there is one.
+
+    Args:
+        center (glm.vec2): The center of the gizmo, in screen coordinates.
+        x_axis (glm.vec4): The projected X axis.
+        y_axis (glm.vec4): The projected Y axis.
+        z_axis (glm.vec4): The projected Z axis.
+        pairs (list): The (handle, depth) pairs, sorted back to front.
+        selection (int): The hovered handle, HANDLE_CENTER or -1.
+        show_hover_circle (bool): Draw the hover circle.
+    """
+    
+    config.labels.update(config.label_font_size, config.negative_label_font_size)
+    
+    clip_rect = config.clip_rect
+    if clip_rect is not None:
+        config.mDrawList.push_clip_rect(clip_rect[0], clip_rect[1], True)
+    
+    try:
+        _draw_cached_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle)
+    finally:
+        if clip_rect is not None:
+            config.mDrawList.pop_clip_rect()
+
+
+def _draw_cached_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle):
+    
+    cache = config.cache
+    
+    if cache is not None and cache.enabled:
+        
+        # The image is the square the gizmo is centered in
+        extent = config.mSize * 1.5
+        origin = (center.x - 0.5 * extent, center.y - 0.5 * extent)
+        
+        axes = (x_axis.x, x_axis.y, x_axis.z, y_axis.x, y_axis.y, y_axis.z, z_axis.x, z_axis.y, z_axis.z)
+        key  = (tuple(round(value, 1) for value in axes), selection, show_hover_circle, config.get_style_key())
+        
+        def draw(image_origin):
+            _draw_handles(image_origin + glm.vec2(0.5 * extent), x_axis, y_axis, z_axis, pairs, selection, show_hover_circle)
+        
+        if cache.draw(key, origin, extent, draw):
+            return
+    
+    _draw_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle)
+
+
+def set_rect(x, y, size):
+    config.mX = x
+    config.mY = y
+    config.mSize = size
+
+
+def set_draw_list(drawlist=None):
+    config.mDrawList = drawlist if drawlist else imgui.get_window_draw_list()
+
+
+def set_id(gizmo_id):
+    """
+    Sets the gizmo the next draw_gizmo() / draw_gizmo_camera() is, so each
+    viewport keeps its own hover and drag state.
+    """
+    config.mID = gizmo_id
+
+
+def begin_overlay(gizmo_id=None, drawlist=None, clip_rect=None):
+    """
+    Sets up the gizmo to draw without any window of its own, an alternative
+    to begin_frame() for several viewports.
+
+    Args:
+        gizmo_id (optional): Identifies the gizmo, e.g. its viewport. 
+                             Defaults to the current one.
+        drawlist (imgui.ImDrawList, optional): The draw list to draw into, 
+                                               e.g. the one of the viewport 
+                                               window. Defaults to the 
+                                               foreground draw list.
+        clip_rect (tuple, optional): The (min, max) screen rectangle the gizmo
+                                     is drawn and hovered within, e.g. the 
+                                     viewport. Defaults to no clipping.
+    """
+    
+    if gizmo_id is not None:
+        config.mID = gizmo_id
+    
+    config.mDrawList = drawlist if drawlist else imgui.get_foreground_draw_list()
+    config.clip_rect = clip_rect
+
+
+def begin_frame(background=False):
+    
+    flags =   imgui.WindowFlags_.no_decoration \
+            | imgui.WindowFlags_.no_inputs \
+            | imgui.WindowFlags_.no_saved_settings \
+            | imgui.WindowFlags_.no_focus_on_appearing \
+            | imgui.WindowFlags_.no_bring_to_front_on_focus 
+                
+    if not background:
+        flags |= imgui.WindowFlags_.no_background
+    
+    imgui.set_next_window_pos((config.mX, config.mY))
+    imgui.set_next_window_size((config.mSize, config.mSize))
+    imgui.begin(f"imoguizmo##{config.mID}", None, flags)
+    set_draw_list(config.mDrawList)
+    imgui.end()
+
+
+class GizmoState:
+    """
+    The interaction state of one gizmo, kept between frames.
+    
+    Attributes:
+        dragging_started (bool): The left button was pressed on the gizmo and
+                                 is still down.
+        last_mouse_pos (imgui.ImVec2): The mouse position the last rotation
+                                       was computed from.
+        velocity (tuple): The (yaw, pitch) speed of the rotation, in degrees
+                          per second, smoothed over the drag.
+        center_pressed (bool): The left button was pressed on the center and 
+                               has not been dragged.
+        center_clicked (bool): The center was clicked (released without a 
+                               drag) this frame. draw_gizmo_camera() switches
+                               the projection of the camera then, with 
+                               draw_gizmo() it is left to the caller.
+    """
+    
+    __slots__ = ('dragging_started', 'last_mouse_pos', 'velocity', 'center_pressed', 'center_clicked')
+    
+    def __init__(self):
+        self.dragging_started = False
+        self.last_mouse_pos   = None
+        self.velocity         = (0.0, 0.0)
+        self.center_pressed   = False
+        self.center_clicked   = False
+        
+        
+_states:dict = {}  # gizmo id -> GizmoState
+
+
+def get_state(gizmo_id=None) -> GizmoState:
+    """
+    Returns the interaction state of a gizmo, by default the current one.
+    """
+    
+    gizmo_id = config.mID if gizmo_id is None else gizmo_id
+    
+    state = _states.get(gizmo_id)
+    if state is None:
+        state = _states[gizmo_id] = GizmoState()
+    return state
+
+
+def clear_states():
+    """
+    Forgets the interaction state of every gizmo, e.g. between two replays.
+    """
+    _states.clear()
+
+
+def _is_clipped(point) -> bool:
+    
+    clip_rect = config.clip_rect
+    if clip_rect is None:
+        return False
+    
+    clip_min, clip_max = clip_rect
+    return not (clip_min[0] <= point.x < clip_max[0] and clip_min[1] <= point.y < clip_max[1])
+
+
+def _update_interaction(center, hover_circle_radius, mouse_pos, interactive):
+    
+    state = get_state()
+    
+    is_hovered  = check_inside_circle(center, hover_circle_radius, mouse_pos) and not _is_clipped(mouse_pos)
+    is_dragging = False
+    
+    # A drag belongs to the gizmo when it started on it
+    if interactive and is_hovered and imgui.is_mouse_clicked(imgui.MouseButton_.left):
+        state.dragging_started = True
+        state.last_mouse_pos   = imgui.get_mouse_pos()
+        state.velocity         = (0.0, 0.0)
+
+    if state.dragging_started and not imgui.is_mouse_down(imgui.MouseButton_.left):
+        state.dragging_started = False
+        state.last_mouse_pos   = None
+    
+    if state.dragging_started and imgui.is_mouse_dragging(imgui.MouseButton_.left):
+        is_dragging = True
+    
+    # The gizmo owns the mouse while hovered or dragged, so the application
+    # does not also handle it (e.g. orbit its own camera). There is no window 
+    # of its own to do it.
+    if interactive and (is_hovered or state.dragging_started):
+        imgui.set_next_frame_want_capture_mouse(True)
+    
+    return state, is_hovered, is_dragging
+
+
+def _update_center_click(state, selection):
+    
+    # A click, not the start of a drag: that rotates the view instead
+    state.center_clicked = False
+    
+    if selection == HANDLE_CENTER and imgui.is_mouse_clicked(imgui.MouseButton_.left):
+        state.center_pressed = True
+    
+    if state.center_pressed:
+        if imgui.is_mouse_dragging(imgui.MouseButton_.left):
+            state.center_pressed = False
+        elif not imgui.is_mouse_down(imgui.MouseButton_.left):
+            state.center_pressed = False
+            state.center_clicked = True
+
+
+VELOCITY_SMOOTHING = 0.05  # seconds
+MIN_INERTIA_SPEED  = 0.5   # degrees per second
+
+
+def _get_rotation(state, dragging:bool):
+    """
+    Returns the (yaw, pitch) to rotate the view by this frame, in degrees, 
+    or None.
+    
+    While dragging it is the mouse motion since the last frame. ImGui
+    coalesces the mouse moves between two frames into `mouse_pos`, so the
+    rotation is computed once per frame whatever the mouse rate is, and as
+    it is proportional to the distance dragged, not to the frames, the view
+    ends up in the same place at any frame rate.
+    
+    The speed of the drag is smoothed over `VELOCITY_SMOOTHING` seconds. 
+    After the release, with `config.inertia`, the view keeps rotating at 
+    that speed decaying exponentially with time. Each frame it rotates by
+    the exact integral of the decay over `delta_time`, so it also coasts 
+    the same distance at any frame rate.
+    """
+    
+    delta_time = imgui.get_io().delta_time
+    
+    if dragging and state.last_mouse_pos is not None:
+        
+        mouse_pos = imgui.get_mouse_pos()
+        delta     = mouse_pos - state.last_mouse_pos
+        state.last_mouse_pos = mouse_pos
+        
+        rotation = (delta.x * config.yaw_rotation_speed, delta.y * config.pitch_rotation_speed)
+        
+        if delta_time > 0.0:
+            blend = 1.0 - math.exp(-delta_time / VELOCITY_SMOOTHING)
+            state.velocity = (state.velocity[0] + (rotation[0] / delta_time - state.velocity[0]) * blend,
+                              state.velocity[1] + (rotation[1] / delta_time - state.velocity[1]) * blend)
+        
+        return rotation if rotation != (0.0, 0.0) else None
+    
+    if state.dragging_started or not config.inertia or delta_time <= 0.0:
+        return None
+    
+    velocity_yaw, velocity_pitch = state.velocity
+    if math.hypot(velocity_yaw, velocity_pitch) < MIN_INERTIA_SPEED:
+        state.velocity = (0.0, 0.0)
+        return None
+    
+    damping  = config.inertia_damping
+    decay    = math.exp(-damping * delta_time)
+    distance = (1.0 - decay) / damping if damping > 0.0 else delta_time
+    
+    state.velocity = (velocity_yaw * decay, velocity_pitch * decay)
+    return (velocity_yaw * distance, velocity_pitch * distance)
+
+
+def draw_gizmo(view_matrix:glm.mat4, pivot_distance=0.0):
+    
+    # The gizmo works with glm, the new view matrix is returned in the math
+    # backend of the one given
+    backend     = backend_of(view_matrix)
+    view_matrix = backend.to_glm(view_matrix)
+    
+    size   = config.mSize
+    h_size = size * 0.75
+    center = glm.vec2(config.mX + h_size, config.mY + h_size)
+    
+    is_view_changed = False 
+    is_dragging     = False
+    is_hovered      = False
+    
+    view_projection = (view_matrix * glm.ortho(-1, 1, -1, 1, -1, 1) )
+    
+    # Correction for non-square aspect ratio
+    # aspect_ratio = projection_matrix[1, 1] / projection_matrix[0,0]
+    # view_projection[0,0] *= aspect_ratio
+    # view_projection[2,0] *= aspect_ratio
+
+    # Axis
+    axis_length = size * config.axis_length_scale
+    x_axis = view_projection * glm.vec4(axis_length, 0, 0, 0)
+    y_axis = view_projection * glm.vec4(0, axis_length, 0, 0)
+    z_axis = view_projection * glm.vec4(0, 0, axis_length, 0)
+    z_axis *= -1
+    
+    
+    interactive = pivot_distance > 0.0
+    mouse_pos   = imgui.get_io().mouse_pos
+
+    # Hover Circle
+    hover_circle_radius = h_size * config.hover_circle_radius_scale
+    set_draw_list(config.mDrawList)
+    
+    state, is_hovered, is_dragging = _update_interaction(center, hover_circle_radius, mouse_pos, interactive)
+    
+    # Drawn with the handles, see draw_handles()
+    show_hover_circle = interactive and is_hovered or state.dragging_started
+        
+    
+    # 
+    positive_radius = size * config.positive_radius_scale
+    negative_radius = size * config.negative_radius_scale
+    
+
+    # Sort axis based on distance
+	# 0 : -x axis, 1 : -y axis, 2 : -z axis, 3 : +x axis, 4 : +y axis, 5 : +z axis
+    pairs = [(0, -x_axis.z), (1, -y_axis.z), (2, -z_axis.z), (3, x_axis.z), (4, y_axis.z), (5, z_axis.z)]
+    
+    pairs.sort(key=lambda x: x[1], reverse=True)
+
+    selection = -1
+    if not is_dragging and not _is_clipped(mouse_pos):
+        for pair in reversed(pairs):
+            if selection == -1 and interactive:
+                if pair[0]   == 0 and check_inside_circle(center + glm.vec2(x_axis.x, -x_axis.y), positive_radius, mouse_pos):
+                    selection = 0
+                elif pair[0] == 1 and check_inside_circle(center + glm.vec2(y_axis.x, -y_axis.y), positive_radius, mouse_pos):
+                    selection = 1
+                elif pair[0] == 2 and check_inside_circle(center + glm.vec2(z_axis.x, -z_axis.y), positive_radius, mouse_pos):
+                    selection = 2
+                elif pair[0] == 3 and check_inside_circle(center + glm.vec2(-x_axis.x, x_axis.y), negative_radius, mouse_pos):
+                    selection = 3
+                elif pair[0] == 4 and check_inside_circle(center + glm.vec2(-y_axis.x, y_axis.y), negative_radius, mouse_pos):
+                    selection = 4
+                elif pair[0] == 5 and check_inside_circle(center + glm.vec2(-z_axis.x, z_axis.y), negative_radius, mouse_pos):
+                    selection = 5
+        
+        # The center, where no handle is in front of it
+        if selection == -1 and interactive and check_inside_circle(center, size * config.center_radius_scale, mouse_pos):
+            selection = HANDLE_CENTER
+
+
+    #  Draw back first
+    draw_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle)
+    
+    _update_center_click(state, selection)
+
+    config.mDrawList = None
+    config.clip_rect = None
+
+    new_view_matrix = view_matrix
+    
+    # Process Rotation
+    rotation = _get_rotation(state, selection == -1 and is_dragging)
+    if rotation:
+        
+        length      = pivot_distance if pivot_distance > 0 else 1
+        referenceUP = glm.vec3(0, 1, 0)
+        cam_target  = glm.vec3(0)
+        
+        # The angles of the view matrix are in radians
+        delta_yaw   = glm.radians(rotation[0])
+        delta_pitch = glm.radians(rotation[1])
+        
+        right, referenceUP, dir = extract_vectors_from_view_matrix( view_matrix )
+        yaw, pitch, roll        = compute_euler_angles_from_view_matrix(view_matrix)
+   
+        PITCH_MAX   = glm.radians(89.8)
+        yaw   += delta_yaw
+        pitch -= delta_pitch
+        pitch  = glm.clamp(pitch, -PITCH_MAX, PITCH_MAX)
+            
+        direction = glm.vec3(
+            glm.cos(yaw) * glm.cos(pitch) * length,
+            glm.sin(pitch) * length,
+            glm.sin(yaw) * glm.cos(pitch) * length
+        )
+        forward  = glm.normalize(direction)
+        right    = glm.normalize(glm.cross(forward, referenceUP))
+        up       = glm.normalize(glm.cross(right, forward))
+        position = cam_target - forward * length
+        
+        new_view_matrix = glm.lookAt(direction, cam_target, up )
+
+        
+        is_view_changed = True
+        
+     
+    # Process Predefined Views
+    if -1 < selection < HANDLE_CENTER and imgui.is_mouse_clicked(imgui.MouseButton_.left):
+        
+        model_mat = glm.inverse(view_matrix)
+        pivot_pos = glm.vec3(model_mat[3,0], model_mat[3,1], model_mat[3,2]) - glm.vec3(model_mat[2,0], model_mat[2,1], model_mat[2,2] ) * pivot_distance
+
+        if selection == 0:
+            new_view_matrix = build_view_matrix(pivot_pos + glm.vec3(pivot_distance, 0, 0), pivot_pos, glm.vec3(0, 1, 0))
+        elif selection == 1:
+            new_view_matrix = build_view_matrix(pivot_pos + glm.vec3(0, pivot_distance, 0), pivot_pos, glm.vec3(0, 0, -1))            
+        elif selection == 2:
+            new_view_matrix = build_view_matrix(pivot_pos + glm.vec3(0, 0, pivot_distance), pivot_pos, glm.vec3(0, 1, 0))
+        elif selection == 3:
+            new_view_matrix = build_view_matrix(pivot_pos - glm.vec3(pivot_distance, 0, 0), pivot_pos, glm.vec3(0, 1, 0))
+        elif selection == 4:
+            new_view_matrix = build_view_matrix(pivot_pos - glm.vec3(0, pivot_distance, 0), pivot_pos, glm.vec3(0, 0, 1))
+        elif selection == 5:
+            new_view_matrix = build_view_matrix(pivot_pos - glm.vec3(0, 0, pivot_distance), pivot_pos, glm.vec3(0, 1, 0))
+        is_dragging     = False
+        is_view_changed = True
+        selection       = -1   
+    
+    
+    # Return the view matrix, and flags
+    return is_view_changed, backend.from_glm(new_view_matrix), is_hovered, is_dragging
+
+
+
+def draw_gizmo_camera(camera:Camera, interactive:bool=True):
+    """_summary_
+
+    Args:
+        camera (Camera): _description_
+        interactive (bool, optional): _description_. Defaults to True.
+    """
+    
+    size   = config.mSize
+    h_size = size * 0.75
+    center = glm.vec2(config.mX + h_size, config.mY + h_size)
+    
+    is_view_changed = False 
+    is_dragging     = False
+    is_hovered      = False
+    
+    view_projection = to_glm(camera.get_view_matrix()) * glm.ortho(-1, 1, -1, 1, -1, 1) 
+    
+
+    # Axis
+    axis_length = size * config.axis_length_scale        
+    x_axis = view_projection * glm.vec4(axis_length, 0, 0, 0)
+    y_axis = view_projection * glm.vec4(0, axis_length, 0, 0)
+    z_axis = view_projection * glm.vec4(0, 0, axis_length, 0)
+    z_axis *= -1
+    
+    
+    mouse_pos   = imgui.get_io().mouse_pos
+
+    # Hover Circle
+    hover_circle_radius = h_size * config.hover_circle_radius_scale
+    set_draw_list(config.mDrawList)
+    
+    state, is_hovered, is_dragging = _update_interaction(center, hover_circle_radius, mouse_pos, interactive)
+    
+    # Drawn with the handles, see draw_handles()
+    show_hover_circle = interactive and (is_hovered or state.dragging_started)
+        
+    
+    # 
+    positive_radius = size * config.positive_radius_scale
+    negative_radius = size * config.negative_radius_scale
+    
+
+    # Sort axis based on distance
+	# 0 : -x axis, 1 : -y axis, 2 : -z axis, 3 : +x axis, 4 : +y axis, 5 : +z axis
+    pairs = [(0, -x_axis.z), (1, -y_axis.z), (2, -z_axis.z), (3, x_axis.z), (4, y_axis.z), (5, z_axis.z)]
+    pairs.sort(key=lambda x: x[1], reverse=True)
+
+    selection = -1
+    if not is_dragging and not _is_clipped(mouse_pos):
+        for pair in reversed(pairs):
+            if selection == -1 and interactive:
+                if pair[0]   == 0 and check_inside_circle(center + glm.vec2(x_axis.x, -x_axis.y), positive_radius, mouse_pos):
+                    selection = 0
+                elif pair[0] == 1 and check_inside_circle(center + glm.vec2(y_axis.x, -y_axis.y), positive_radius, mouse_pos):
+                    selection = 1
+                elif pair[0] == 2 and check_inside_circle(center + glm.vec2(z_axis.x, -z_axis.y), positive_radius, mouse_pos):
+                    selection = 2
+                elif pair[0] == 3 and check_inside_circle(center + glm.vec2(-x_axis.x, x_axis.y), negative_radius, mouse_pos):
+                    selection = 3
+                elif pair[0] == 4 and check_inside_circle(center + glm.vec2(-y_axis.x, y_axis.y), negative_radius, mouse_pos):
+                    selection = 4
+                elif pair[0] == 5 and check_inside_circle(center + glm.vec2(-z_axis.x, z_axis.y), negative_radius, mouse_pos):
+                    selection = 5
+        
+        # The center, where no handle is in front of it
+        if selection == -1 and interactive and check_inside_circle(center, size * config.center_radius_scale, mouse_pos):
+            selection = HANDLE_CENTER
+
+
+    #  Draw back first
+    draw_handles(center, x_axis, y_axis, z_axis, pairs, selection, show_hover_circle)
+    
+    _update_center_click(state, selection)
+
+    config.mDrawList = None
+    config.clip_rect = None
+
+    # Process Rotation
+    rotation = _get_rotation(state, selection == -1 and is_dragging) if interactive else None
+    if rotation:
+        
+        delta_yaw, delta_pitch = rotation
+        
+        PITCH_MAX = 89.9
+        camera.yaw   += delta_yaw
+        camera.pitch += delta_pitch
+        camera.pitch  = glm.clamp(camera.pitch, -PITCH_MAX, PITCH_MAX)
+    
+        # The vectors are rebuilt by the camera, in its own math backend
+        distance = camera.get_distance()
+        camera.update_camera_vectors()
+        camera.position = camera.target - camera.forward * distance
+        is_view_changed = True
+        
+        
+     
+    # Process Predefined Views
+    if interactive and -1 < selection < HANDLE_CENTER and imgui.is_mouse_clicked(imgui.MouseButton_.left):
+        
+        if selection == 0:   # X            
+            camera.pitch = 0
+            camera.yaw   = 0
+        elif selection == 1: # Y            
+            camera.pitch = 89.9
+            camera.yaw   = 0           
+        elif selection == 2: # Z            
+            camera.pitch = 0
+            camera.yaw   = 90
+        elif selection == 3: # -X            
+            camera.pitch = 0
+            camera.yaw   = 180
+        elif selection == 4: # -Y            
+            camera.pitch = -89.9
+            camera.yaw   = 0
+        elif selection == 5: # -Z            
+            camera.pitch = 0
+            camera.yaw   = -90
+            
+        # The vectors are rebuilt by the camera, in its own math backend
+        distance = camera.get_distance()
+        camera.update_camera_vectors()
+        camera.position = camera.target - camera.forward * distance
+        
+        is_dragging     = False
+        is_view_changed = True
+        selection       = -1   
+    
+    # Switch the projection from the center
+    if interactive and state.center_clicked and config.center_toggles_projection and hasattr(camera, 'orthographic'):
+        camera.orthographic = not camera.orthographic
+        is_view_changed     = True
+    
+    
+    # Return the view matrix, and flags
+    return is_view_changed, is_hovered, is_dragging
\ No newline at end of file
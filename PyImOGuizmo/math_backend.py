@@ -0,0 +1,340 @@
+"""
+File Name: math_backend.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the math backends of PyImOGuizmo: the vector
+             and matrix operations the Camera and the gizmo are written against.
+
+             - GlmBackend: PyGLM objects (glm.vec3, glm.mat4), the default.
+             - NumpyBackend: NumPy float32 arrays. A vector is a (3,) array
+               and a matrix a (4, 4) array indexed like glm, m[column][row],
+               so its memory is column-major, the layout of OpenGL uniforms:
+               `m.tobytes()` can be written into a uniform buffer as it is.
+               The operations broadcast over leading axes, so a (N, 4, 4)
+               array is a batch of N matrices.
+
+             The backend of a Camera is chosen when it is created:
+
+                 PyImOGuizmo.set_math_backend("numpy")
+                 camera = PyImOGuizmo.Camera(16 / 9)   # or Camera(16 / 9, backend="numpy")
+
+             The gizmo draws with glm internally, and returns the matrices in
+             the backend of the ones it was given.
+
+TODO:
+    -
+"""
+
+import math
+
+import glm
+
+
+
+class GlmBackend:
+    """
+    GlmBackend class
+
+    The PyGLM operations, one vector or matrix at a time. It is what the
+    Camera and the gizmo always used, and needs nothing but glm.
+    """
+
+    name = "glm"
+
+
+    def vec3(self, x, y=None, z=None) -> glm.vec3:
+        return glm.vec3(x) if y is None else glm.vec3(x, y, z)
+
+
+    def normalize(self, v):
+        return glm.normalize(v)
+
+
+    def cross(self, a, b):
+        return glm.cross(a, b)
+
+
+    def look_at(self, eye, target, up) -> glm.mat4:
+        return glm.lookAt(eye, target, up)
+
+
+    def perspective(self, fovy:float, aspect:float, near:float, far:float) -> glm.mat4:
+        return glm.perspective(fovy, aspect, near, far)
+
+
+    def ortho(self, left:float, right:float, bottom:float, top:float, near:float, far:float) -> glm.mat4:
+        return glm.ortho(left, right, bottom, top, near, far)
+
+
+    def multiply(self, a, b):
+        """
+        Returns the matrix product a * b, or a matrix times a vector.
+        """
+        return a * b
+
+
+    def inverse(self, m):
+        return glm.inverse(m)
+
+
+    def to_bytes(self, value) -> bytes:
+        return value.to_bytes()
+
+
+    def to_glm(self, value):
+        return value
+
+
+    def from_glm(self, value):
+        return value
+
+
+
+class NumpyBackend:
+    """
+    NumpyBackend class
+
+    The same operations on float32 arrays, with the result of glm (right
+    handed, depth in [-1, 1]). NumPy is only imported when the backend is
+    first used.
+    """
+
+    name  = "numpy"
+    dtype = 'f4'
+
+
+    def __init__(self):
+
+        try:
+            import numpy
+        except ImportError as ex:
+            raise ImportError("The NumPy math backend requires numpy: {}".format(ex))
+
+        self.np = numpy
+
+
+    def vec3(self, x, y=None, z=None):
+        if y is None:
+            return self.np.array(tuple(x) if isinstance(x, glm.vec3) else x, dtype=self.dtype).reshape(3)
+        return self.np.array((x, y, z), dtype=self.dtype)
+
+
+    def normalize(self, v):
+
+        if self.np.ndim(v) == 1:
+            return self.np.array(_normalize(v.tolist()), dtype=self.dtype)
+
+        return (v / self._length(v)).astype(self.dtype, copy=False)
+
+
+    def cross(self, a, b):
+
+        if self.np.ndim(a) == 1 and self.np.ndim(b) == 1:
+            return self.np.array(_cross(a.tolist(), b.tolist()), dtype=self.dtype)
+
+        return self._cross(a, b).astype(self.dtype, copy=False)
+
+
+    def look_at(self, eye, target, up):
+        """
+        Returns the view matrix of glm.lookAt(), for one eye or a batch of them.
+        """
+
+        np = self.np
+
+        if np.ndim(eye) == 1 and np.ndim(target) == 1 and np.ndim(up) == 1:
+            return self._look_at(eye, target, up)
+
+        eye, target, up = np.broadcast_arrays(np.asarray(eye, dtype='f8'), np.asarray(target, dtype='f8'), np.asarray(up, dtype='f8'))
+
+        f = target - eye
+        f = f / self._length(f)
+        s = self._cross(f, up)
+        s = s / self._length(s)
+        u = self._cross(s, f)
+
+        m = np.zeros(eye.shape[:-1] + (4, 4), dtype=self.dtype)
+        m[..., :3, 0] = s
+        m[..., :3, 1] = u
+        m[..., :3, 2] = -f
+        m[..., 3, 0]  = -np.einsum('...i,...i->...', s, eye)
+        m[..., 3, 1]  = -np.einsum('...i,...i->...', u, eye)
+        m[..., 3, 2]  =  np.einsum('...i,...i->...', f, eye)
+        m[..., 3, 3]  = 1.0
+        return m
+
+
+    def perspective(self, fovy:float, aspect:float, near:float, far:float):
+
+        tan_half_fovy = math.tan(fovy / 2.0)
+
+        m = self.np.zeros((4, 4), dtype=self.dtype)
+        m[0, 0] = 1.0 / (aspect * tan_half_fovy)
+        m[1, 1] = 1.0 / tan_half_fovy
+        m[2, 2] = -(far + near) / (far - near)
+        m[2, 3] = -1.0
+        m[3, 2] = -(2.0 * far * near) / (far - near)
+        return m
+
+
+    def ortho(self, left:float, right:float, bottom:float, top:float, near:float, far:float):
+
+        m = self.np.zeros((4, 4), dtype=self.dtype)
+        m[0, 0] =  2.0 / (right - left)
+        m[1, 1] =  2.0 / (top - bottom)
+        m[2, 2] = -2.0 / (far - near)
+        m[3, 0] = -(right + left) / (right - left)
+        m[3, 1] = -(top + bottom) / (top - bottom)
+        m[3, 2] = -(far + near) / (far - near)
+        m[3, 3] =  1.0
+        return m
+
+
+    def multiply(self, a, b):
+        """
+        Returns the matrix product a * b, or a matrix times a vector. The
+        arrays hold the transposed matrices, so the product is b @ a.
+        """
+        return self.np.matmul(b, a).astype(self.dtype, copy=False)
+
+
+    def inverse(self, m):
+        return self.np.linalg.inv(m).astype(self.dtype, copy=False)
+
+
+    def to_bytes(self, value) -> bytes:
+        return self.np.ascontiguousarray(value, dtype=self.dtype).tobytes()
+
+
+    def _look_at(self, eye, target, up):
+        """
+        look_at() for a single eye. The arrays of a vector cost more than its
+        math, so it is done with floats and converted once.
+        """
+
+        eye = [float(value) for value in eye]
+        f   = _normalize([float(t) - e for t, e in zip(target, eye)])
+        s   = _normalize(_cross(f, [float(value) for value in up]))
+        u   = _cross(s, f)
+
+        return self.np.array(((s[0], u[0], -f[0], 0.0),
+                              (s[1], u[1], -f[1], 0.0),
+                              (s[2], u[2], -f[2], 0.0),
+                              (-_dot(s, eye), -_dot(u, eye), _dot(f, eye), 1.0)), dtype=self.dtype)
+
+
+    # np.cross() and np.linalg.norm() are general, and slow for a single
+    # vector. These are written for the last axis of 3 only.
+
+    def _cross(self, a, b):
+        return self.np.stack((a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+                              a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+                              a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]), axis=-1)
+
+
+    def _length(self, v):
+        return self.np.sqrt(self.np.einsum('...i,...i->...', v, v))[..., None]
+
+
+    def to_glm(self, value):
+
+        value = self.np.asarray(value, dtype=self.dtype)
+        if value.shape == (4, 4):
+            return glm.mat4(*value.ravel().tolist())
+        return {2: glm.vec2, 3: glm.vec3, 4: glm.vec4}[len(value)](*value.tolist())
+
+
+    def from_glm(self, value):
+
+        array = self.np.frombuffer(value.to_bytes(), dtype=self.dtype)
+        return array.reshape(4, 4).copy() if len(array) == 16 else array.copy()
+
+
+
+def _dot(a, b) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+
+def _cross(a, b) -> tuple:
+    return (a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0])
+
+
+
+def _normalize(v) -> tuple:
+    length = math.sqrt(_dot(v, v))
+    return (v[0] / length, v[1] / length, v[2] / length)
+
+
+
+BACKENDS = {
+    GlmBackend.name:   GlmBackend,
+    NumpyBackend.name: NumpyBackend,
+}
+
+_instances = {}
+_default   = GlmBackend.name
+
+
+
+def get_math_backend(backend=None):
+    """
+    Returns a math backend.
+
+    Args:
+        backend (str or backend, optional): The name of the backend ("glm" or
+                                            "numpy"), or a backend object which
+                                            is returned as it is. Defaults to
+                                            the one set by `set_math_backend()`.
+    """
+
+    if backend is None:
+        backend = _default
+
+    if not isinstance(backend, str):
+        return backend
+
+    if backend not in _instances:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown math backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+        _instances[backend] = BACKENDS[backend]()
+
+    return _instances[backend]
+
+
+
+def set_math_backend(backend):
+    """
+    Sets the backend of the Cameras created from now on ("glm" or "numpy").
+    """
+
+    global _default
+
+    _default = get_math_backend(backend).name if isinstance(backend, str) else backend
+
+
+
+def backend_of(value):
+    """
+    Returns the backend a vector or matrix belongs to: glm for the glm types,
+    NumPy for arrays and the default backend for anything else (e.g. tuples).
+    """
+
+    if type(value).__module__ == 'glm':
+        return get_math_backend(GlmBackend.name)
+
+    if type(value).__module__ == 'numpy':
+        return get_math_backend(NumpyBackend.name)
+
+    return get_math_backend()
+
+
+
+def to_glm(value):
+    """
+    Returns a vector or matrix of any backend as its glm type.
+    """
+    return backend_of(value).to_glm(value)
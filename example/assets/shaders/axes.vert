@@ -0,0 +1,15 @@
+#version 330 core
+
+#include "include/camera.glsl"
+
+layout (location = 0) in vec3 in_color;
+layout (location = 1) in vec3 in_position;
+
+out vec3 ourColor;
+
+uniform mat4 in_m_model;
+
+void main() {
+    gl_Position = project(in_m_model * vec4(in_position, 1.0));
+    ourColor = in_color;
+}
@@ -0,0 +1,6 @@
+#version 330 core
+
+// Only the depth is written, the colour writes are masked out
+
+void main() {
+}
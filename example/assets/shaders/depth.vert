@@ -0,0 +1,17 @@
+#version 330 core
+
+#include "include/camera.glsl"
+
+// Depth-only pre-pass of the opaque geometry (see render_queue.py). The
+// position is computed exactly as in mesh.vert, and both declare it
+// invariant, so the colour pass can test its depth for equality.
+
+layout (location = 0) in vec3 in_position;
+
+uniform mat4 in_m_model;
+
+invariant gl_Position;
+
+void main() {
+    gl_Position = project(in_m_model * vec4(in_position, 1.0));
+}
@@ -0,0 +1,11 @@
+#version 330 core
+
+#include "include/gamma.glsl"
+
+out vec4 finalColor;
+
+in vec3 ourColor;
+
+void main() {
+    finalColor = vec4(apply_gamma(ourColor), 1.0);
+}
@@ -0,0 +1,37 @@
+// Per-frame camera data shared by every built-in program.
+// Written once per frame by CameraUniformBuffer (camera_buffer.py).
+layout (std140) uniform CameraBlock {
+    mat4 in_m_view;
+    mat4 in_m_proj;
+    mat4 in_m_view_proj;
+    vec4 in_camera_position; // xyz: world position
+    vec4 in_near_far;        // x: near, y: far
+};
+
+#ifdef MULTI_VIEW
+// Up to MULTI_VIEW views rendered by one instanced draw, one view per
+// instance, each one into its own tile of an atlas.
+// Written by MultiViewRenderer (multi_view.py).
+layout (std140) uniform MultiViewBlock {
+    mat4 in_m_views_view_proj[MULTI_VIEW];
+    vec4 in_views_tile[MULTI_VIEW]; // xy: scale, zw: offset of the tile in NDC
+};
+
+vec4 project(vec4 world_position) {
+    vec4 clip = in_m_views_view_proj[gl_InstanceID] * world_position;
+
+    // Clip to the frustum of the view, so nothing spills into the next tiles
+    gl_ClipDistance[0] = clip.w + clip.x;
+    gl_ClipDistance[1] = clip.w - clip.x;
+    gl_ClipDistance[2] = clip.w + clip.y;
+    gl_ClipDistance[3] = clip.w - clip.y;
+
+    vec4 tile = in_views_tile[gl_InstanceID];
+    clip.xy   = clip.xy * tile.xy + tile.zw * clip.w;
+    return clip;
+}
+#else
+vec4 project(vec4 world_position) {
+    return in_m_view_proj * world_position;
+}
+#endif
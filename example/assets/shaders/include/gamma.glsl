@@ -0,0 +1,15 @@
+// Gamma helpers
+#ifndef GAMMA
+#define GAMMA 2.2
+#endif
+
+// The colours are written as they are unless GAMMA_CORRECT is defined, then
+// they are encoded with 1 / GAMMA. (Raising them to GAMMA and back, as this
+// used to do, cancelled itself out at the cost of two pow per fragment.)
+vec3 apply_gamma(vec3 color) {
+#ifdef GAMMA_CORRECT
+    return pow(color, vec3(1.0 / GAMMA));
+#else
+    return color;
+#endif
+}
@@ -0,0 +1,37 @@
+#version 330 core
+
+#include "include/gamma.glsl"
+
+// Variants, defined from the flags of the material (see entity_store.py):
+//   USE_TEXTURE  the colour is sampled from u_texture_0
+//   TRANSPARENT  the alpha is OPACITY (times the texture's), drawn blended
+
+out vec4 finalColor;
+
+in vec2 TexCoord;
+in vec3 ourColor;
+
+#ifdef USE_TEXTURE
+uniform sampler2D u_texture_0;
+#endif
+
+#ifndef OPACITY
+#define OPACITY 1.0
+#endif
+
+void main() {
+#ifdef USE_TEXTURE
+    vec4 texel = texture(u_texture_0, TexCoord);
+    vec3 color = texel.rgb;
+    float alpha = texel.a;
+#else
+    vec3 color = ourColor;
+    float alpha = 1.0;
+#endif
+
+#ifdef TRANSPARENT
+    finalColor = vec4(apply_gamma(color), alpha * OPACITY);
+#else
+    finalColor = vec4(apply_gamma(color), 1.0);
+#endif
+}
@@ -0,0 +1,22 @@
+#version 330 core
+
+#include "include/camera.glsl"
+
+layout (location = 0) in vec2 in_texcoord_0;
+layout (location = 1) in vec3 in_normal;
+layout (location = 2) in vec3 in_position;
+
+out vec3 ourColor;
+out vec2 TexCoord;
+
+uniform vec3 in_color = vec3(1, 0, 0);
+uniform mat4 in_m_model;
+
+// Matches the depth pre-pass (depth.vert)
+invariant gl_Position;
+
+void main() {
+    gl_Position = project(in_m_model * vec4(in_position, 1.0));
+    ourColor = in_color * in_normal;
+    TexCoord = in_texcoord_0;
+}
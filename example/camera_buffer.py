@@ -0,0 +1,94 @@
+"""
+File Name: camera_buffer.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module defines the CameraUniformBuffer class, a uniform buffer
+             object holding the per-frame camera data (view, projection,
+             view-projection, position and near/far planes) shared by all the
+             built-in shader programs through the `CameraBlock` uniform block.
+
+TODO:
+    -
+"""
+
+import struct
+
+import glm
+import moderngl
+
+from PyImOGuizmo import Camera, backend_of
+from shader_program import ShaderProgram
+
+
+
+class CameraUniformBuffer:
+    """
+    CameraUniformBuffer class
+
+    Mirrors the std140 layout of `CameraBlock` in `assets/shaders/include/camera.glsl`:
+
+        mat4 in_m_view;           // offset   0
+        mat4 in_m_proj;           // offset  64
+        mat4 in_m_view_proj;      // offset 128
+        vec4 in_camera_position;  // offset 192
+        vec4 in_near_far;         // offset 208
+
+    Attributes:
+        buffer (moderngl.Buffer): The uniform buffer object.
+        binding (int): The binding point the buffer is bound to.
+    """
+
+    SIZE = 3 * 64 + 2 * 16
+
+
+    def __init__(self, ctx:moderngl.Context, binding:int=ShaderProgram.UNIFORM_BLOCK_BINDINGS[ShaderProgram.ATTRIBS_.CAMERA_BLOCK]):
+        """
+        Creates the buffer and binds it to its binding point.
+
+        Args:
+            ctx: The rendering context in which the buffer is created.
+            binding (int, optional): The uniform block binding point.
+        """
+
+        self.binding = binding
+        self.buffer  = ctx.buffer(reserve=self.SIZE, dynamic=True)
+        self.buffer.bind_to_uniform_block(self.binding)
+
+
+    def update(self, camera:Camera):
+        """
+        Uploads the camera data. Call it once per frame, before rendering.
+
+        Args:
+            camera (Camera): The camera the scene is rendered from.
+        """
+
+        self.write(camera.get_view_matrix(), camera.get_projection_matrix(), camera.NEAR, camera.FAR)
+
+
+    def write(self, m_view:glm.mat4, m_proj:glm.mat4, near:float, far:float):
+        """
+        Uploads the camera data from its matrices, for the views that are not
+        driven by a Camera (e.g. the thumbnails of the atlas). The matrices
+        are glm ones or column-major float32 arrays (see PyImOGuizmo's math
+        backends), written as they are.
+        """
+
+        backend = backend_of(m_view)
+
+        # The view matrix is built around the target, so the eye position is
+        # taken from its inverse rather than from `camera.position`
+        position = backend.inverse(m_view)[3]
+
+        self.buffer.write(b''.join((backend.to_bytes(m_view),
+                                    backend.to_bytes(m_proj),
+                                    backend.to_bytes(backend.multiply(m_proj, m_view)),
+                                    backend.to_bytes(position),
+                                    struct.pack('4f', near, far, 0, 0))))
+
+        self.buffer.bind_to_uniform_block(self.binding)
+
+
+    def release(self):
+        self.buffer.release()
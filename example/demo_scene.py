@@ -0,0 +1,94 @@
+"""
+File Name: demo_scene.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module builds the scene of the demo (a grid, the reference
+             axes and three textured boxes), so the interactive app and the
+             headless mode render exactly the same content.
+
+TODO:
+    -
+"""
+
+import os.path
+
+import moderngl
+
+try:
+    from PIL import Image
+except ImportError as ex:
+    raise ImportError("Texture loader 'PillowLoader' requires Pillow: {}".format(ex))
+
+import mesh as Mesh
+from entity_store import EntityStore
+
+
+
+TEXTURES_DIR = os.path.join(os.path.dirname(__file__), 'assets', 'textures')
+
+
+
+def create_texture(ctx, path):
+        image   = Image.open(path)
+        image = image.transpose( Image.Transpose.FLIP_TOP_BOTTOM)
+
+        texture = ctx.texture(size=image.size, components=3, data=image.convert("RGB").tobytes())
+
+        # mipmaps
+        texture.filter = (moderngl.LINEAR_MIPMAP_LINEAR, moderngl.LINEAR)
+        texture.build_mipmaps()
+
+        # AF
+        texture.anisotropy = 32.0
+        return texture
+
+
+
+def create_demo_scene(ctx:moderngl.Context, store:EntityStore=None):
+    """
+    Creates the entities of the demo scene.
+
+    Args:
+        ctx (moderngl.Context): The context the textures are created in.
+        store (EntityStore, optional): Where the entities are created. Defaults
+                                       to the default store.
+
+    Returns:
+        tuple: (list of the created meshes, dict of the textures by name). The
+               caller releases both.
+    """
+
+    list_entities = []
+
+    # Create a Grid Helper
+    view_grid = Mesh.MeshGrid(store=store)
+    list_entities.append(view_grid)
+
+    # Create an Axes Helper
+    view_reference_axes = Mesh.MeshAxes(store=store)
+    list_entities.append(view_reference_axes)
+
+    textures = {}
+    textures['texture_wood']  = create_texture(ctx, os.path.join(TEXTURES_DIR, 'img.png'))
+    textures['texture_metal'] = create_texture(ctx, os.path.join(TEXTURES_DIR, 'img_1.png'))
+    textures['texture_test']  = create_texture(ctx, os.path.join(TEXTURES_DIR, 'test.png'))
+
+    box_test = Mesh.MeshCube("Wood Box", textures['texture_wood'], store)
+    box_test.position = (-5, 0, 0)
+    list_entities.append(box_test)
+
+    box_test = Mesh.MeshCube("Metal Box", textures['texture_metal'], store)
+    box_test.position = ( 5, 0, 0)
+    list_entities.append(box_test)
+
+    box_test = Mesh.MeshCube("Test Box", textures['texture_test'], store)
+    list_entities.append(box_test)
+
+    # Drawn in the transparent pass, blended over the Test Box behind it
+    box_test = Mesh.MeshCube("Glass Box", textures['texture_metal'], store, opacity=0.35)
+    box_test.position = ( 0, 0, -3.5)
+    box_test.scale    = ( 0.5, 0.5, 0.5)
+    list_entities.append(box_test)
+
+    return list_entities, textures
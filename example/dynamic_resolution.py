@@ -0,0 +1,180 @@
+"""
+File Name: dynamic_resolution.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides DynamicResolution, which scales the
+             resolution the viewport is rendered at to hold a target frame
+             rate. The GPU time of the scene pass is measured with timer
+             queries and the frame time with `perf_counter`, and the scene
+             is rendered into a sub-rectangle of an oversized RenderTarget,
+             upscaled by `imgui.image`, so changing the scale never
+             reallocates the framebuffer.
+
+TODO:
+    -
+"""
+
+import time
+import math
+
+import moderngl
+
+from gpu_timer import GpuTimer
+
+
+
+class DynamicResolution:
+    """
+    DynamicResolution class
+
+    Measure the scene pass with `timer` and call `update()` once per frame:
+
+        render_target.resize(controller.get_render_size(size), controller.get_capacity(size))
+
+        with controller.timer:
+            render_viewport(ctx, render_target.begin(), ..., viewport=render_target.viewport)
+
+    or give it the passes of a GpuProfiler to read instead (see
+    `GpuProfiler.group()`), as the queries of two timers cannot overlap.
+
+    The GPU time of the pass grows with its pixel count, the square of the
+    scale. When it goes over its budget the scale drops at once to the one
+    that would fit it, and when there is headroom it grows back in small
+    steps. The frame time tells a GPU-bound frame from a CPU-bound one: a
+    frame missing its target while the GPU is within budget is not made
+    cheaper by lowering the resolution, so the scale is then left alone.
+
+    After every change the next `timer.latency` measurements, issued at the
+    previous scale, are skipped. The scale is a multiple of `STEP`, so small
+    fluctuations do not change the render size (and re-render the frame).
+
+    Attributes:
+        enabled (bool): Scale the resolution. When False the scale is 1 (or
+                        the closest one within the bounds).
+        target_fps (float): The frame rate to hold.
+        min_scale (float): The lowest scale of the width and height.
+        max_scale (float): The highest one. Above 1 the scene is supersampled.
+        gpu_budget (float): The fraction of the frame time the scene pass may
+                            take on the GPU, the rest is left for ImGui and
+                            the other passes.
+        scale (float): The current scale.
+        gpu_time (float): The smoothed GPU time of the scene pass, in seconds.
+        frame_time (float): The smoothed time between updates, in seconds.
+        timer (GpuTimer): Measures the scene pass. Anything with the `count`,
+                          `elapsed` and `latency` of a GpuTimer will do.
+    """
+
+    STEP      = 1.0 / 32.0
+    MAX_RAISE = 0.05  # Per update, growing back is gradual
+    HEADROOM  = 0.8   # The GPU time must be below this fraction of the budget to grow
+    SMOOTHING = 0.2
+
+
+    def __init__(self, ctx:moderngl.Context, target_fps:float=60.0, min_scale:float=0.5, max_scale:float=1.0,
+                 gpu_budget:float=0.75, timer=None):
+
+        self.enabled    = True
+        self.target_fps = target_fps
+        self.min_scale  = min_scale
+        self.max_scale  = max_scale
+        self.gpu_budget = gpu_budget
+
+        self.scale      = self._clamp(1.0)
+        self.gpu_time   = None
+        self.frame_time = None
+
+        self.timer = timer if timer else GpuTimer(ctx)
+
+        self._last_time  = None
+        self._last_count = 0
+        self._cooldown   = 0
+
+
+    @property
+    def gpu_bound(self) -> bool:
+        """
+        The scene pass takes longer on the GPU than its budget.
+        """
+        return self.gpu_time is not None and self.gpu_time > self.gpu_budget / self.target_fps
+
+
+    def get_render_size(self, size) -> tuple:
+        """
+        Returns the (width, height) to render a viewport of `size` at.
+        """
+        return (max(int(size[0] * self.scale), 1), max(int(size[1] * self.scale), 1))
+
+
+    def get_capacity(self, size) -> tuple:
+        """
+        Returns the (width, height) the render target must be allocated with,
+        so that no scale within the bounds reallocates it.
+        """
+        scale = max(self.max_scale, 1.0)
+        return (max(int(size[0] * scale), 1), max(int(size[1] * scale), 1))
+
+
+    def update(self) -> bool:
+        """
+        Takes the latest measurements and adjusts the scale.
+
+        Returns:
+            bool: The scale changed.
+        """
+
+        now = time.perf_counter()
+        if self._last_time is not None:
+            self.frame_time = self._smooth(self.frame_time, now - self._last_time)
+        self._last_time = now
+
+        if not self.enabled:
+            return self._set_scale(1.0)
+
+        # Nothing new measured, e.g. the viewport was not re-rendered
+        if self.timer.count == self._last_count:
+            return False
+        self._last_count = self.timer.count
+
+        if self._cooldown:
+            self._cooldown -= 1
+            return False
+
+        self.gpu_time = self._smooth(self.gpu_time, self.timer.elapsed)
+        if self.gpu_time <= 0.0:
+            return False
+
+        frame_budget = 1.0 / self.target_fps
+        budget       = self.gpu_budget * frame_budget
+        fitting      = self.scale * math.sqrt(budget / self.gpu_time)
+
+        if self.gpu_time > budget:
+            return self._set_scale(fitting)
+
+        missing_frames = self.frame_time is not None and self.frame_time > frame_budget * 1.05
+        if self.gpu_time < budget * self.HEADROOM and not missing_frames:
+            return self._set_scale(min(fitting, self.scale + self.MAX_RAISE))
+
+        return False
+
+
+    def _set_scale(self, scale) -> bool:
+
+        scale = self._clamp(scale)
+        if scale == self.scale:
+            return False
+
+        self.scale     = scale
+        self.gpu_time  = None
+        self._cooldown = self.timer.latency
+        return True
+
+
+    def _clamp(self, scale) -> float:
+
+        scale = math.floor(scale / self.STEP + 1e-6) * self.STEP
+        return min(max(scale, self.min_scale), self.max_scale)
+
+
+    def _smooth(self, average, value) -> float:
+        return value if average is None else average + (value - average) * self.SMOOTHING
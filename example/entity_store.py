@@ -0,0 +1,458 @@
+"""
+File Name: entity_store.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the EntityStore, a struct-of-arrays store of
+             all the entities of a scene. Entities are integer handles to a row
+             of contiguous NumPy arrays (transform, colour, visibility, geometry
+             and material ids). Geometries and materials are registered once and
+             shared, and the model matrices of all the entities are computed in
+             one vectorized pass. The flags of a material select the variant
+             of its program (textured, transparent) at compile time.
+
+TODO:
+    -
+"""
+
+from enum import IntFlag
+
+import moderngl
+import numpy as np
+
+from scene_buffer import SceneBuffer, SceneSnapshot
+from search_index import SearchIndex
+from shader_program import ShaderProgram
+
+
+
+class MaterialFlags(IntFlag):
+    """
+    The properties of a material that select the variant of its program.
+    """
+
+    NONE        = 0
+    TEXTURED    = 1
+    TRANSPARENT = 2
+
+
+
+class Material:
+    """
+    A shader program and the texture it samples.
+
+    Attributes:
+        shader_name (str): The base name of the shader files of the program.
+        texture (moderngl.Texture): The texture, or None.
+        program (moderngl.Program): The compiled program.
+        flags (MaterialFlags): The variant of the program.
+        defines (dict): The defines the variant is compiled with.
+        optional_attributes (tuple): The vertex attributes the variant may
+                                     not read, left unbound in its vertex
+                                     arrays when the compiler removed them.
+    """
+
+    __slots__ = ('shader_name', 'texture', 'program', 'flags', 'defines', 'optional_attributes')
+
+    def __init__(self, shader_name:str, texture, program, flags:MaterialFlags=MaterialFlags.NONE, defines:dict=None,
+                 optional_attributes:tuple=()):
+        self.shader_name         = shader_name
+        self.texture             = texture
+        self.program             = program
+        self.flags               = flags
+        self.defines             = defines if defines else {}
+        self.optional_attributes = optional_attributes
+
+
+
+class DrawBinding:
+    """
+    Everything needed to draw one geometry with one material. Built once per
+    (geometry, material) pair, so the uniforms are not looked up by name when
+    drawing.
+
+    Attributes:
+        vao (moderngl.VertexArray): The vertex array of the geometry for the program.
+        program (moderngl.Program): The program of the material.
+        texture (moderngl.Texture): The texture of the material, or None.
+        render_mode (int): The primitive type of the geometry.
+        flags (MaterialFlags): The flags of the material.
+        u_model (moderngl.Uniform): The model matrix uniform.
+        u_use_texture (moderngl.Uniform): The texture flag uniform of the
+                                          programs that still branch on it
+                                          at runtime, or None.
+    """
+
+    __slots__ = ('vao', 'program', 'texture', 'render_mode', 'flags', 'u_model', 'u_use_texture')
+
+    def __init__(self, vao, texture, render_mode, flags:MaterialFlags=MaterialFlags.NONE):
+
+        self.vao         = vao
+        self.program     = vao.program
+        self.texture     = texture
+        self.render_mode = render_mode
+        self.flags       = flags
+
+        self.u_model       = self.program.get(ShaderProgram.ATTRIBS_.M_MODEL, None)
+        self.u_use_texture = self.program.get(ShaderProgram.ATTRIBS_.USE_TEXTURE, None)
+
+        u_color = self.program.get(ShaderProgram.ATTRIBS_.COLOR, None)
+        if isinstance(u_color, moderngl.Uniform):
+            u_color.value = (0.5, 0.5, 0.5)
+
+
+
+class EntityStore(SceneBuffer):
+    """
+    EntityStore class
+
+    Extends the double-buffered SceneBuffer with the colour and the geometry
+    and material ids of each entity, so everything the renderer needs is read
+    from the same snapshot. The handle of an entity is the index of its row.
+
+    Attributes:
+        names (list): The name of each entity, indexed by handle.
+        kinds (list): The type of each entity ("Cube", "Grid", ...), indexed by handle.
+        structure_version (int): Incremented when entities are created, 
+                                 destroyed or renamed, i.e. when the outliner 
+                                 has to be rebuilt. Transform writes do not
+                                 change it.
+        search_index (SearchIndex): The names and types of the live entities,
+                                    kept up to date on create, destroy and
+                                    rename.
+        geometries (list): The registered geometries, indexed by geometry id.
+        materials (list): The registered materials, indexed by material id.
+    """
+
+    DEPTH_SHADER_NAME = "depth"
+
+    # The vertex attributes a variant may leave out: the textured ones take
+    # the colour from the texture, the untextured ones from the normal, and
+    # the depth-only program only reads the position
+    TEXTURED_OPTIONAL_ATTRIBUTES   = ('in_normal',)
+    UNTEXTURED_OPTIONAL_ATTRIBUTES = ('in_texcoord_0',)
+    DEPTH_OPTIONAL_ATTRIBUTES      = ('in_texcoord_0', 'in_normal', 'in_color')
+
+    FIELDS = {
+        **SceneBuffer.FIELDS,
+        'color':       (4,  'f4', (1.0, 0.5, 0.5, 1.0)),
+        'geometry_id': ((), 'i4', -1),
+        'material_id': ((), 'i4', -1),
+    }
+
+    _default = None
+
+
+    def __init__(self, capacity:int=256, shaders:ShaderProgram=None):
+
+        super().__init__(capacity)
+
+        self.shaders = shaders
+
+        self.names:list = []
+        self.kinds:list = []
+
+        self.structure_version:int = 0
+
+        self.search_index = SearchIndex()
+
+        self.geometries:list   = []
+        self.render_modes:list = []
+        self.materials:list    = []
+
+        self._geometry_ids      = {}
+        self._material_ids      = {}
+        self._bindings          = {}
+        self._depth_material_id = None
+
+        self._model_matrices = (None, np.zeros((0, 4, 4), dtype='f4'))
+
+
+    # Entities -----------------------------------------------------------------
+
+    def create(self, name:str, geometry_id:int, material_id:int, kind:str="Mesh", **fields) -> int:
+        """
+        Creates an entity.
+
+        Args:
+            name (str): The display name of the entity.
+            geometry_id (int): The id returned by `add_geometry()`.
+            material_id (int): The id returned by `add_material()`.
+            kind (str, optional): The type of the entity, used to group it.
+            **fields: Initial values of other fields (position, scale, ...).
+
+        Returns:
+            int: The handle of the entity.
+        """
+
+        handle = self.allocate(geometry_id=geometry_id, material_id=material_id, **fields)
+
+        if handle == len(self.names):
+            self.names.append(name)
+            self.kinds.append(kind)
+        else:
+            self.names[handle] = name
+            self.kinds[handle] = kind
+
+        self.structure_version += 1
+        self.search_index.add(handle, name, kind)
+
+        return handle
+
+
+    def destroy(self, handle:int):
+        """
+        Destroys an entity. Its handle may be reused by the next `create()`.
+        """
+
+        self.set_row(handle, visible=False, geometry_id=-1, material_id=-1)
+        self.names[handle] = None
+        self.kinds[handle] = None
+        self.free(handle)
+
+        self.structure_version += 1
+        self.search_index.remove(handle)
+
+
+    def rename(self, handle:int, name:str):
+        """
+        Renames an entity.
+        """
+
+        self.names[handle] = name
+        self.structure_version += 1
+        self.search_index.rename(handle, name, self.kinds[handle])
+
+
+    def handles(self):
+        """
+        Returns the handles of all the live entities, in creation order.
+        """
+
+        return [handle for handle, name in enumerate(self.names) if name is not None]
+
+
+    # Geometries and materials -------------------------------------------------
+
+    def add_geometry(self, key, factory, render_mode:int=moderngl.TRIANGLES) -> int:
+        """
+        Registers a geometry shared by all the entities created with the same key.
+
+        Args:
+            key: Any hashable identifying the geometry, e.g. ('grid', size, steps).
+            factory (callable): Creates the Geometry the first time the key is seen.
+            render_mode (int, optional): The primitive type used to draw it.
+
+        Returns:
+            int: The geometry id.
+        """
+
+        geometry_id = self._geometry_ids.get(key)
+        if geometry_id is None:
+            geometry_id = len(self.geometries)
+            self.geometries.append(factory())
+            self.render_modes.append(render_mode)
+            self._geometry_ids[key] = geometry_id
+        return geometry_id
+
+
+    def add_material(self, shader_name:str, texture=None, opacity:float=1.0) -> int:
+        """
+        Registers a material shared by all the entities using the same program,
+        texture and opacity.
+
+        The program is compiled as the variant of the material: `USE_TEXTURE`
+        is defined when it has a texture, and `TRANSPARENT` and `OPACITY`
+        when its opacity is below 1, so the shaders branch at compile time
+        instead of per fragment. The vertex attributes these variants leave
+        out are skipped when binding them (see `Geometry.vertex_array()`).
+
+        Args:
+            shader_name (str): The base name of the shader files.
+            texture (moderngl.Texture, optional): The texture to sample.
+            opacity (float, optional): Below 1 the material is transparent,
+                                       drawn blended after the opaque ones.
+
+        Returns:
+            int: The material id.
+        """
+
+        key = (shader_name, texture.glo if texture else None, opacity)
+
+        material_id = self._material_ids.get(key)
+        if material_id is None:
+
+            flags   = MaterialFlags.NONE
+            defines = {}
+            if texture is not None:
+                flags |= MaterialFlags.TEXTURED
+                defines['USE_TEXTURE'] = 1
+            if opacity < 1.0:
+                flags |= MaterialFlags.TRANSPARENT
+                defines['TRANSPARENT'] = 1
+                defines['OPACITY']     = f'{float(opacity):.6f}'
+
+            if shader_name == self.DEPTH_SHADER_NAME:
+                optional = self.DEPTH_OPTIONAL_ATTRIBUTES
+            elif texture is not None:
+                optional = self.TEXTURED_OPTIONAL_ATTRIBUTES
+            else:
+                optional = self.UNTEXTURED_OPTIONAL_ATTRIBUTES
+
+            material_id = len(self.materials)
+            self.materials.append(Material(shader_name, texture, self._get_shaders().get_program(shader_name, defines),
+                                           flags, defines, optional))
+            self._material_ids[key] = material_id
+        return material_id
+
+
+    def get_binding(self, geometry_id:int, material_id:int) -> DrawBinding:
+        """
+        Returns the vertex array and uniforms to draw a geometry with a material.
+        """
+
+        binding = self._bindings.get((geometry_id, material_id))
+        if binding is None:
+            material = self.materials[material_id]
+            binding  = DrawBinding(self.geometries[geometry_id].vertex_array(material.program, material.optional_attributes),
+                                   material.texture,
+                                   self.render_modes[geometry_id],
+                                   material.flags)
+            self._bindings[(geometry_id, material_id)] = binding
+        return binding
+
+
+    def get_depth_binding(self, geometry_id:int) -> DrawBinding:
+        """
+        Returns the vertex array and uniforms to draw a geometry in the
+        depth-only pre-pass.
+        """
+
+        if self._depth_material_id is None:
+            self._depth_material_id = self.add_material(self.DEPTH_SHADER_NAME)
+        return self.get_binding(geometry_id, self._depth_material_id)
+
+
+    def reload_programs(self, shaders:ShaderProgram):
+        """
+        Picks up the programs replaced by a shader hot-reload and rebuilds the
+        vertex arrays that were using them.
+        """
+
+        for material in self.materials:
+            material.program = shaders.get_program(material.shader_name, material.defines)
+
+        for key, binding in list(self._bindings.items()):
+            if binding.program is not self.materials[key[1]].program:
+                binding.vao.release()
+                del self._bindings[key]
+
+
+    def _get_shaders(self):
+        if self.shaders is None:
+            self.shaders = ShaderProgram.get_default()
+        return self.shaders
+
+
+    # Transforms ---------------------------------------------------------------
+
+    def model_matrices(self, snapshot:SceneSnapshot=None) -> np.ndarray:
+        """
+        Computes the model matrices of all the entities of a snapshot in one
+        vectorized pass, as translate * scale * rotate_z * rotate_y * rotate_x
+        (the same order as the previous per-mesh glm code).
+
+        The result is cached per snapshot version.
+
+        Args:
+            snapshot (SceneSnapshot, optional): Defaults to the current snapshot.
+
+        Returns:
+            np.ndarray: A (count, 4, 4) float32 array. Each matrix is stored
+                        column-major, so `matrices[handle]` can be written to a
+                        mat4 uniform as is.
+        """
+
+        snapshot = snapshot if snapshot else self.snapshot
+
+        version, matrices = self._model_matrices
+        if version == snapshot.version:
+            return matrices
+
+        rotation = snapshot.rotation
+        cos_x, cos_y, cos_z = np.cos(rotation).T
+        sin_x, sin_y, sin_z = np.sin(rotation).T
+
+        # Rows of Rz * Ry * Rx
+        r = np.empty((snapshot.count, 3, 3), dtype='f4')
+        r[:, 0, 0] = cos_z * cos_y
+        r[:, 0, 1] = cos_z * sin_y * sin_x - sin_z * cos_x
+        r[:, 0, 2] = cos_z * sin_y * cos_x + sin_z * sin_x
+        r[:, 1, 0] = sin_z * cos_y
+        r[:, 1, 1] = sin_z * sin_y * sin_x + cos_z * cos_x
+        r[:, 1, 2] = sin_z * sin_y * cos_x - cos_z * sin_x
+        r[:, 2, 0] = -sin_y
+        r[:, 2, 1] = cos_y * sin_x
+        r[:, 2, 2] = cos_y * cos_x
+
+        # Scaling is applied before the rotation, i.e. it scales the rows
+        r *= snapshot.scale[:, :, None]
+
+        # Transposed, so the memory layout is column-major
+        matrices = np.zeros((snapshot.count, 4, 4), dtype='f4')
+        matrices[:, :3, :3] = r.transpose(0, 2, 1)
+        matrices[:, 3, :3]  = snapshot.position
+        matrices[:, 3, 3]   = 1.0
+
+        self._model_matrices = (snapshot.version, matrices)
+        return matrices
+
+
+    def world_bounds(self, handles, local_min=(-1, -1, -1), local_max=(1, 1, 1), snapshot:SceneSnapshot=None) -> tuple:
+        """
+        Computes the world axis aligned bounding boxes of entities, from the
+        box of their geometry in local space (the unit cube of MeshCube by
+        default), in one vectorized pass over their model matrices.
+
+        Args:
+            handles (list): The entities.
+            local_min (tuple, optional): The minimum corner of the local box.
+            local_max (tuple, optional): The maximum corner of the local box.
+            snapshot (SceneSnapshot, optional): Defaults to the current snapshot.
+
+        Returns:
+            tuple: The (N, 3) minimum and maximum corners, e.g. for
+                   `Camera.zoom_to_fit()`.
+        """
+
+        matrices = self.model_matrices(snapshot)[np.asarray(handles, dtype=np.intp)]
+
+        local_min = np.asarray(local_min, dtype='f4')
+        local_max = np.asarray(local_max, dtype='f4')
+
+        # The matrices are column-major, so a row vector times their 3x3 part
+        # is the transformed vector
+        linear = matrices[:, :3, :3]
+        center = (0.5 * (local_min + local_max)) @ linear + matrices[:, 3, :3]
+        extent = (0.5 * (local_max - local_min)) @ np.abs(linear)
+
+        return center - extent, center + extent
+
+
+    def release(self):
+        """
+        Releases the vertex arrays and geometries. The programs belong to the
+        shader library and the textures to the application.
+        """
+
+        for binding in self._bindings.values():
+            binding.vao.release()
+        self._bindings.clear()
+
+        for geometry in self.geometries:
+            geometry.destroy()
+        self.geometries.clear()
+        self._geometry_ids.clear()
+
+        if EntityStore._default is self:
+            EntityStore._default = None
@@ -0,0 +1,269 @@
+"""
+File Name: frame_capture.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides FrameCapture, which records the frames of a
+             framebuffer without stalling the render loop. The pixels of each
+             frame are read into a ring of pixel-pack buffers and only copied
+             back a couple of frames later, when the transfer is done, then
+             handed to a background encoder thread through a bounded queue.
+             Two encoders are provided: a PNG image sequence and an ffmpeg pipe.
+
+TODO:
+    -
+"""
+
+import os
+import sys
+import queue
+import shutil
+import threading
+import subprocess
+
+import moderngl
+import numpy as np
+
+
+
+class ImageSequenceEncoder:
+    """
+    Writes each frame to a numbered PNG file.
+    """
+
+    def __init__(self, directory:str, pattern:str='frame_{:06d}.png'):
+
+        from PIL import Image
+        self._image = Image
+
+        self.directory = directory
+        self.pattern   = pattern
+        os.makedirs(directory, exist_ok=True)
+
+
+    def __call__(self, index:int, pixels:np.ndarray):
+        self._image.fromarray(pixels, 'RGBA').save(os.path.join(self.directory, self.pattern.format(index)))
+
+
+    def close(self):
+        pass
+
+
+
+class FFmpegEncoder:
+    """
+    Pipes the frames as raw RGBA to an ffmpeg process encoding a video.
+    """
+
+    def __init__(self, path:str, fps:float=60, args:tuple=('-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p')):
+
+        self.executable = shutil.which('ffmpeg')
+        if self.executable is None:
+            raise FileNotFoundError("FFmpegEncoder requires 'ffmpeg' in the PATH")
+
+        self.path    = path
+        self.fps     = fps
+        self.args    = args
+        self.process = None
+        self.size    = None
+
+
+    def __call__(self, index:int, pixels:np.ndarray):
+
+        height, width = pixels.shape[:2]
+
+        if self.process is None:
+            self.size    = (width, height)
+            self.process = subprocess.Popen([self.executable, '-y', '-loglevel', 'error',
+                                             '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                                             '-s', f'{width}x{height}', '-r', str(self.fps),
+                                             '-i', '-', *self.args, self.path],
+                                            stdin=subprocess.PIPE)
+
+        elif (width, height) != self.size:
+            sys.stderr.write(f"FFmpegEncoder: frame {index} skipped, the size changed to {width}x{height}\n")
+            return
+
+        self.process.stdin.write(np.ascontiguousarray(pixels).data)
+
+
+    def close(self):
+
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process = None
+
+
+
+class FrameCapture:
+    """
+    FrameCapture class
+
+    `capture()` is called once per frame, after the frame is rendered. It
+    queues a glReadPixels into the next pixel-pack buffer of the ring, which
+    returns immediately, and copies out the buffer written `ring_size - 1`
+    frames ago, whose transfer is complete by now. With the default ring of 3
+    the pixels of frame N are copied while frame N + 2 is being rendered.
+
+    The copied frames go to the encoder thread through a bounded queue. The
+    arrays are taken from a fixed pool, so nothing is allocated per frame.
+    When the encoder falls behind and the pool is empty, `capture()` either
+    waits for it (backpressure, the default) or drops the frame.
+
+    Attributes:
+        encoder (callable): Called as `encoder(index, pixels)` on the encoder
+                            thread, with a top row first (height, width, 4)
+                            uint8 array valid only during the call. Its
+                            `close()` is called by `stop()`, if it has one.
+        ring_size (int): The number of pixel-pack buffers.
+        drop_frames (bool): Drop the frames instead of waiting for the encoder.
+        captured (int): The frames read so far.
+        dropped (int): The frames dropped because the encoder was behind.
+        encoded (int): The frames handed to the encoder.
+    """
+
+    COMPONENTS = 4
+
+
+    def __init__(self, ctx:moderngl.Context, encoder, ring_size:int=3, queue_size:int=4, drop_frames:bool=False):
+
+        if ring_size < 2:
+            raise ValueError("FrameCapture needs a ring of at least 2 pixel buffers")
+
+        self.ctx         = ctx
+        self.encoder     = encoder
+        self.ring_size   = ring_size
+        self.queue_size  = max(int(queue_size), 1)
+        self.drop_frames = drop_frames
+
+        self.captured = 0
+        self.dropped  = 0
+        self.encoded  = 0
+
+        self._size    = None
+        self._pbos    = []
+        self._pending = [None] * ring_size  # frame index read into each buffer
+        self._frame   = 0
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._pool  = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="FrameCaptureEncoder", daemon=True)
+        self._thread.start()
+
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+
+    def capture(self, fbo:moderngl.Framebuffer, attachment:int=0, viewport:tuple=None):
+        """
+        Captures the frame just rendered into a framebuffer.
+
+        Args:
+            fbo (moderngl.Framebuffer): The framebuffer to capture.
+            attachment (int, optional): The colour attachment index.
+            viewport (tuple, optional): The (x, y, width, height) to capture.
+                                        Defaults to the whole framebuffer.
+        """
+
+        viewport = viewport if viewport else (0, 0, *fbo.size)
+        if tuple(viewport[2:]) != self._size:
+            self._allocate(tuple(viewport[2:]))
+
+        slot = self._frame % self.ring_size
+        fbo.read_into(self._pbos[slot], viewport, components=self.COMPONENTS, attachment=attachment, alignment=1)
+        self._pending[slot] = self._frame
+        self._frame += 1
+
+        # Copy out the oldest frame, so its buffer is free for the next one
+        oldest = self._frame % self.ring_size
+        if self._pending[oldest] is not None:
+            self._retire(oldest)
+
+
+    def stop(self):
+        """
+        Copies out the frames still in the ring, waits for the encoder to
+        finish them and releases the buffers.
+        """
+
+        if self._thread is None:
+            return
+
+        self._flush_ring()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if hasattr(self.encoder, 'close'):
+            self.encoder.close()
+
+        for pbo in self._pbos:
+            pbo.release()
+        self._pbos.clear()
+
+
+    def _retire(self, slot):
+
+        index = self._pending[slot]
+        self._pending[slot] = None
+
+        try:
+            pixels = self._pool.get(block=not self.drop_frames)
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        self._pbos[slot].read_into(pixels)
+        self._queue.put((index, pixels))
+        self.captured += 1
+
+
+    def _flush_ring(self):
+
+        for slot in sorted((slot for slot, index in enumerate(self._pending) if index is not None),
+                           key=lambda slot: self._pending[slot]):
+            self._retire(slot)
+
+
+    def _allocate(self, size):
+
+        # The frames of the previous size go out first, and their arrays are
+        # back in the pool before it is replaced
+        self._flush_ring()
+        self._queue.join()
+
+        for pbo in self._pbos:
+            pbo.release()
+
+        width, height = size
+        self._size = size
+        self._pbos = [self.ctx.buffer(reserve=width * height * self.COMPONENTS) for _ in range(self.ring_size)]
+
+        self._pool = queue.Queue()
+        for _ in range(self.queue_size + 1):
+            self._pool.put(np.empty((height, width, self.COMPONENTS), dtype=np.uint8))
+
+
+    def _run(self):
+
+        while True:
+
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            index, pixels = item
+            try:
+                # OpenGL rows are bottom to top
+                self.encoder(index, pixels[::-1])
+                self.encoded += 1
+            except Exception as error:
+                sys.stderr.write(f"Frame {index} could not be encoded: {error}\n")
+            finally:
+                self._pool.put(pixels)
+                self._queue.task_done()
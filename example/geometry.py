@@ -2,7 +2,7 @@
 File Name: geometry.py
 Author: JuanMa Romero Martin <juanma@ihm.solutions>
 Date Created:  2025-02-15
-Last Modified: 2025-03-01
+Last Modified: 2026-10-19
 Description: This module provides an abstract base class `Geometry` for handling 
              geometric shapes in a rendering context. It includes functionality 
              to initialize vertex buffer objects (VBOs), manage vertex attributes, 
@@ -13,6 +13,8 @@ TODO:
     - 
 """
 
+import re
+
 import numpy as np
 import moderngl as mgl
 from abc import ABC
@@ -86,21 +88,62 @@ class Geometry(ABC):
         return self.attributes    
         
         
-    def vertex_array(self, program) -> mgl.VertexArray:
+    def vertex_array(self, program, skip=()) -> mgl.VertexArray:
         """
         Creates a vertex array from the given shader program and VBO.
 
         Args:
             program: The shader program to be used for the vertex array.
+            skip (tuple, optional): The attributes the program may not read,
+                                    e.g. the texture coordinates for an 
+                                    untextured variant. The ones missing from
+                                    the program are left unbound, any other
+                                    missing attribute is still an error.
 
         Returns:
             The created Vertex Array Object.
         """
+        attributes_format, attributes = self.get_bound_attributes([name for name in skip if name not in program])
         return self.ctx.vertex_array(program, [ 
                                                  ( self.vbo, 
-                                                   self.attributes_format, 
-                                                   *self.attributes ) 
+                                                   attributes_format, 
+                                                   *attributes ) 
                                                  ])
+
+
+    def get_bound_attributes(self, skip=()):
+        """
+        Returns the format and the attribute names of the vertex data, with
+        the attributes in `skip` turned into padding.
+        """
+
+        if not skip:
+            return self.attributes_format, self.attributes
+
+        tokens     = []
+        attributes = []
+        names      = iter(self.attributes)
+        for token in self.attributes_format.split():
+
+            # Padding, e.g. '12x', has no attribute
+            if token.endswith('x'):
+                tokens.append(token)
+                continue
+
+            name = next(names)
+            if name not in skip:
+                tokens.append(token)
+                attributes.append(name)
+                continue
+
+            match = re.fullmatch(r'(\d*)([fiu])(\d?)', token)
+            if match is None:
+                raise ValueError(f"Cannot skip the attribute '{name}' of format '{token}'")
+
+            count, _, size = match.groups()
+            tokens.append(f'{int(count or 1) * int(size or 4)}x')
+
+        return ' '.join(tokens), attributes
     
     
     def get_data(self, vertices, indices):
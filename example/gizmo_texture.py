@@ -0,0 +1,176 @@
+"""
+File Name: gizmo_texture.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides GizmoTextureRenderer, the moderngl side of
+             PyImOGuizmo's GizmoCache: it renders the draw list of the gizmo
+             into a small texture with the ImGui OpenGL backend, so while the
+             view is static the gizmo is one textured quad instead of the
+             circles, lines and labels ImGui tessellates every frame.
+
+TODO:
+    -
+"""
+
+import math
+
+import moderngl
+from imgui_bundle import imgui
+
+
+
+UNPREMULTIPLY_VERTEX_SHADER = """
+#version 330 core
+
+uniform vec2 u_uv_scale;
+
+out vec2 v_uv;
+
+void main()
+{
+    // Full screen triangle
+    vec2 position = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2);
+    v_uv          = position * u_uv_scale;
+    gl_Position   = vec4(position * 2.0 - 1.0, 0.0, 1.0);
+}
+"""
+
+UNPREMULTIPLY_FRAGMENT_SHADER = """
+#version 330 core
+
+uniform sampler2D u_texture;
+
+in  vec2 v_uv;
+out vec4 f_color;
+
+void main()
+{
+    vec4 color = texture(u_texture, v_uv);
+    f_color    = vec4(color.a > 0.0 ? color.rgb / color.a : vec3(0.0), color.a);
+}
+"""
+
+
+
+class GizmoTextureRenderer:
+    """
+    GizmoTextureRenderer class
+
+    Renders the offscreen draw lists of a GizmoCache:
+
+        PyImOGuizmo.config.cache = PyImOGuizmo.GizmoCache(GizmoTextureRenderer(ctx))
+
+    The ImGui backend blends the colour with the source alpha and the alpha
+    with one, so over a transparent background the result has its colour
+    premultiplied by its alpha. `imgui.image` blends it with the source alpha
+    again, so a second pass divides it back into the texture returned.
+
+    Each render reads the framebuffer bound at the time and binds it back,
+    so it can be called while the ImGui frame is built.
+
+    Attributes:
+        textures (dict): The rendered textures, by their OpenGL name.
+    """
+
+    def __init__(self, ctx:moderngl.Context):
+
+        self.ctx = ctx
+        self.textures:dict = {}
+
+        self.program = ctx.program(vertex_shader=UNPREMULTIPLY_VERTEX_SHADER, fragment_shader=UNPREMULTIPLY_FRAGMENT_SHADER)
+        self.vao     = ctx.vertex_array(self.program, [])
+
+        # Premultiplied render, shared by all the textures and grown as needed
+        self._scratch_size    = (0, 0)
+        self._scratch_texture = None
+        self._scratch_fbo     = None
+
+
+    def render(self, draw_list:imgui.ImDrawList, display_size:tuple, framebuffer_scale:tuple) -> int:
+        """
+        Renders a draw list into a new texture.
+
+        Args:
+            draw_list (imgui.ImDrawList): The draw list, with its origin at (0, 0).
+            display_size (tuple): The size of the draw list, in ImGui units.
+            framebuffer_scale (tuple): The pixels per unit, the DPI scale.
+
+        Returns:
+            int: The OpenGL name of the texture, for `add_image`.
+        """
+
+        size = (max(math.ceil(display_size[0] * framebuffer_scale[0]), 1),
+                max(math.ceil(display_size[1] * framebuffer_scale[1]), 1))
+
+        self._allocate_scratch(size)
+
+        draw_data = imgui.ImDrawData()
+        draw_data.valid             = True
+        draw_data.display_pos       = (0, 0)
+        draw_data.display_size      = display_size
+        draw_data.framebuffer_scale = framebuffer_scale
+        draw_data.add_draw_list(draw_list)
+
+        previous = self.ctx.detect_framebuffer()
+
+        self._scratch_fbo.use()
+        self._scratch_fbo.clear(0.0, 0.0, 0.0, 0.0, viewport=(0, 0, *size))
+        imgui.backends.opengl3_render_draw_data(draw_data)
+
+        texture = self.ctx.texture(size, 4)
+        fbo     = self.ctx.framebuffer(color_attachments=[texture])
+
+        # Divide the colour by the alpha, from the bottom-left corner of the
+        # scratch texture the backend rendered into
+        fbo.use()
+        self.ctx.viewport = (0, 0, *size)
+        self.ctx.disable(moderngl.BLEND)
+
+        self._scratch_texture.use(0)
+        self.program['u_texture']  = 0
+        self.program['u_uv_scale'] = (size[0] / self._scratch_size[0], size[1] / self._scratch_size[1])
+        self.vao.render(moderngl.TRIANGLES, vertices=3)
+
+        self.ctx.enable(moderngl.BLEND)
+
+        fbo.release()
+        previous.use()
+
+        self.textures[texture.glo] = texture
+        return texture.glo
+
+
+    def release(self, texture_id:int):
+
+        texture = self.textures.pop(texture_id, None)
+        if texture is not None:
+            texture.release()
+
+
+    def _allocate_scratch(self, size):
+
+        if size[0] <= self._scratch_size[0] and size[1] <= self._scratch_size[1]:
+            return
+
+        if self._scratch_fbo:
+            self._scratch_fbo.release()
+            self._scratch_texture.release()
+
+        self._scratch_size    = (max(size[0], self._scratch_size[0]), max(size[1], self._scratch_size[1]))
+        self._scratch_texture = self.ctx.texture(self._scratch_size, 4)
+        self._scratch_fbo     = self.ctx.framebuffer(color_attachments=[self._scratch_texture])
+
+
+    def destroy(self):
+
+        for texture in self.textures.values():
+            texture.release()
+        self.textures.clear()
+
+        if self._scratch_fbo:
+            self._scratch_fbo.release()
+            self._scratch_texture.release()
+
+        self.vao.release()
+        self.program.release()
@@ -0,0 +1,302 @@
+"""
+File Name: gpu_timer.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides GpuTimer, which measures how long the GPU
+             takes to execute a block of commands with `GL_TIME_ELAPSED`
+             queries, and GpuProfiler, which keeps one of them per render
+             pass with rolling statistics. Timing `vao.render()` on the CPU
+             only measures the submission; the queries measure the execution,
+             and are read a couple of frames later so reading them does not
+             stall.
+
+TODO:
+    -
+"""
+
+import time
+import contextlib
+from collections import deque
+
+import moderngl
+import numpy as np
+
+
+
+class GpuTimer:
+    """
+    GpuTimer class
+
+    Wraps the commands to measure:
+
+        with timer:
+            render_viewport(...)
+
+    Each measurement goes into the next query of a ring of `latency` queries,
+    and the one issued `latency - 1` measurements ago, whose result is ready
+    by now, is read back. The result lags behind by that many measurements
+    (as the readback of FrameCapture does), but the GPU never has to catch up
+    with the CPU for it.
+
+    Only one timer can be measuring at a time: OpenGL does not nest
+    `GL_TIME_ELAPSED` queries.
+
+    Attributes:
+        latency (int): The number of queries in the ring.
+        elapsed (float): The GPU time of the last measurement read back, in
+                         seconds, or None before the first one.
+        count (int): The number of measurements read back so far, to tell
+                     when `elapsed` holds a new one.
+        history (deque): The last measurements read back, in seconds.
+    """
+
+    INVALID = 0xFFFFFFFF
+
+
+    def __init__(self, ctx:moderngl.Context, latency:int=3, history:int=1):
+
+        if latency < 2:
+            raise ValueError("GpuTimer needs a ring of at least 2 queries")
+
+        self.latency = latency
+        self.elapsed = None
+        self.count   = 0
+        self.history = deque(maxlen=max(int(history), 1))
+
+        self._queries = [ctx.query(time=True) for _ in range(latency)]
+        self._pending = [False] * latency
+        self._frame   = 0
+
+
+    def __enter__(self):
+
+        slot = self._frame % self.latency
+        if self._pending[slot]:
+            self._retire(slot)
+
+        self._queries[slot].__enter__()
+        return self
+
+
+    def __exit__(self, *args):
+
+        slot = self._frame % self.latency
+        self._queries[slot].__exit__(*args)
+        self._pending[slot] = True
+        self._frame += 1
+
+        # Read back the oldest measurement, so its query is free for the next one
+        oldest = self._frame % self.latency
+        if self._pending[oldest]:
+            self._retire(oldest)
+
+
+    def flush(self):
+        """
+        Reads back the measurements still in flight, oldest first. This waits
+        for the GPU, use it at the end of a benchmark, not per frame.
+        """
+
+        for offset in range(1, self.latency + 1):
+            slot = (self._frame + offset) % self.latency
+            if self._pending[slot]:
+                self._retire(slot)
+
+
+    def _retire(self, slot):
+
+        self._pending[slot] = False
+
+        # The result is read as 32 bits (nanoseconds); some drivers return it
+        # saturated for the first query of the context, which is no measurement
+        elapsed = self._queries[slot].elapsed
+        if elapsed >= self.INVALID:
+            return
+
+        self.elapsed = elapsed * 1e-9
+        self.count  += 1
+        self.history.append(self.elapsed)
+
+
+
+class GpuTimerGroup:
+    """
+    The sum of several timers measured once per frame each, e.g. the passes
+    of the viewport. It reads like a GpuTimer (`elapsed`, `count`, `latency`,
+    `history`), so it can be given to DynamicResolution.
+    """
+
+    def __init__(self, timers:list):
+        self.timers = timers
+
+
+    @property
+    def latency(self) -> int:
+        return max(timer.latency for timer in self.timers)
+
+
+    @property
+    def count(self) -> int:
+        return min(timer.count for timer in self.timers)
+
+
+    @property
+    def elapsed(self) -> float:
+
+        if any(timer.elapsed is None for timer in self.timers):
+            return None
+        return sum(timer.elapsed for timer in self.timers)
+
+
+    @property
+    def history(self) -> list:
+
+        length = min(len(timer.history) for timer in self.timers)
+        if not length:
+            return []
+        return np.sum([list(timer.history)[-length:] for timer in self.timers], axis=0).tolist()
+
+
+
+class TimerStats:
+    """
+    Rolling statistics of a timer, in seconds.
+    """
+
+    __slots__ = ('samples', 'last', 'mean', 'minimum', 'maximum', 'p95')
+
+    def __init__(self, history):
+
+        history = np.asarray(history, dtype=np.float64)
+
+        self.samples = len(history)
+        self.last    = float(history[-1])
+        self.mean    = float(history.mean())
+        self.minimum = float(history.min())
+        self.maximum = float(history.max())
+        self.p95     = float(np.percentile(history, 95))
+
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+
+class GpuProfiler:
+    """
+    GpuProfiler class
+
+    One GpuTimer per named pass, created the first time the pass is measured:
+
+        with profiler.scope("grid"):
+            ...
+
+    Each timer keeps its last `history` measurements, from which `get_stats()`
+    computes the rolling statistics. The CPU time of the frames is recorded
+    along, with `record_frame()`, so a slow frame can be told GPU-bound from
+    CPU-bound.
+
+    Attributes:
+        enabled (bool): Measure the scopes. When False they do nothing.
+        latency (int): The query ring size of the timers, 3 by default so the
+                       results are read two frames late.
+        history (int): The number of measurements kept per pass.
+        timers (dict): The GpuTimer of each pass, in the order first measured.
+        groups (dict): The GpuTimerGroup of each group, see `group()`.
+        cpu_history (deque): The CPU time of the last frames, in seconds.
+    """
+
+    def __init__(self, ctx:moderngl.Context, latency:int=3, history:int=120):
+
+        self.ctx     = ctx
+        self.enabled = True
+        self.latency = latency
+        self.history = history
+
+        self.timers:dict = {}
+        self.groups:dict = {}
+
+        self.cpu_history = deque(maxlen=history)
+        self._frame_start = None
+
+
+    def get_timer(self, name:str) -> GpuTimer:
+
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = GpuTimer(self.ctx, self.latency, self.history)
+        return timer
+
+
+    def scope(self, name:str):
+        """
+        Returns the context manager measuring the pass `name`.
+        """
+        return self.get_timer(name) if self.enabled else contextlib.nullcontext()
+
+
+    def group(self, name:str, passes) -> GpuTimerGroup:
+        """
+        Returns the sum of several passes, reported under `name`. Every pass
+        of a group should be measured in every frame the group is.
+        """
+
+        group = self.groups.get(name)
+        if group is None:
+            group = self.groups[name] = GpuTimerGroup([self.get_timer(pass_name) for pass_name in passes])
+        return group
+
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+
+    def record_frame(self):
+        """
+        Records the CPU time since `begin_frame()`, call it before swapping
+        the buffers (the wait for the vertical sync is not CPU work).
+        """
+
+        if self._frame_start is not None:
+            self.cpu_history.append(time.perf_counter() - self._frame_start)
+            self._frame_start = None
+
+
+    def get_stats(self, name:str) -> TimerStats:
+        """
+        Returns the rolling statistics of a pass, a group or, for "cpu", of
+        the CPU time of the frames. None until there is a measurement.
+        """
+
+        if name == "cpu":
+            history = self.cpu_history
+        else:
+            timer   = self.timers.get(name) or self.groups.get(name)
+            history = timer.history if timer else ()
+
+        return TimerStats(history) if len(history) else None
+
+
+    def summary(self) -> dict:
+        """
+        Returns the statistics of every pass, group and the CPU as plain
+        dictionaries, e.g. to assert on them or dump them as JSON from an
+        automated performance test.
+        """
+
+        summary = {}
+        for name in (*self.timers, *self.groups, "cpu"):
+            stats = self.get_stats(name)
+            if stats:
+                summary[name] = stats.to_dict()
+        return summary
+
+
+    def flush(self):
+        """
+        Reads back every measurement in flight. This waits for the GPU.
+        """
+
+        for timer in self.timers.values():
+            timer.flush()
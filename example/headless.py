@@ -0,0 +1,217 @@
+#!/usr/bin/env uv run
+# -*- coding: utf-8 -*-
+
+"""
+File Name: headless.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: Renders the demo scene without any window, in a standalone
+             moderngl context (EGL, or Mesa's software rasterizer on a CPU-only
+             Linux box), through the same framebuffer path as the interactive
+             app. Useful for thumbnails, batch renders and CI checks.
+
+             Usage: python headless.py --width 800 --height 600 --output frame.png
+
+TODO:
+    -
+"""
+
+import sys
+sys.path.append('..')
+
+import time
+import json
+import argparse
+import contextlib
+
+import moderngl
+
+try:
+    from PIL import Image
+except ImportError as ex:
+    raise ImportError("Saving the frames requires Pillow: {}".format(ex))
+
+# Import local Libraries
+import PyImOGuizmo
+from shader_program import ShaderProgram
+from camera_buffer import CameraUniformBuffer
+from render_queue import RenderQueue
+from entity_store import EntityStore
+from offscreen import create_standalone_context, RenderTarget, render_viewport, FramebufferReader
+from demo_scene import create_demo_scene
+from frame_capture import FrameCapture, ImageSequenceEncoder
+from multi_view import MultiViewRenderer, fibonacci_sphere
+from gpu_timer import GpuProfiler
+
+
+
+def parse_args(argv=None):
+
+    parser = argparse.ArgumentParser(description="Render the PyImOGuizmo demo scene offscreen.")
+    parser.add_argument("--width",   type=int, default=800)
+    parser.add_argument("--height",  type=int, default=600)
+    parser.add_argument("--samples", type=int, default=1, help="MSAA samples per pixel")
+    parser.add_argument("--frames",  type=int, default=1, help="Number of frames to render (the last one is saved)")
+    parser.add_argument("--output",  default="frame.png", help="Image file of the last frame, empty to skip it")
+    parser.add_argument("--capture", default="", help="Directory to save every frame to, as a PNG sequence")
+    parser.add_argument("--views",   type=int, default=0, help="Also render this many viewpoints over a sphere, saved as atlases")
+    parser.add_argument("--tile",    type=int, default=128, help="Size of each viewpoint in the atlases")
+    parser.add_argument("--depth-prepass", action="store_true", help="Draw the opaque geometry in a depth-only pre-pass first")
+    parser.add_argument("--backend", default=None, help="moderngl backend, e.g. 'egl'. Defaults to EGL on Linux")
+    parser.add_argument("--math-backend", default="glm", choices=("glm", "numpy"), help="Math backend of the camera")
+    parser.add_argument("--orthographic", action="store_true", help="Render with an orthographic projection")
+    parser.add_argument("--fit", action="store_true", help="Zoom the camera to fit the boxes of the scene")
+    parser.add_argument("--profile", action="store_true", help="Print the GPU time of each render pass")
+    parser.add_argument("--profile-json", default="", help="Also save the GPU timings to this JSON file")
+    return parser.parse_args(argv)
+
+
+
+def render_views(ctx, store, camera, count, tile_size):
+    """
+    Renders `count` viewpoints evenly distributed over a sphere around the
+    scene and saves them as atlases (views_000.png, ...).
+    """
+
+    renderer = MultiViewRenderer(ctx, store, (tile_size, tile_size))
+    views    = fibonacci_sphere(count, camera.get_distance())
+
+    start = time.perf_counter()
+
+    # One frame: every page shows the same state of the scene
+    snapshot = store.swap()
+
+    for page, (first, view_count, atlas) in enumerate(renderer.render_atlases(renderer.get_view_matrices(views, camera), camera, snapshot)):
+        Image.fromarray(atlas, 'RGBA').save(f"views_{page:03d}.png")
+
+    elapsed = time.perf_counter() - start
+    print(f"{count} view(s) of {tile_size}x{tile_size} in {elapsed * 1000:.1f} ms")
+
+    renderer.release()
+
+
+
+def print_profile(profiler, path=""):
+    """
+    Prints the GPU time of each render pass, and saves it as JSON to `path`.
+    """
+
+    profiler.flush()
+    summary = profiler.summary()
+
+    print(f"{'Pass':<10}{'Samples':>8}{'Mean':>9}{'Min':>9}{'Max':>9}{'P95':>9}  ms")
+    for name, stats in summary.items():
+        print(f"{name:<10}{stats['samples']:>8}" + "".join(f"{stats[key] * 1000:9.3f}" for key in ('mean', 'minimum', 'maximum', 'p95')))
+
+    if path:
+        with open(path, 'w') as file:
+            json.dump(summary, file, indent=2)
+        print(f"Saved {path}")
+
+
+
+def main(argv=None) -> None:
+
+    args = parse_args(argv)
+
+    # Initialize a ModernGL context without any window
+    ctx = create_standalone_context(args.backend)
+
+    ctx.enable(flags=moderngl.DEPTH_TEST | moderngl.CULL_FACE | moderngl.BLEND)
+
+    print(f"OpenGL: {ctx.info['GL_RENDERER']} ({ctx.info['GL_VERSION']})")
+
+    shaders      = ShaderProgram.get_default(ctx)
+    camera_ubo   = CameraUniformBuffer(ctx)
+    render_queue = RenderQueue(depth_prepass=args.depth_prepass)
+
+    profiler = GpuProfiler(ctx) if args.profile or args.profile_json else None
+    render_queue.profiler = profiler
+
+    render_target = RenderTarget(ctx, (args.width, args.height), args.samples)
+    reader        = FramebufferReader(ctx, render_target.size)
+    frame_capture = FrameCapture(ctx, ImageSequenceEncoder(args.capture)) if args.capture else None
+
+
+    # Create Scene -------------------------------------------------------------
+
+    camera = PyImOGuizmo.Camera( args.width/args.height,
+                                 position = (0, 1, 15),
+                                 pitch    = 0,
+                                 yaw      = -90,
+                                 backend  = args.math_backend)
+    camera.FOV = 45
+
+    store = EntityStore.get_default()
+    list_entities, textures = create_demo_scene(ctx, store)
+
+    camera.orthographic = args.orthographic
+
+    if args.fit:
+        store.swap()
+        camera.zoom_to_fit(*store.world_bounds([handle for handle in store.handles() if store.kinds[handle] == "Cube"]))
+
+
+    # Render -------------------------------------------------------------------
+
+    start = time.perf_counter()
+
+    for _ in range(max(args.frames, 1)):
+
+        if profiler:
+            profiler.begin_frame()
+
+        render_viewport(ctx, render_target.begin(), camera, store, camera_ubo, render_queue,
+                        viewport=render_target.viewport)
+
+        with profiler.scope("resolve") if profiler else contextlib.nullcontext():
+            render_target.resolve()
+
+        if profiler:
+            profiler.record_frame()
+
+        if frame_capture:
+            frame_capture.capture(render_target.output_fbo, viewport=render_target.viewport)
+
+    pixels = reader.read(render_target.output_fbo, viewport=render_target.viewport)
+
+    elapsed = time.perf_counter() - start
+    print(f"{args.frames} frame(s) of {args.width}x{args.height} in {elapsed * 1000:.1f} ms")
+
+    if frame_capture:
+        frame_capture.stop()
+        print(f"Captured {frame_capture.encoded} frame(s) to {args.capture}")
+
+    if args.output:
+        Image.fromarray(pixels, 'RGBA').save(args.output)
+        print(f"Saved {args.output}")
+
+    if profiler:
+        print_profile(profiler, args.profile_json)
+
+
+    if args.views > 0:
+        render_views(ctx, store, camera, args.views, args.tile)
+
+
+    # Cleanup
+    reader.release()
+    render_target.release()
+
+    for cur_texture in textures.values():
+        cur_texture.release()
+
+    for cur_entity in list_entities:
+        cur_entity.release()
+
+    store.release()
+    camera_ubo.release()
+    shaders.destroy()
+
+    ctx.release()
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env uv run
+# -*- coding: utf-8 -*-
+
+"""
+File Name: import_benchmark.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: Measures the import time of PyImOGuizmo, each run in a fresh
+             interpreter, for the Camera alone and for the full gizmo, and
+             checks that the Camera alone does not import imgui_bundle. With
+             --max-ms it fails (exit code 1) when the Camera import takes
+             longer, to guard the start-up time of worker processes.
+
+             Usage: python import_benchmark.py --repeat 10 --max-ms 100
+
+TODO:
+    -
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+
+
+# Each case runs in its own interpreter, and prints the time to import it and
+# whether imgui_bundle was imported
+CASES = {
+    "camera": "PyImOGuizmo.Camera(16 / 9)",
+    "gizmo":  "PyImOGuizmo.config",
+}
+
+CASE_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import PyImOGuizmo
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, 'imgui_bundle' in sys.modules)
+"""
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+
+def parse_args(argv=None):
+
+    parser = argparse.ArgumentParser(description="Measure the import time of PyImOGuizmo.")
+    parser.add_argument("--repeat", type=int,   default=10, help="Fresh interpreters per case")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="Fail when the median Camera import takes longer, 0 to skip")
+    parser.add_argument("--json",   default="", help="Also save the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+
+def measure(statement:str) -> tuple:
+    """
+    Imports PyImOGuizmo and runs `statement` in a fresh interpreter.
+
+    Returns:
+        tuple: The time it took in seconds, and whether imgui_bundle was imported.
+    """
+
+    script = CASE_SCRIPT.format(root=ROOT_PATH, statement=statement)
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+
+    elapsed, imported = output.split()[-2:]
+    return float(elapsed), imported == "True"
+
+
+
+def main(argv=None) -> int:
+
+    args = parse_args(argv)
+
+    results = {}
+    for name, statement in CASES.items():
+
+        samples  = []
+        imported = False
+        for _ in range(max(args.repeat, 1)):
+            elapsed, imported = measure(statement)
+            samples.append(elapsed)
+
+        results[name] = {'samples':      len(samples),
+                         'median':       statistics.median(samples),
+                         'minimum':      min(samples),
+                         'maximum':      max(samples),
+                         'imgui_bundle': imported}
+
+    print(f"{'Import':<10}{'Median':>9}{'Min':>9}{'Max':>9}  ms   imgui_bundle")
+    for name, stats in results.items():
+        print(f"{name:<10}" + "".join(f"{stats[key] * 1000:9.2f}" for key in ('median', 'minimum', 'maximum'))
+              + f"      {'yes' if stats['imgui_bundle'] else 'no'}")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved {args.json}")
+
+    failed = False
+    if results["camera"]["imgui_bundle"]:
+        print("The Camera imported imgui_bundle", file=sys.stderr)
+        failed = True
+
+    if args.max_ms > 0 and results["camera"]["median"] * 1000 > args.max_ms:
+        print(f"The Camera import took {results['camera']['median'] * 1000:.2f} ms, over {args.max_ms:.2f} ms", file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+#!/usr/bin/env uv run
+# -*- coding: utf-8 -*-
+
+"""
+File Name: input_replay.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: Records the ImGui input of each frame (mouse position, buttons
+             and wheel, display size and delta time) into a compact binary
+             log, and replays it into a headless ImGui context driving the
+             gizmo and the Camera, so interaction-heavy sessions (long drags,
+             rapid clicks on the axes) can be timed deterministically and
+             compared between versions.
+
+             Usage: python input_replay.py replay session.bin --json timings.json
+                    python input_replay.py generate session.bin --seconds 20
+
+             The demo app records a session with the Record Input button of
+             the PyImOGuizmo's Options.
+
+TODO:
+    -
+"""
+
+import sys
+sys.path.append('..')
+
+import json
+import time
+import argparse
+import tracemalloc
+
+import glm
+import numpy as np
+from imgui_bundle import imgui
+
+# Import local Libraries
+import PyImOGuizmo
+from gpu_timer import TimerStats
+
+
+
+MAGIC   = b'PYIMOGIN'
+VERSION = 1
+
+# One record per frame, packed, little-endian: 41 bytes
+FRAME_DTYPE = np.dtype([('delta_time',    '<f4'),
+                        ('display_size',  '<f4', 2),
+                        ('mouse_pos',     '<f4', 2),
+                        ('mouse_wheel',   '<f4', 2),   # Vertical, horizontal
+                        ('mouse_buttons', 'u1'),       # Bit i: button i is down
+                        ('gizmo_rect',    '<f4', 3)])  # x, y, size, NaN if no gizmo
+
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('frame_size', '<u4')])
+
+MOUSE_BUTTONS = 5
+
+
+
+class InputRecorder:
+    """
+    InputRecorder class
+
+    Appends the input of a frame to the log, call it once per frame after
+    `imgui.new_frame()`, when `io` holds the input of the frame:
+
+        recorder.record(imgui.get_io(), gizmo_rect)
+
+    Attributes:
+        path (str): The log file.
+        frames (int): The frames recorded so far.
+    """
+
+    def __init__(self, path:str):
+
+        self.path   = path
+        self.frames = 0
+
+        self._file  = open(path, 'wb')
+        self._file.write(np.array([(MAGIC, VERSION, FRAME_DTYPE.itemsize)], dtype=HEADER_DTYPE).tobytes())
+
+        self._frame = np.zeros(1, dtype=FRAME_DTYPE)
+
+
+    def record(self, io:imgui.IO, gizmo_rect:tuple=None):
+        """
+        Args:
+            io (imgui.IO): The IO of the context, after `imgui.new_frame()`.
+            gizmo_rect (tuple, optional): The (x, y, size) of the gizmo this
+                                          frame, see `PyImOGuizmo.set_rect()`.
+        """
+
+        frame = self._frame[0]
+        frame['delta_time']    = io.delta_time
+        frame['display_size']  = (io.display_size.x, io.display_size.y)
+        frame['mouse_pos']     = (io.mouse_pos.x, io.mouse_pos.y)
+        frame['mouse_wheel']   = (io.mouse_wheel, io.mouse_wheel_h)
+        frame['mouse_buttons'] = sum(1 << button for button, down in enumerate(io.mouse_down[:MOUSE_BUTTONS]) if down)
+        frame['gizmo_rect']    = gizmo_rect if gizmo_rect else (np.nan, np.nan, np.nan)
+
+        self._file.write(self._frame.tobytes())
+        self.frames += 1
+
+
+    def close(self):
+        self._file.close()
+
+
+
+def load_session(path:str) -> np.ndarray:
+    """
+    Reads a log written by InputRecorder.
+
+    Returns:
+        np.ndarray: One FRAME_DTYPE record per frame.
+    """
+
+    with open(path, 'rb') as file:
+        header = np.frombuffer(file.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)
+
+        if len(header) != 1 or header['magic'][0] != MAGIC:
+            raise ValueError(f"{path} is not an input log")
+        if header['version'][0] != VERSION or header['frame_size'][0] != FRAME_DTYPE.itemsize:
+            raise ValueError(f"{path} has an unsupported version ({header['version'][0]})")
+
+        return np.fromfile(file, dtype=FRAME_DTYPE)
+
+
+
+def save_session(path:str, frames:np.ndarray):
+
+    with open(path, 'wb') as file:
+        file.write(np.array([(MAGIC, VERSION, FRAME_DTYPE.itemsize)], dtype=HEADER_DTYPE).tobytes())
+        file.write(np.ascontiguousarray(frames, dtype=FRAME_DTYPE).tobytes())
+
+
+
+class InputReplayer:
+    """
+    InputReplayer class
+
+    Feeds the frames of a log into an ImGui context, call `apply()` before
+    each `imgui.new_frame()`. The input event queue is not trickled, so the
+    events of a frame (e.g. a move and a click) are all applied in that
+    frame, as they were recorded.
+    """
+
+    def __init__(self, frames:np.ndarray):
+
+        self.frames   = frames
+        self._buttons = 0
+        self._pos     = None
+
+
+    def __len__(self):
+        return len(self.frames)
+
+
+    def apply(self, io:imgui.IO, index:int):
+
+        frame = self.frames[index]
+
+        io.config_input_trickle_event_queue = False
+        io.delta_time   = max(float(frame['delta_time']), 1e-6)
+        io.display_size = (float(frame['display_size'][0]), float(frame['display_size'][1]))
+
+        pos = (float(frame['mouse_pos'][0]), float(frame['mouse_pos'][1]))
+        if pos != self._pos:
+            io.add_mouse_pos_event(*pos)
+            self._pos = pos
+
+        buttons = int(frame['mouse_buttons'])
+        for button in range(MOUSE_BUTTONS):
+            if (buttons ^ self._buttons) & (1 << button):
+                io.add_mouse_button_event(button, bool(buttons & (1 << button)))
+        self._buttons = buttons
+
+        wheel = frame['mouse_wheel']
+        if wheel[0] or wheel[1]:
+            io.add_mouse_wheel_event(float(wheel[1]), float(wheel[0]))
+
+
+
+def generate_session(seconds:float=10.0, fps:float=60.0, display_size=(1280, 720), gizmo_rect=(1100, 40, 80),
+                     seed:int=0) -> np.ndarray:
+    """
+    Creates a synthetic session over a gizmo: long circular drags from inside
+    its hover circle alternating with bursts of rapid clicks on and around
+    the handles.
+
+    Returns:
+        np.ndarray: One FRAME_DTYPE record per frame.
+    """
+
+    rng    = np.random.default_rng(seed)
+    count  = int(seconds * fps)
+    frames = np.zeros(count, dtype=FRAME_DTYPE)
+
+    frames['delta_time']   = 1.0 / fps
+    frames['display_size'] = display_size
+    frames['gizmo_rect']   = gizmo_rect
+
+    x, y, size = gizmo_rect
+    center     = np.array([x + size * 0.75, y + size * 0.75])
+    handle     = size * 0.45
+
+    phase_frames = max(int(2.0 * fps), 1)
+
+    for index in range(count):
+
+        phase, step = divmod(index, phase_frames)
+        t = step / fps
+
+        if phase % 2 == 0:
+            # Drag: press near the center, then circle around it
+            angle = 2.0 * np.pi * 0.5 * t
+            frames['mouse_pos'][index]     = center + np.array([np.cos(angle), np.sin(angle)]) * size * (0.1 + 0.6 * min(t, 1.0))
+            frames['mouse_buttons'][index] = 1 if step < phase_frames - 1 else 0
+        else:
+            # Clicks: a new spot every 6 frames, pressed for 2 of them
+            spot, tick = divmod(step, 6)
+            offset     = np.random.default_rng(seed + phase * 1000 + spot).uniform(-handle, handle, 2)
+            frames['mouse_pos'][index]     = center + offset
+            frames['mouse_buttons'][index] = 1 if tick < 2 else 0
+
+        if rng.random() < 0.02:
+            frames['mouse_wheel'][index] = (rng.choice((-1.0, 1.0)), 0.0)
+
+    return frames
+
+
+
+def _create_headless_context():
+
+    imgui.create_context()
+    io = imgui.get_io()
+    io.set_ini_filename("")
+
+    # Nothing renders, the font atlas only needs to be built
+    if hasattr(imgui.BackendFlags_, 'renderer_has_textures'):
+        io.backend_flags |= imgui.BackendFlags_.renderer_has_textures
+    else:
+        io.fonts.build()
+    return io
+
+
+
+def replay(frames:np.ndarray, use_camera_version:bool=True, allocations:bool=False, math_backend:str="glm") -> dict:
+    """
+    Replays a session into a new headless ImGui context, drawing the gizmo
+    every frame where it was recorded and updating a Camera from it.
+
+    Args:
+        frames (np.ndarray): The session, see `load_session()`.
+        use_camera_version (bool, optional): Drive `draw_gizmo_camera()`, else
+                                             `draw_gizmo()` with a view matrix.
+        allocations (bool, optional): Also measure the memory allocated per
+                                      frame with tracemalloc (slower).
+        math_backend (str, optional): The math backend of the camera.
+
+    Returns:
+        dict: The statistics of the frame times, the allocations and the final
+              camera orientation, to check two runs replayed the same session.
+    """
+
+    io       = _create_headless_context()
+    replayer = InputReplayer(frames)
+
+    # Nothing carried over from a previous run (or context)
+    PyImOGuizmo.clear_states()
+    PyImOGuizmo.config.labels.invalidate()
+
+    first_size = frames['display_size'][0] if len(frames) else (1280, 720)
+    camera     = PyImOGuizmo.Camera(first_size[0] / first_size[1], position=(0, 1, 15), pitch=0, yaw=-90, backend=math_backend)
+    camera.FOV = 45
+
+    frame_times  = []
+    allocated    = []
+    view_changes = 0
+
+    if allocations:
+        tracemalloc.start()
+
+    for index in range(len(replayer)):
+
+        replayer.apply(io, index)
+
+        if allocations:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+
+        imgui.new_frame()
+
+        gizmo_rect = frames['gizmo_rect'][index]
+        if not np.isnan(gizmo_rect[0]):
+
+            PyImOGuizmo.set_rect(*(float(value) for value in gizmo_rect))
+            PyImOGuizmo.begin_overlay("replay")
+
+            if use_camera_version:
+                is_view_changed, _, _ = PyImOGuizmo.draw_gizmo_camera(camera)
+            else:
+                is_view_changed, new_view_matrix, _, _ = PyImOGuizmo.draw_gizmo(camera.get_view_matrix(), 10)
+                if is_view_changed:
+                    yaw, pitch, roll = PyImOGuizmo.compute_euler_angles_from_view_matrix(new_view_matrix)
+                    camera.yaw   = glm.degrees(yaw)
+                    camera.pitch = glm.degrees(pitch)
+                    camera.update_camera_vectors()
+                if PyImOGuizmo.get_state().center_clicked:
+                    camera.orthographic = not camera.orthographic
+
+            view_changes += bool(is_view_changed)
+
+        camera.update(io.delta_time)
+        imgui.render()
+
+        frame_times.append(time.perf_counter() - start)
+
+        if allocations:
+            allocated.append(tracemalloc.get_traced_memory()[1] - memory_before)
+
+    if allocations:
+        tracemalloc.stop()
+
+    imgui.destroy_context()
+
+    results = {'frames':       len(frames),
+               'view_changes': view_changes,
+               'camera':       {'yaw': float(camera.yaw), 'pitch': float(camera.pitch), 'orthographic': camera.orthographic}}
+
+    if frame_times:
+        results['frame_time'] = TimerStats(frame_times).to_dict()
+    if allocated:
+        results['allocated_bytes'] = TimerStats(allocated).to_dict()
+
+    return results
+
+
+
+def parse_args(argv=None):
+
+    parser = argparse.ArgumentParser(description="Record or replay the input of PyImOGuizmo sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("replay", help="Replay a session headless and time it")
+    play.add_argument("session")
+    play.add_argument("--repeat", type=int, default=1, help="Replay it this many times, the fastest run is kept")
+    play.add_argument("--view-matrix", action="store_true", help="Drive draw_gizmo() instead of draw_gizmo_camera()")
+    play.add_argument("--allocations", action="store_true", help="Also measure the memory allocated per frame")
+    play.add_argument("--json", default="", help="Save the results to this JSON file")
+    play.add_argument("--math-backend", default="glm", choices=("glm", "numpy"), help="Math backend of the camera")
+
+    generate = commands.add_parser("generate", help="Write a synthetic session of drags and clicks")
+    generate.add_argument("session")
+    generate.add_argument("--seconds", type=float, default=10.0)
+    generate.add_argument("--fps",     type=float, default=60.0)
+    generate.add_argument("--seed",    type=int,   default=0)
+
+    return parser.parse_args(argv)
+
+
+
+def main(argv=None) -> None:
+
+    args = parse_args(argv)
+
+    if args.command == "generate":
+        frames = generate_session(args.seconds, args.fps, seed=args.seed)
+        save_session(args.session, frames)
+        print(f"Saved {len(frames)} frame(s) to {args.session}")
+        return
+
+    frames = load_session(args.session)
+
+    runs    = [replay(frames, not args.view_matrix, args.allocations, args.math_backend) for _ in range(max(args.repeat, 1))]
+    results = min(runs, key=lambda run: run.get('frame_time', {}).get('mean', 0.0))
+
+    print(f"{results['frames']} frame(s), {results['view_changes']} view change(s), "
+          f"camera yaw {results['camera']['yaw']:.3f} pitch {results['camera']['pitch']:.3f}"
+          f"{' orthographic' if results['camera']['orthographic'] else ''}")
+
+    for name, scale, unit in (('frame_time', 1000.0, 'ms'), ('allocated_bytes', 1.0 / 1024.0, 'KiB')):
+        stats = results.get(name)
+        if stats:
+            print(f"{name:<16}" + "".join(f"{key} {stats[key] * scale:.3f}  " for key in ('mean', 'minimum', 'maximum', 'p95')) + unit)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved {args.json}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@
 File Name: main.py
 Author: JuanMa Romero Martin <juanma@ihm.solutions>
 Date Created:  2025-03-01
-Last Modified: 2025-03-08
+Last Modified: 2026-10-19
 Description: This is a demo app to demonstrate how to use PyImOGuizmo and also 
              how to use ModernGL with ImGui Bundle.
 
@@ -15,6 +15,7 @@ TODO:
 
 import os.path
 import sys
+import time
 sys.path.append('..')
 
 import platform
@@ -34,14 +35,22 @@ import glfw  # type: ignore
 import numpy as np
 import glm
 
-try:
-    from PIL import Image
-except ImportError as ex:
-    raise ImportError("Texture loader 'PillowLoader' requires Pillow: {}".format(ex))
-
 # Import local Libraries
 import mesh as Mesh
 import PyImOGuizmo 
+from shader_program import ShaderProgram
+from camera_buffer import CameraUniformBuffer
+from render_queue import RenderQueue
+from entity_store import EntityStore
+from scene_outliner import SceneOutliner
+from offscreen import RenderTarget, render_viewport
+from demo_scene import create_demo_scene
+from frame_capture import FrameCapture, FFmpegEncoder, ImageSequenceEncoder
+from thumbnail_atlas import ThumbnailAtlas
+from dynamic_resolution import DynamicResolution
+from gpu_timer import GpuProfiler
+from gizmo_texture import GizmoTextureRenderer
+from input_replay import InputRecorder
 
 
 
@@ -50,6 +59,13 @@ class AppState():
     def __init__(self):  
         self.show_imgui_demo: bool              = False
         self.use_imoguizmo_camera_version: bool = True
+        self.sort_draw_calls: bool              = True
+        self.depth_prepass: bool                = False
+        self.toggle_recording: bool             = False
+        self.toggle_input_recording: bool       = False
+        self.msaa_samples: int                  = 4
+        self.adaptive_msaa: bool                = True
+        self.show_gpu_timings: bool             = True
     
     
 app_state = AppState()
@@ -64,30 +80,54 @@ def glfw_error_callback(error: int, description: str) -> None:
 
 
 
-def create_texture(ctx, path):
-        image   = Image.open(path)
-        image = image.transpose( Image.Transpose.FLIP_TOP_BOTTOM)
-
-        texture = ctx.texture(size=image.size, components=3, data=image.convert("RGB").tobytes())
-        
-        # mipmaps
-        texture.filter = (moderngl.LINEAR_MIPMAP_LINEAR, moderngl.LINEAR)
-        texture.build_mipmaps()
+def create_frame_capture(ctx):
+    """
+    Starts recording the viewport to `captures/`, as a video when ffmpeg is
+    available and as a PNG sequence otherwise.
+    """
+    
+    directory = os.path.join(os.path.dirname(__file__), 'captures')
+    session   = time.strftime('session_%Y%m%d_%H%M%S')
     
-        # AF
-        texture.anisotropy = 32.0
-        return texture
+    try:
+        os.makedirs(directory, exist_ok=True)
+        encoder = FFmpegEncoder(os.path.join(directory, f'{session}.mp4'))
+    except FileNotFoundError:
+        encoder = ImageSequenceEncoder(os.path.join(directory, session))
+        
+    return FrameCapture(ctx, encoder)
 
 
 
-def create_framebuffer(ctx, width, height):
+def display_asset_browser(atlas, outliner, size=96):
     """
-    Create a framebuffer object (FBO) using ModernGL.
+    Shows a rotating preview of every entity. All the previews are tiles of
+    the same atlas texture and only the rows scrolled into view are drawn.
     """
-    color_texture = ctx.texture((width, height), 4)  # Create color attachment
-    depth_buffer  = ctx.depth_renderbuffer((width, height))  # Create depth attachment
-    fbo           = ctx.framebuffer(color_attachments=[color_texture], depth_attachment=depth_buffer)
-    return fbo, color_texture
+    
+    thumbnails = sorted(atlas.thumbnails)
+    spacing    = imgui.get_style().item_spacing
+    columns    = max(int((imgui.get_content_region_avail().x + spacing.x) // (size + spacing.x)), 1)
+    
+    clipper = imgui.ListClipper()
+    clipper.begin(-(-len(thumbnails) // columns), size + spacing.y)
+    
+    while clipper.step():
+        for row in range(clipper.display_start, clipper.display_end):
+            for column, handle in enumerate(thumbnails[row * columns:(row + 1) * columns]):
+                
+                if column:
+                    imgui.same_line()
+                    
+                atlas.image(handle, size)
+                
+                if imgui.is_item_clicked():
+                    outliner.select(handle, imgui.get_io().key_ctrl)
+                    
+                if imgui.is_item_hovered():
+                    imgui.set_tooltip(atlas.store.names[handle])
+                    
+    clipper.end()
 
 
 
@@ -137,6 +177,10 @@ def create_main_menu():
         if clicked:
             app_state.show_imgui_demo = not app_state.show_imgui_demo
         
+        clicked, _ = imgui.menu_item("Show/Hide GPU Timings", "", app_state.show_gpu_timings)
+        if clicked:
+            app_state.show_gpu_timings = not app_state.show_gpu_timings
+        
         imgui.end_menu()
             
     imgui.end_main_menu_bar()
@@ -212,6 +256,38 @@ def display_overlay_extra_info(is_hovered, is_focused, cur_window_pos, camera_po
     imgui.end_group()
 
 
+
+def display_overlay_gpu_timings(profiler):
+    """
+    Shows the rolling GPU time of each render pass, in the bottom-left corner
+    of the current window, and whether the frames are GPU or CPU bound.
+    """
+    
+    names  = [name for name in (*profiler.timers, *profiler.groups) if profiler.get_stats(name)]
+    height = (len(names) + 3) * imgui.get_text_line_height_with_spacing()
+    
+    imgui.set_cursor_pos((20, imgui.get_window_height() - height - 10))
+    
+    imgui.begin_group()
+    
+    imgui.text_colored((0.6, 0.6, 0.6, 1.0), f"{'Pass':<10}{'Last':>7}{'Mean':>7}{'Max':>7}{'P95':>7}  ms")
+    for name in names:
+        stats = profiler.get_stats(name)
+        imgui.text(f"{name:<10}{stats.last * 1000:7.2f}{stats.mean * 1000:7.2f}{stats.maximum * 1000:7.2f}{stats.p95 * 1000:7.2f}")
+    
+    cpu = profiler.get_stats("cpu")
+    if cpu:
+        imgui.text(f"{'cpu':<10}{cpu.last * 1000:7.2f}{cpu.mean * 1000:7.2f}{cpu.maximum * 1000:7.2f}{cpu.p95 * 1000:7.2f}")
+        
+        gpu = sum(profiler.get_stats(name).mean for name in profiler.timers if profiler.get_stats(name))
+        if gpu > cpu.mean:
+            imgui.text_colored((1.0, 0.4, 0.3, 1.0), "GPU bound")
+        else:
+            imgui.text_colored((0.4, 0.8, 1.0, 1.0), "CPU bound")
+        
+    imgui.end_group()
+    
+
     
 def LabelPrefix(label:str) -> str:
     """Prefixes the label of an ImGui widget and aligns it to the left position.
@@ -330,12 +406,50 @@ def main() -> None:
     
     ctx.enable(flags=moderngl.DEPTH_TEST | moderngl.CULL_FACE | moderngl.BLEND)  
     
+    # Shader library shared by all the meshes (loads from assets/shaders)
+    shaders = ShaderProgram.get_default(ctx)
+    
+    # Per-frame camera data shared by all the programs
+    camera_ubo = CameraUniformBuffer(ctx)
+    
+    # Measures the GPU time of the render passes, without stalling
+    gpu_profiler = GpuProfiler(ctx)
+    
+    # Sorts the draws of each frame to minimize the state changes, and times 
+    # its scene, grid and axes passes
+    render_queue = RenderQueue()
+    render_queue.profiler = gpu_profiler
+    
+    # Records the viewport while not None
+    frame_capture = None
+    
+    # Records the input of each frame while not None, to replay the session
+    # with input_replay.py
+    input_recorder = None
+    gizmo_rect     = None
+    
+    # Draws the gizmo from a texture while the view is static
+    gizmo_cache = PyImOGuizmo.GizmoCache(GizmoTextureRenderer(ctx))
+    PyImOGuizmo.config.cache = gizmo_cache
+    
+    # Previews of the entities for the Asset Browser, all in one texture
+    thumbnail_atlas = ThumbnailAtlas(ctx, EntityStore.get_default())
+    
+    
+    # Scales the resolution of the viewport to hold the frame rate, from the 
+    # GPU time of the passes of the viewport
+    dynamic_resolution = DynamicResolution(ctx, timer=gpu_profiler.group("viewport", RenderQueue.PASSES + ("resolve",)))
     
     # Create a framebuffer to render the scene
     viewport_width, viewport_height = 800, 600 # Just Random Initial Values
-    fbo, fbo_texture = create_framebuffer(ctx, viewport_width, viewport_height)
+    render_target = RenderTarget(ctx, (viewport_width, viewport_height), app_state.msaa_samples)
     
     oldview_size = (viewport_width, viewport_height)
+    
+    # What the viewport was last rendered with, to skip the frames that would
+    # render the same image
+    last_frame_key   = None
+    is_gizmo_dragged = False
         
         
     # Create Scene -------------------------------------------------------------
@@ -349,33 +463,17 @@ def main() -> None:
     viewport_camera.FOV = 45
     
     # Simple Scene Manager
-    list_entities   = [] 
+    # The entities live in a struct-of-arrays store, double-buffered: edits 
+    # (from any thread) go to the back buffer and each frame renders the 
+    # snapshot swapped in before it. The meshes below are views over its rows.
+    store           = EntityStore.get_default()
     selected_entity = None
     
-    # Create a Grid Helper
-    view_grid = Mesh.MeshGrid()
-    list_entities.append(view_grid)
-    
-    # Create an Axes Helper
-    view_reference_axes = Mesh.MeshAxes()
-    list_entities.append(view_reference_axes)
-    
-    this_dir = os.path.dirname(__file__)
-    textures = {}
-    textures['texture_wood']  = create_texture(ctx, this_dir + '/assets/textures/img.png')
-    textures['texture_metal'] = create_texture(ctx, this_dir + '/assets/textures/img_1.png')
-    textures['texture_test']  = create_texture(ctx, this_dir + '/assets/textures/test.png')
-    
-    box_test = Mesh.MeshCube("Wood Box", textures['texture_wood'])
-    box_test.position = (-5, 0, 0)
-    list_entities.append(box_test)
-
-    box_test = Mesh.MeshCube("Metal Box", textures['texture_metal'])
-    box_test.position = ( 5, 0, 0)
-    list_entities.append(box_test)
+    # Tree of the Scene Manager, grouped by type and virtualized
+    outliner = SceneOutliner(store)
     
-    box_test = Mesh.MeshCube("Test Box", textures['texture_test'])
-    list_entities.append(box_test)
+    # Create the Grid and Axes Helpers and the boxes
+    list_entities, textures = create_demo_scene(ctx, store)
     
     
     # ==========================================================================
@@ -384,6 +482,33 @@ def main() -> None:
     while not glfw.window_should_close(window):
 
         glfw.poll_events()
+        
+        gpu_profiler.begin_frame()
+
+        # Start/Stop recording the viewport
+        if app_state.toggle_recording:
+            app_state.toggle_recording = False
+            if frame_capture:
+                frame_capture.stop()
+                frame_capture = None
+            else:
+                frame_capture = create_frame_capture(ctx)
+        
+        # Start/Stop recording the input
+        if app_state.toggle_input_recording:
+            app_state.toggle_input_recording = False
+            if input_recorder:
+                input_recorder.close()
+                input_recorder = None
+            else:
+                directory = os.path.join(os.path.dirname(__file__), 'captures')
+                os.makedirs(directory, exist_ok=True)
+                input_recorder = InputRecorder(os.path.join(directory, time.strftime('input_%Y%m%d_%H%M%S.bin')))
+
+        # Hot-reload the shaders edited on disk
+        if shaders.reload_changed():
+            store.reload_programs(shaders)
+            last_frame_key = None
 
         # Start the Dear ImGui frame
         imgui.backends.opengl3_new_frame()
@@ -437,15 +562,6 @@ def main() -> None:
                 view_size.x = 20 if view_size.x < 20 else view_size.x
                 view_size.y = 20 if view_size.y < 20 else view_size.y
                 
-                # Free Memory
-                fbo.release()
-                fbo_texture.release()
-                
-                # Recreate the new frame buffer
-                fbo, fbo_texture = create_framebuffer(ctx, 
-                                                    int(view_size.x), 
-                                                    int(view_size.y))
-                
                 # Update teh Camera Aspect Ratio
                 viewport_camera.aspect_ratio = view_size.x / view_size.y
                 
@@ -453,26 +569,54 @@ def main() -> None:
                 oldview_size = (int(view_size.x), int(view_size.y)) 
                 
             
-            # Bind the Frame Buffer to render the viewport into the texture
-            fbo.use()
-            ctx.viewport = (0, 0, view_size.x, view_size.y)
-            ctx.clear(0.125, 0.125, 0.125, 1.0)  # Clear the framebuffer / Background Color of the 3D Viewport
-
-                                        
-            #  Render the Scene      
-            for cur_object in list_entities:
-                cur_object.render(viewport_camera)
+            # Dynamic resolution: the scene is rendered into a corner of an 
+            # oversized framebuffer, so a new scale does not recreate it
+            dynamic_resolution.update()
+            render_target.resize(dynamic_resolution.get_render_size(oldview_size), 
+                                 dynamic_resolution.get_capacity(oldview_size))
+            
+            # Adaptive MSAA: fewer samples while the camera is dragged through
+            # the gizmo, the full count back once it is released
+            dragging = app_state.adaptive_msaa and is_gizmo_dragged
+            render_target.set_samples(1 if dragging else app_state.msaa_samples)
+            
+            frame_key = ( viewport_camera.get_view_matrix().to_bytes(), 
+                          viewport_camera.get_projection_matrix().to_bytes(),
+                          store.version, 
+                          render_target.size, 
+                          render_target.samples, 
+                          app_state.sort_draw_calls, 
+                          app_state.depth_prepass )
+            
+            #  Render the Scene into the Frame Buffer, only if it changed
+            if frame_key != last_frame_key:
+                last_frame_key = frame_key
+                
+                render_queue.sort          = app_state.sort_draw_calls
+                render_queue.depth_prepass = app_state.depth_prepass
+                
+                render_viewport(ctx, render_target.begin(), viewport_camera, store, camera_ubo, render_queue, 
+                                viewport=render_target.viewport)
+                
+                # Blit the multi-sample buffer into the texture shown by ImGui
+                with gpu_profiler.scope("resolve"):
+                    render_target.resolve()
+            
+            # Record the viewport (the readback is asynchronous)
+            if frame_capture:
+                frame_capture.capture(render_target.output_fbo, viewport=render_target.viewport)
                 
             
             # Unbind the Framebuffer
             GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
 
 
-            # Display the FBO texture in ImGui Widget
-            imgui.image(fbo_texture.glo,            # Texture ID
-                        (view_size.x, view_size.y), (0,1), (1,0)) # Flip Texture to convert from 
-                                                                  # OpenGL's Bottom-Left -> Top-Right
-                                                                  # to ImGui's Top-Left -> Bottom-Right
+            # Display the FBO texture in ImGui Widget, upscaled to the size of 
+            # the viewport. The UVs select the rendered corner and flip it from 
+            # OpenGL's Bottom-Left -> Top-Right to ImGui's Top-Left -> Bottom-Right
+            uv0, uv1 = render_target.uvs
+            imgui.image(render_target.texture.glo,  # Texture ID
+                        (view_size.x, view_size.y), uv0, uv1)
                                                                            
             rect_min  = imgui.get_item_rect_min()
             rect_max  = imgui.get_item_rect_max()
@@ -483,29 +627,24 @@ def main() -> None:
                                        imgui.is_window_focused(),
                                        imgui.get_window_pos(), 
                                        viewport_camera.position)
-
-
-            # Set Rotation Sensitivity 
-            PyImOGuizmo.config.yaw_rotation_speed   = 0.25 #0.005
-            PyImOGuizmo.config.pitch_rotation_speed = 0.25 #0.003
             
-            
-            # Pass the draw list of the current window to the PyImOGuizmo
-            PyImOGuizmo.set_draw_list()
+            if app_state.show_gpu_timings:
+                display_overlay_gpu_timings(gpu_profiler)
+
 
             # Set the location of the Gizmo
-            PyImOGuizmo.set_rect( rect_max.x - 80 - 40, 
-                                  rect_min.y, 
-                                  80)
+            gizmo_rect = (rect_max.x - 80 - 40, rect_min.y, 80)
+            PyImOGuizmo.set_rect(*gizmo_rect)
+            
+            # Draw it into the draw list of the current window, clipped to 
+            # the viewport, without any window of its own
+            PyImOGuizmo.begin_overlay("viewport", imgui.get_window_draw_list(), (rect_min, rect_max))
 
             # PyImOGuizmo.begin_frame()
             
             
             if not  app_state.use_imoguizmo_camera_version:
                 
-                PyImOGuizmo.config.yaw_rotation_speed   = 0.005
-                PyImOGuizmo.config.pitch_rotation_speed = 0.003
-                
                 is_view_changed,  new_view_matrix, is_gizmo_hovered, is_gizmo_dragged = PyImOGuizmo.draw_gizmo(viewport_camera.get_view_matrix(), 10)
                 
                 if(is_view_changed):
@@ -517,6 +656,10 @@ def main() -> None:
                         
                     viewport_camera.update_camera_vectors()    
                 
+                # The center of the gizmo switches the projection
+                if PyImOGuizmo.get_state().center_clicked:
+                    viewport_camera.orthographic = not viewport_camera.orthographic
+                
             else: 
                 is_view_changed, is_gizmo_hovered, is_gizmo_dragged = PyImOGuizmo.draw_gizmo_camera(viewport_camera)
                 
@@ -532,39 +675,42 @@ def main() -> None:
             
             #  Deselect any selection when mouse is clicked outside the Node Tree
             if imgui.is_mouse_down(imgui.MouseButton_.left) and imgui.is_window_hovered() and not imgui.is_any_item_hovered():
-                selected_entity = None
+                outliner.clear_selection()
+            
+            # Filter the tree by name or type
+            outliner.draw_search_bar()
                 
             imgui.push_style_var(imgui.StyleVar_.indent_spacing, 6)
             
             if imgui.tree_node_ex("Scene", imgui.TreeNodeFlags_.default_open | imgui.TreeNodeFlags_.allow_overlap | imgui.TreeNodeFlags_.frame_padding | imgui.TreeNodeFlags_.span_full_width): 
                 
-                
-                for cur_entity in list_entities:
-                
-                    imgui.tree_push(cur_entity.id)
-                    
-                    _, cur_selected = imgui.selectable(f'\uf1b2  {cur_entity.name}', 
-                                                            True if cur_entity == selected_entity else False, 
-                                                            imgui.SelectableFlags_.allow_overlap | imgui.SelectableFlags_.span_all_columns)
-                            
-                    if(cur_selected):
-                        selected_entity = cur_entity
-                        
-                    imgui.same_line()
-                    imgui.dummy( ( imgui.get_content_region_avail().x - 40, 0) )
-                    imgui.same_line()
-                    _, cur_entity.visible = imgui.checkbox("##node_visible", cur_entity.visible)
-                    
-                    imgui.tree_pop()
-                
+                # Only the rows scrolled into view are drawn
+                outliner.draw()
                 
                 imgui.tree_pop()
             
             imgui.pop_style_var()
             
             imgui.end()
-
-                # Property Inspector View 
+        
+        selected_entity = Mesh.Mesh(store, outliner.active) if outliner.active is not None else None
+        
+        
+        
+        # Asset Browser View
+        if imgui.begin(f'{icons_fontawesome.ICON_FA_TH} Asset Browser'):
+            
+            # Re-render the dirty previews within the time budget of the frame
+            thumbnail_atlas.sync_entities()
+            thumbnail_atlas.update(io.delta_time)
+            thumbnail_atlas.render()
+            
+            # Unbind the Framebuffer
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+            
+            display_asset_browser(thumbnail_atlas, outliner)
+            
+            imgui.end()
         
         
         
@@ -593,6 +739,59 @@ def main() -> None:
             imgui.same_line()
             imgui.text_colored((1,1,0,1) if is_view_changed else (0.5,.5,.5,1), str(is_view_changed) )
             
+            imgui.separator_text("Rotation")
+            _, PyImOGuizmo.config.yaw_rotation_speed   = imgui.slider_float("Yaw Speed (deg/px)",   PyImOGuizmo.config.yaw_rotation_speed,   0.05, 1.0)
+            _, PyImOGuizmo.config.pitch_rotation_speed = imgui.slider_float("Pitch Speed (deg/px)", PyImOGuizmo.config.pitch_rotation_speed, 0.05, 1.0)
+            _, PyImOGuizmo.config.inertia              = imgui.checkbox("Inertia", PyImOGuizmo.config.inertia)
+            if PyImOGuizmo.config.inertia:
+                _, PyImOGuizmo.config.inertia_damping  = imgui.slider_float("Damping (1/s)", PyImOGuizmo.config.inertia_damping, 0.5, 20.0)
+            
+            imgui.separator_text("Labels")
+            _, PyImOGuizmo.config.label_font_size          = imgui.slider_float("Font Size##gizmolabels", PyImOGuizmo.config.label_font_size, 0.0, 32.0, "%.0f")
+            _, PyImOGuizmo.config.negative_label_font_size = imgui.slider_float("Negative Font Size##gizmolabels", PyImOGuizmo.config.negative_label_font_size, 0.0, 32.0, "%.0f")
+            
+            imgui.separator_text("Gizmo Texture Cache")
+            _, gizmo_cache.enabled = imgui.checkbox("Enabled##gizmocache", gizmo_cache.enabled)
+            imgui.text(f"Renders: {gizmo_cache.renders}  Hits: {gizmo_cache.hits}")
+            
+            imgui.separator_text("Rendering")
+            _, app_state.sort_draw_calls = imgui.checkbox("Sort Draw Calls", app_state.sort_draw_calls)
+            _, app_state.depth_prepass   = imgui.checkbox("Depth Pre-pass", app_state.depth_prepass)
+            
+            render_stats = render_queue.stats
+            imgui.text(f"Draws: {render_stats.draws}  (Depth Pre-pass: {render_stats.prepass_draws})")
+            imgui.text(f"State Changes: {render_stats.state_changes()}")
+            imgui.text(f"  Programs: {render_stats.program_binds}  Textures: {render_stats.texture_binds}  VAOs: {render_stats.vao_binds}")
+            imgui.text(f"Uniform Writes: {render_stats.uniform_writes}")
+            
+            msaa_options = [1, 2, 4, 8]
+            changed, msaa_index = imgui.combo("MSAA Samples", msaa_options.index(app_state.msaa_samples), [str(samples) for samples in msaa_options])
+            if changed:
+                app_state.msaa_samples = msaa_options[msaa_index]
+            _, app_state.adaptive_msaa = imgui.checkbox("Adaptive MSAA (1 sample while dragging)", app_state.adaptive_msaa)
+            imgui.text(f"Samples: {render_target.samples}")
+            
+            imgui.separator_text("Dynamic Resolution")
+            _, dynamic_resolution.enabled = imgui.checkbox("Enabled##dynamicresolution", dynamic_resolution.enabled)
+            _, dynamic_resolution.target_fps = imgui.slider_float("Target FPS", dynamic_resolution.target_fps, 30.0, 144.0, "%.0f")
+            _, (dynamic_resolution.min_scale, dynamic_resolution.max_scale) = imgui.drag_float2( "Scale Bounds", 
+                                                                                                 (dynamic_resolution.min_scale, dynamic_resolution.max_scale), 
+                                                                                                 v_speed=0.01, v_min=0.25, v_max=2.0 )
+            imgui.text(f"Scale: {dynamic_resolution.scale:.3f}  Render Size: {render_target.size[0]}x{render_target.size[1]}")
+            if dynamic_resolution.gpu_time is not None:
+                imgui.text(f"Viewport GPU: {dynamic_resolution.gpu_time * 1000:.2f} ms" + ("  (GPU bound)" if dynamic_resolution.gpu_bound else ""))
+            if dynamic_resolution.frame_time is not None:
+                imgui.text(f"Frame: {dynamic_resolution.frame_time * 1000:.2f} ms")
+            
+            imgui.separator_text("Capture")
+            app_state.toggle_recording = imgui.button("Stop Recording" if frame_capture else "Start Recording")
+            if frame_capture:
+                imgui.text(f"Captured: {frame_capture.captured}  Encoded: {frame_capture.encoded}  Dropped: {frame_capture.dropped}")
+            
+            app_state.toggle_input_recording = imgui.button("Stop Recording Input" if input_recorder else "Record Input")
+            if input_recorder:
+                imgui.text(f"Input Frames: {input_recorder.frames}")
+            
             imgui.end()
 
 
@@ -605,6 +804,18 @@ def main() -> None:
             
             _, viewport_camera.FOV = imgui.drag_float( LabelPrefix( "FOV" ), viewport_camera.FOV)
             
+            changed, orthographic = imgui.checkbox( LabelPrefix( "Orthographic" ), viewport_camera.orthographic)
+            if changed:
+                viewport_camera.orthographic = orthographic
+            
+            if viewport_camera.orthographic:
+                _, viewport_camera.ortho_size = imgui.drag_float( LabelPrefix( "Ortho Size" ), viewport_camera.ortho_size, 
+                                                                  v_speed=0.05, v_min=0.01, v_max=1000.0)
+            
+            if imgui.button("Zoom to Fit"):
+                boxes = [handle for handle in store.handles() if store.kinds[handle] == "Cube" and store.get(handle, 'visible')]
+                viewport_camera.zoom_to_fit(*store.world_bounds(boxes))
+            
             pos_changed, new_pos= imgui.drag_float3( LabelPrefix( "Position"), viewport_camera.position, v_speed=0.01)
             if pos_changed:
                 viewport_camera.position = glm.vec3(new_pos)
@@ -625,20 +836,29 @@ def main() -> None:
             if(selected_entity):
                 imgui.separator_text(f"{selected_entity.name}'s Properties")
                 
-                if not isinstance(selected_entity, Mesh.MeshGrid):
-                    _, selected_entity.position = imgui.drag_float3("Position##selectedentity", selected_entity.position, v_speed=0.01)
+                if selected_entity.kind != Mesh.MeshGrid.KIND:
+                    changed, position = imgui.drag_float3("Position##selectedentity", selected_entity.position, v_speed=0.01)
+                    if changed:
+                        selected_entity.position = position
                 
-                _, selected_entity.visible = imgui.checkbox("Visible##selectedentity", selected_entity.visible)
+                changed, visible = imgui.checkbox("Visible##selectedentity", selected_entity.visible)
+                if changed:
+                    selected_entity.visible = visible
                 
             imgui.end()
         
         
         
+        if input_recorder:
+            input_recorder.record(io, gizmo_rect)
+        gizmo_rect = None
+            
         # ImGui Rendering ------------------------------------------------------
         imgui.render()
 
         
-        imgui.backends.opengl3_render_draw_data(imgui.get_draw_data())
+        with gpu_profiler.scope("imgui"):
+            imgui.backends.opengl3_render_draw_data(imgui.get_draw_data())
 
 
         # Update and Render additional Platform Windows
@@ -651,20 +871,35 @@ def main() -> None:
             imgui.render_platform_windows_default()
             glfw.make_context_current(backup_current_context)
         
+        gpu_profiler.record_frame()
+        
         glfw.swap_buffers(window)
 
     
     
     # Cleanup
-    fbo_texture.release()
-    fbo.release()
+    if frame_capture:
+        frame_capture.stop()
+    
+    if input_recorder:
+        input_recorder.close()
+    
+    render_target.release()
     
     for cur_texture in textures.values():
         cur_texture.release()
         
+    thumbnail_atlas.release()
+    gizmo_cache.clear()
+    gizmo_cache.renderer.destroy()
+    
     for cur_entity in list_entities:
         cur_entity.release()
     
+    store.release()
+    camera_ubo.release()
+    shaders.destroy()
+    
     imgui.backends.opengl3_shutdown()
     imgui.backends.glfw_shutdown()
     
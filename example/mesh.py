@@ -2,272 +2,223 @@
 File Name: mesh.py
 Author: JuanMa Romero Martin <juanma@ihm.solutions>
 Date Created:  2025-02-15
-Last Modified: 2025-03-01
+Last Modified: 2026-10-19
 Description: This module contains the implementation of various Mesh classes, 
              including base Mesh, MeshCube, MeshGrid, and MeshAxes, used for 
-             rendering 3D objects.
+             rendering 3D objects. A Mesh is a lightweight view over one entity
+             of an EntityStore, where its transform, colour, visibility,
+             geometry and material are stored.
 
 TODO: 
     - 
 """
 
 import moderngl 
-import glm
-import uuid
 
 import geometry as Geometry
-from PyImOGuizmo import Camera
-from shader_program import ShaderProgram
+from PyImOGuizmo import Camera, get_math_backend
+from entity_store import EntityStore
 
 
 
 class Mesh():
-    
-    VERTEX_SHADER_SRC = """
-    #version 330 core
-
-    layout (location = 0) in vec2 in_texcoord_0;
-    layout (location = 1) in vec3 in_normal;
-    layout (location = 2) in vec3 in_position;
-
-    out vec3 ourColor;
-    out vec2 TexCoord;
-
-    uniform vec3 in_color = vec3(1, 0, 0);
-    uniform mat4 in_m_proj;
-    uniform mat4 in_m_view;
-    uniform mat4 in_m_model;
-
-    void main() {
-        gl_Position = in_m_proj * in_m_view * in_m_model * vec4(in_position, 1.0);
-        ourColor = in_color * in_normal;
-        TexCoord = in_texcoord_0;
-    }
     """
-
-    FRAGMENT_SHADER_SRC = """
-    #version 330 core
-
-    out vec4 finalColor;
-
-    in vec2 TexCoord;
-    in vec3 ourColor;
-
-    uniform bool in_use_texture = false;
-    uniform sampler2D u_texture_0;
-
-    void main() {
-        float gamma = 2.2;
-        vec3 color = ourColor;
-        if(in_use_texture == true){
-            color = texture(u_texture_0, TexCoord).rgb;
-        }  
-            
-        color = pow(color, vec3(gamma));
-        color = pow(color, 1 / vec3(gamma));
-        finalColor =  vec4(color, 1.0);
-    }
+    View over one entity of an EntityStore. It holds no data of its own, so 
+    two views of the same entity are equal and interchangeable.
     """
     
-    def __init__(self, program, geometry: Geometry, texture=None):
-        """_summary_
-
+    __slots__ = ('store', 'handle')
+    
+    # Base name of the shader files in assets/shaders used by this mesh
+    SHADER_NAME = "mesh"
+    
+    # Type shown (and grouped by) in the Scene Manager
+    KIND = "Mesh"
+    
+    def __init__(self, store:EntityStore, handle:int):
+        """
         Args:
-            program (_type_): _description_
-            geometry (Geometry): _description_
-            texture (_type_, optional): _description_. Defaults to None.
+            store (EntityStore): The store the entity lives in.
+            handle (int): The handle of the entity.
         """
         
-        self.id:str       = str( uuid.uuid4() )
-        self.name:str     = "Base Mesh"
-        self.visible:bool = True
+        self.store  = store
+        self.handle = handle
+        
+    
+    def __eq__(self, other):
+        return isinstance(other, Mesh) and self.store is other.store and self.handle == other.handle
+    
+    
+    def __hash__(self):
+        return hash((id(self.store), self.handle))
+    
+    
+    # The properties read and write the back buffer of the store: they return 
+    # the latest value written, which is rendered once the store is swapped.
+    
+    @property
+    def id(self) -> int:
+        return self.handle
+    
+    @property
+    def name(self) -> str:
+        return self.store.names[self.handle]
+    
+    @name.setter
+    def name(self, value:str):
+        self.store.rename(self.handle, value)
+    
+    @property
+    def kind(self) -> str:
+        return self.store.kinds[self.handle]
+    
+    @property
+    def position(self):
+        return tuple(self.store.get(self.handle, 'position').tolist())
+    
+    @position.setter
+    def position(self, value):
+        self.store.set(self.handle, 'position', value)
+        
+    @property
+    def scale(self):
+        return tuple(self.store.get(self.handle, 'scale').tolist())
+    
+    @scale.setter
+    def scale(self, value):
+        self.store.set(self.handle, 'scale', value)
+        
+    @property
+    def rotation(self):
+        return get_math_backend().vec3(self.store.get(self.handle, 'rotation'))
+    
+    @rotation.setter
+    def rotation(self, value):
+        self.store.set(self.handle, 'rotation', value)
         
-        self.ctx     = moderngl.get_context()
-        self.vao     = geometry.vertex_array(program)
-        self.texture = texture
+    @property
+    def color(self):
+        return tuple(self.store.get(self.handle, 'color').tolist())
+    
+    @color.setter
+    def color(self, value):
+        self.store.set(self.handle, 'color', value)
         
-        self.color       = (1.0, 0.5, 0.5)
-        self.position    = (0, 0, 0)
-        self.scale       = (1, 1, 1)
-        self.rotation    = glm.vec3(0, 0, 0)
-        self.translation = (0, 0, 0)   
+    @property
+    def visible(self):
+        return self.store.get(self.handle, 'visible')
+    
+    @visible.setter
+    def visible(self, value):
+        self.store.set(self.handle, 'visible', value)
         
-        self.render_mode = moderngl.TRIANGLES     
+    @property
+    def texture(self):
+        return self.store.materials[self.store.get(self.handle, 'material_id')].texture
+    
+    @property
+    def geometry(self):
+        return self.store.geometries[self.store.get(self.handle, 'geometry_id')]
         
         
-    def get_model_matrix(self):
+    def get_binding(self):
+        snapshot = self.store.snapshot
+        return self.store.get_binding(int(snapshot.geometry_id[self.handle]), 
+                                      int(snapshot.material_id[self.handle]))
         
-        m_model = glm.mat4()
-        # translate
-        m_model = glm.translate(m_model, self.position)
         
-        # scale
-        m_model = glm.scale(m_model, self.scale)
+    def get_model_matrix(self):
+        """
+        Returns the model matrix of the last snapshot of the store, as a 
+        column-major (4, 4) float32 array (see EntityStore.model_matrices).
+        """
         
-        # rotate
-        m_model = glm.rotate(m_model, self.rotation.z, glm.vec3(0, 0, 1))
-        m_model = glm.rotate(m_model, self.rotation.y, glm.vec3(0, 1, 0))
-        m_model = glm.rotate(m_model, self.rotation.x, glm.vec3(1, 0, 0))
-
-
-     
-        return m_model
+        return self.store.model_matrices()[self.handle]
     
     
     def render(self, camera:Camera):
+        """
+        Draws the mesh on its own. The camera matrices are not uploaded here, 
+        they come from the camera uniform buffer written once per frame (see 
+        camera_buffer.py). To draw many meshes, submit the store to a RenderQueue.
+
+        Args:
+            camera (Camera): The camera the scene is rendered from.
+        """
         
-        if not self.visible:
+        if not self.store.snapshot.visible[self.handle]:
             return
         
-        # self.vao.program[ShaderProgram.ATTRIBS_.USE_TEXTURE] = False
-
-        if self.texture:
-            self.vao.program[ShaderProgram.ATTRIBS_.USE_TEXTURE] = True
-            self.texture.use()
-        
-        self.vao.program[ShaderProgram.ATTRIBS_.M_PROJECTION].write( camera.get_projection_matrix() )
-        self.vao.program[ShaderProgram.ATTRIBS_.M_VIEW].write( camera.get_view_matrix() )
-        self.vao.program[ShaderProgram.ATTRIBS_.M_MODEL].write( self.get_model_matrix() ) 
-        self.vao.program[ShaderProgram.ATTRIBS_.POSITION] = self.position
-        self.vao.program[ShaderProgram.ATTRIBS_.COLOR]    = glm.vec3(0.5, 0.5, 0.5)
+        binding = self.get_binding()
         
-        self.vao.render(self.render_mode)
+        if binding.u_use_texture:
+            binding.u_use_texture.value = binding.texture is not None
+
+        if binding.texture:
+            binding.texture.use()
         
+        binding.u_model.write( self.get_model_matrix() ) 
         
+        binding.vao.render(binding.render_mode)
+    
+    
     def release(self):
-        self.vao.release()
+        self.store.destroy(self.handle)
 
         
         
 class MeshCube(Mesh):
     
-     def __init__(self, name="Mesh Cube", texture=None):
+     KIND = "Cube"
+    
+     def __init__(self, name="Mesh Cube", texture=None, store:EntityStore=None, opacity:float=1.0):
         
-        super().__init__(moderngl.get_context().program(
-                            vertex_shader   = Mesh.VERTEX_SHADER_SRC,
-                            fragment_shader = Mesh.FRAGMENT_SHADER_SRC
-                        ), 
-                        Geometry.CubeGeometry(moderngl.get_context()), 
-                        texture
-                        ) 
+        store = store if store else EntityStore.get_default()
+        ctx   = moderngl.get_context()
         
-        self.name = name
+        super().__init__(store, 
+                         store.create(name,
+                                      store.add_geometry('cube', lambda: Geometry.CubeGeometry(ctx)),
+                                      store.add_material(self.SHADER_NAME, texture, opacity),
+                                      self.KIND))
         
          
         
 class MeshGrid(Mesh):
     
-    VERTEX_SHADER_SRC = """
-    #version 330 core
-
-    layout (location = 0) in vec3 in_position;
-
-    out vec3 ourColor;
-
-    uniform vec3 in_color = vec3(1, 0, 0);
-    uniform mat4 in_m_proj;
-    uniform mat4 in_m_view;
-    uniform mat4 in_m_model;
-
-    void main() {
-        gl_Position = in_m_proj * in_m_view * in_m_model * vec4(in_position, 1.0);
-        ourColor = in_color;
-    }
-    """
-
-    FRAGMENT_SHADER_SRC = """
-    #version 330 core
-
-    out vec4 finalColor;
-
-    in vec3 ourColor;
-
-
-    void main() {
-        float gamma = 2.2;
-        vec3 color = ourColor;        
-        color = pow(color, vec3(gamma));
-        color = pow(color, 1 / vec3(gamma));
-        finalColor =  vec4(color, 1.0);
-    }
-    """
+    SHADER_NAME = "grid"
+    KIND        = "Grid"
     
     
-    def __init__(self, name = "Mesh Grid", asize=50, asteps=100):
-        super().__init__(moderngl.get_context().program(
-                            vertex_shader   = MeshGrid.VERTEX_SHADER_SRC,
-                            fragment_shader = MeshGrid.FRAGMENT_SHADER_SRC
-                        ), 
-                        Geometry.GridGeometry(moderngl.get_context(), size=asize, steps=asteps), 
-                        ) 
-        
-        self.name = "Grid Helper"
-        
-        
-    def render(self, camera:Camera):
-
-        if not self.visible:
-            return
-        
-        self.vao.program[ShaderProgram.ATTRIBS_.M_PROJECTION].write(camera.get_projection_matrix())
-        self.vao.program[ShaderProgram.ATTRIBS_.M_VIEW].write(camera.get_view_matrix())
-        self.vao.program[ShaderProgram.ATTRIBS_.POSITION] = self.position
-        self.vao.program[ShaderProgram.ATTRIBS_.COLOR]    = glm.vec3(0.5, 0.5, 0.5)
-        # self.vao.program[ShaderProgram.ATTRIBS_.M_MODEL].write( glm.rotate( glm.radians(-90), (1,0,0)) ) 
+    def __init__(self, name = "Mesh Grid", asize=50, asteps=100, store:EntityStore=None):
         
-        self.vao.program[ShaderProgram.ATTRIBS_.M_MODEL].write( glm.mat4() ) #  glm.rotate() * glm.scale() * glm.translate()
+        store = store if store else EntityStore.get_default()
+        ctx   = moderngl.get_context()
         
-        self.vao.render(moderngl.LINES)
+        # The grid always stays at the origin, its row keeps the identity transform
+        super().__init__(store, 
+                         store.create("Grid Helper",
+                                      store.add_geometry(('grid', asize, asteps), 
+                                                         lambda: Geometry.GridGeometry(ctx, size=asize, steps=asteps),
+                                                         moderngl.LINES),
+                                      store.add_material(self.SHADER_NAME),
+                                      self.KIND))
         
 
 
 class MeshAxes(Mesh):
     
-    VERTEX_SHADER_SRC = """
-    #version 330 core
-
-    layout (location = 0) in vec3 in_color;
-    layout (location = 1) in vec3 in_position;
-
-    out vec3 ourColor;
-
-    uniform mat4 in_m_proj;
-    uniform mat4 in_m_view;
-    uniform mat4 in_m_model;
-
-    void main() {
-        gl_Position = in_m_proj * in_m_view * in_m_model * vec4(in_position, 1.0);
-        ourColor = in_color;
-    }
-    """
-
-    FRAGMENT_SHADER_SRC = """
-    #version 330 core
-
-    out vec4 finalColor;
-
-    in vec3 ourColor;
-
-
-    void main() {
-        float gamma = 2.2;
-        vec3 color = ourColor;        
-        color = pow(color, vec3(gamma));
-        color = pow(color, 1 / vec3(gamma));
-        finalColor =  vec4(color, 1.0);
-    }
-    """
+    SHADER_NAME = "axes"
+    KIND        = "Axes"
     
-    def __init__(self):
-        super().__init__(moderngl.get_context().program(
-                    vertex_shader   = self.VERTEX_SHADER_SRC,
-                    fragment_shader = self.FRAGMENT_SHADER_SRC
-                ), 
-                Geometry.AxisGeometry(moderngl.get_context()), 
-                ) 
+    def __init__(self, store:EntityStore=None):
         
-        self.name = "Axes Helper"
-        self.render_mode = moderngl.LINES
+        store = store if store else EntityStore.get_default()
+        ctx   = moderngl.get_context()
         
-       
-        
\ No newline at end of file
+        super().__init__(store, 
+                         store.create("Axes Helper",
+                                      store.add_geometry('axes', lambda: Geometry.AxisGeometry(ctx), moderngl.LINES),
+                                      store.add_material(self.SHADER_NAME),
+                                      self.KIND))
@@ -0,0 +1,375 @@
+"""
+File Name: multi_view.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides a batch API to render the scene from many
+             viewpoints, e.g. turntables or datasets. The view matrices of all
+             the viewpoints are computed in one vectorized NumPy call, and the
+             views are rendered into the tiles of an atlas, many views per
+             instanced draw (one view per instance).
+
+TODO:
+    - Render into a texture array (gl_Layer) once a geometry shader stage
+      is available in the shader library.
+"""
+
+import math
+
+import moderngl
+import numpy as np
+
+from PyImOGuizmo import Camera, PITCH_MAX, get_math_backend
+from entity_store import EntityStore, DrawBinding
+from scene_buffer import SceneSnapshot
+from shader_program import ShaderProgram
+from offscreen import create_framebuffer, FramebufferReader
+
+
+
+GL_CLIP_DISTANCE0 = 0x3000
+
+
+
+def orbit_view_matrices(yaw, pitch, distance, target=(0, 0, 0), up=(0, 1, 0)) -> np.ndarray:
+    """
+    Computes the view matrices of a camera orbiting around a target, for many
+    viewpoints at once.
+
+    The angles follow the PyImOGuizmo Camera: the eye is at `target + forward
+    * distance`, with forward = (cos(yaw) cos(pitch), sin(pitch), sin(yaw)
+    cos(pitch)), and the pitch is clamped to +-PITCH_MAX. For a target at the
+    origin the result is the same as `Camera.get_view_matrix()`.
+
+    Args:
+        yaw (array_like): The yaw of each view, in degrees.
+        pitch (array_like): The pitch of each view, in degrees.
+        distance (array_like): The distance of each view to the target.
+        target (tuple, optional): The point looked at.
+        up (tuple, optional): The world up vector.
+
+    Returns:
+        np.ndarray: A (N, 4, 4) float32 array. Each matrix is stored
+                    column-major, like `EntityStore.model_matrices()`.
+    """
+
+    yaw, pitch, distance = np.broadcast_arrays(np.asarray(yaw,      dtype='f8'),
+                                               np.asarray(pitch,    dtype='f8'),
+                                               np.asarray(distance, dtype='f8'))
+    yaw   = np.radians(yaw.ravel())
+    pitch = np.radians(np.clip(pitch.ravel(), -PITCH_MAX, PITCH_MAX))
+
+    forward = np.stack((np.cos(yaw) * np.cos(pitch),
+                        np.sin(pitch),
+                        np.sin(yaw) * np.cos(pitch)), axis=1)
+
+    right = np.cross(forward, np.asarray(up, dtype='f8'))
+    right /= np.linalg.norm(right, axis=1, keepdims=True)
+
+    camera_up = np.cross(right, forward)
+
+    eye = np.asarray(target, dtype='f8') + forward * distance.ravel()[:, None]
+
+    # glm.lookAt(eye, target, camera_up), for all the views at once
+    return get_math_backend("numpy").look_at(eye, np.asarray(target, dtype='f8'), camera_up)
+
+
+
+def fibonacci_sphere(count:int, distance:float=10.0) -> np.ndarray:
+    """
+    Samples viewpoints evenly distributed over a sphere (Fibonacci lattice).
+
+    Args:
+        count (int): The number of viewpoints.
+        distance (float, optional): The radius of the sphere.
+
+    Returns:
+        np.ndarray: A (count, 3) array of (yaw, pitch, distance), with the
+                    angles in degrees, ready for `orbit_view_matrices()`.
+    """
+
+    i     = np.arange(count, dtype='f8') + 0.5
+    pitch = np.degrees(np.arcsin(1.0 - 2.0 * i / count))
+    yaw   = np.degrees(i * math.pi * (3.0 - math.sqrt(5.0))) % 360.0
+
+    return np.stack((yaw, pitch, np.full(count, distance)), axis=1)
+
+
+
+class MultiViewRenderer:
+    """
+    MultiViewRenderer class
+
+    Renders the entities of a store from many viewpoints into the tiles of an
+    atlas framebuffer. The programs are the variants of the ones of the
+    materials compiled with `MULTI_VIEW` defined (see
+    `assets/shaders/include/camera.glsl`): each instance of a draw projects
+    the geometry with its own view-projection matrix into its own tile, and
+    clip distances keep it inside the tile. So each entity is drawn once per
+    `VIEWS_PER_DRAW` views instead of once per view.
+
+    The atlas is sized for the number of views, up to `max_atlas_size`
+    pixels per side. More views are split into pages, rendered and read back
+    one after another into the same framebuffer.
+
+    Attributes:
+        tile_size (tuple): The (width, height) of each view.
+        max_columns (int): The maximum tiles per row of the atlas.
+        max_rows (int): The maximum tile rows of the atlas.
+        columns (int): The tiles per row of the current atlas.
+        rows (int): The tile rows of the current atlas.
+        fbo (moderngl.Framebuffer): The atlas framebuffer.
+    """
+
+    # The MultiViewBlock holds a mat4 and a vec4 per view: 80 bytes, and the
+    # minimum uniform block size guaranteed by OpenGL is 16 KB
+    VIEWS_PER_DRAW = 128
+
+    BLOCK_BINDING = ShaderProgram.UNIFORM_BLOCK_BINDINGS[ShaderProgram.ATTRIBS_.MULTI_VIEW_BLOCK]
+
+
+    def __init__(self, ctx:moderngl.Context, store:EntityStore=None, tile_size:tuple=(128, 128),
+                 max_atlas_size:int=4096, shaders:ShaderProgram=None):
+
+        self.ctx       = ctx
+        self.store     = store if store else EntityStore.get_default()
+        self.shaders   = shaders if shaders else ShaderProgram.get_default(ctx)
+        self.tile_size = tuple(tile_size)
+
+        max_atlas_size   = min(max_atlas_size, ctx.info['GL_MAX_TEXTURE_SIZE'])
+        self.max_columns = max(max_atlas_size // self.tile_size[0], 1)
+        self.max_rows    = max(max_atlas_size // self.tile_size[1], 1)
+
+        self.columns     = 0
+        self.rows        = 0
+        self.fbo         = None
+        self.fbo_texture = None
+        self.reader      = None
+
+        # std140: the mat4 array of the block, then the vec4 array
+        self._block = np.zeros(self.VIEWS_PER_DRAW * (16 + 4), dtype='f4')
+        self.buffer = ctx.buffer(reserve=self._block.nbytes, dynamic=True)
+
+        self._bindings = {}  # (geometry id, material id) -> DrawBinding
+
+
+    @property
+    def tiles_per_page(self) -> int:
+        return self.columns * self.rows
+
+
+    def render_orbit(self, views, camera:Camera=None, snapshot:SceneSnapshot=None) -> np.ndarray:
+        """
+        Renders an array of (yaw, pitch, distance) viewpoints around the
+        target of a camera, e.g. the result of `fibonacci_sphere()`.
+
+        Returns:
+            np.ndarray: See `render()`.
+        """
+
+        return self.render(self.get_view_matrices(views, camera), camera, snapshot)
+
+
+    @staticmethod
+    def get_view_matrices(views, camera:Camera=None) -> np.ndarray:
+        """
+        Returns the view matrices of an array of (yaw, pitch, distance)
+        viewpoints around the target of a camera.
+        """
+
+        views  = np.asarray(views, dtype='f8').reshape(-1, 3)
+        target = tuple(camera.target) if camera else (0, 0, 0)
+        return orbit_view_matrices(views[:, 0], views[:, 1], views[:, 2], target)
+
+
+    def render(self, view_matrices:np.ndarray, camera:Camera=None, snapshot:SceneSnapshot=None) -> np.ndarray:
+        """
+        Renders the store from each view.
+
+        Args:
+            view_matrices (np.ndarray): (N, 4, 4) column-major view matrices.
+            camera (Camera, optional): Provides the FOV and the near and far
+                                       planes. The aspect ratio is the one of
+                                       the tiles.
+            snapshot (SceneSnapshot, optional): The scene state rendered in
+                                                every view. Defaults to the
+                                                one of the last `swap()`.
+
+        Returns:
+            np.ndarray: The (N, height, width, 4) uint8 images of the views,
+                        top row first.
+        """
+
+        view_matrices = np.asarray(view_matrices, dtype='f4').reshape(-1, 4, 4)
+        width, height = self.tile_size
+
+        images = np.empty((len(view_matrices), height, width, 4), dtype=np.uint8)
+
+        for first, count, atlas in self.render_atlases(view_matrices, camera, snapshot):
+            rows  = -(-count // self.columns)
+            tiles = atlas[:rows * height].reshape(rows, height, self.columns, width, 4).swapaxes(1, 2)
+            images[first:first + count] = tiles.reshape(-1, height, width, 4)[:count]
+
+        return images
+
+
+    def render_atlases(self, view_matrices:np.ndarray, camera:Camera=None, snapshot:SceneSnapshot=None):
+        """
+        Renders the views page by page, all of them from the same snapshot
+        (see `render()`).
+
+        Yields:
+            tuple: (index of the first view, number of views, atlas pixels).
+                   The views are laid out row by row from the top left tile.
+                   The pixels are overwritten by the next page.
+        """
+
+        view_matrices = np.asarray(view_matrices, dtype='f4').reshape(-1, 4, 4)
+        snapshot      = snapshot if snapshot else self.store.snapshot
+
+        projection = self._get_projection(camera)
+        # (P * V) column-major is V^T P^T row-major
+        view_projs = view_matrices @ projection
+
+        self._allocate(len(view_projs))
+        tiles = self._get_tiles()
+
+        for i in range(GL_CLIP_DISTANCE0, GL_CLIP_DISTANCE0 + 4):
+            self.ctx.enable_direct(i)
+
+        try:
+            for first in range(0, len(view_projs), self.tiles_per_page):
+                count = min(self.tiles_per_page, len(view_projs) - first)
+                self._render_page(snapshot, view_projs[first:first + count], tiles[:count])
+                yield first, count, self.reader.read(self.fbo)
+        finally:
+            for i in range(GL_CLIP_DISTANCE0, GL_CLIP_DISTANCE0 + 4):
+                self.ctx.disable_direct(i)
+
+
+    def _render_page(self, snapshot, view_projs, tiles):
+
+        self.fbo.use()
+        self.ctx.viewport = (0, 0, *self.fbo.size)
+        self.ctx.clear(0.125, 0.125, 0.125, 1.0)
+
+        matrices = self.store.model_matrices(snapshot)
+
+        rows = np.flatnonzero(snapshot.visible & (snapshot.geometry_id >= 0) & (snapshot.material_id >= 0))
+        if not rows.size:
+            return
+
+        # Draw the entities grouped by binding, to keep the state changes low
+        pairs = np.stack((snapshot.geometry_id[rows], snapshot.material_id[rows]), axis=1)
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        rows, pairs = rows[order].tolist(), [tuple(pair) for pair in pairs[order].tolist()]
+
+        bindings = {pair: self._get_binding(*pair) for pair in set(pairs)}
+
+        for first in range(0, len(view_projs), self.VIEWS_PER_DRAW):
+
+            count = min(self.VIEWS_PER_DRAW, len(view_projs) - first)
+
+            tiles_offset = self.VIEWS_PER_DRAW * 16
+            self._block[:count * 16]                           = view_projs[first:first + count].ravel()
+            self._block[tiles_offset:tiles_offset + count * 4] = tiles[first:first + count].ravel()
+            self.buffer.write(self._block)
+            self.buffer.bind_to_uniform_block(self.BLOCK_BINDING)
+
+            last_texture = None
+            for row, pair in zip(rows, pairs):
+
+                binding = bindings[pair]
+
+                if binding.u_use_texture:
+                    binding.u_use_texture.value = binding.texture is not None
+
+                if binding.texture is not None and binding.texture is not last_texture:
+                    last_texture = binding.texture
+                    last_texture.use()
+
+                binding.u_model.write(matrices[row])
+                binding.vao.render(binding.render_mode, instances=count)
+
+
+    def _get_binding(self, geometry_id, material_id):
+        """
+        Returns the binding of a geometry with the MULTI_VIEW variant of a
+        material. It is built again when the program changed, after a shader
+        hot-reload or a change of the material.
+        """
+
+        material = self.store.materials[material_id]
+        program  = self.shaders.get_program(material.shader_name, {**material.defines, 'MULTI_VIEW': self.VIEWS_PER_DRAW})
+
+        binding = self._bindings.get((geometry_id, material_id))
+        if binding is not None and binding.program is program and binding.texture is material.texture:
+            return binding
+
+        if binding is not None:
+            binding.vao.release()
+
+        binding = DrawBinding(self.store.geometries[geometry_id].vertex_array(program, material.optional_attributes),
+                              material.texture,
+                              self.store.render_modes[geometry_id],
+                              material.flags)
+        self._bindings[(geometry_id, material_id)] = binding
+        return binding
+
+
+    def _allocate(self, view_count):
+
+        columns = min(self.max_columns, max(view_count, 1))
+        rows    = min(self.max_rows, -(-view_count // columns))
+        if (columns, rows) == (self.columns, self.rows):
+            return
+
+        if self.fbo is not None:
+            self.fbo.release()
+            self.fbo_texture.release()
+
+        self.columns, self.rows    = columns, rows
+        self.fbo, self.fbo_texture = create_framebuffer(self.ctx, columns * self.tile_size[0], rows * self.tile_size[1])
+
+        if self.reader is None:
+            self.reader = FramebufferReader(self.ctx, self.fbo.size)
+
+
+    def _get_projection(self, camera):
+
+        width, height = self.tile_size
+        fov, near, far = (camera.FOV, camera.NEAR, camera.FAR) if camera else (45.0, 0.1, 1000.0)
+
+        return get_math_backend("numpy").perspective(math.radians(fov), width / height, near, far)
+
+
+    def _get_tiles(self):
+        """
+        Returns the (scale x, scale y, offset x, offset y) in NDC of every tile
+        of a page, row by row from the top left one.
+        """
+
+        index   = np.arange(self.tiles_per_page)
+        column  = index % self.columns
+        row     = index // self.columns
+
+        tiles = np.empty((self.tiles_per_page, 4), dtype='f4')
+        tiles[:, 0] = 1.0 / self.columns
+        tiles[:, 1] = 1.0 / self.rows
+        tiles[:, 2] = -1.0 + (2 * column + 1) / self.columns
+        tiles[:, 3] =  1.0 - (2 * row    + 1) / self.rows
+        return tiles
+
+
+    def release(self):
+
+        for binding in self._bindings.values():
+            binding.vao.release()
+        self._bindings.clear()
+
+        self.buffer.release()
+
+        if self.fbo is not None:
+            self.reader.release()
+            self.fbo.release()
+            self.fbo_texture.release()
@@ -0,0 +1,356 @@
+"""
+File Name: offscreen.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module groups the offscreen rendering path shared by the
+             interactive demo and the headless mode: the creation of a
+             standalone context, the framebuffer the viewport is rendered
+             into (optionally multi-sampled, resolved on demand, and
+             oversized so that its render size can change without
+             reallocating it), the
+             rendering of one frame of the scene and the readback of its
+             pixels through a persistent pixel-pack buffer.
+
+TODO:
+    -
+"""
+
+import sys
+import platform
+
+import moderngl
+import numpy as np
+
+from PyImOGuizmo import Camera
+from camera_buffer import CameraUniformBuffer
+from entity_store import EntityStore
+from render_queue import RenderQueue
+
+
+
+def create_standalone_context(backend:str=None) -> moderngl.Context:
+    """
+    Creates a moderngl context without any window.
+
+    On Linux EGL is tried first, so it also runs on a box without a display
+    (Mesa's llvmpipe renders on the CPU), then the default (GLX) backend.
+
+    Args:
+        backend (str, optional): Force a moderngl backend ('egl', ...).
+
+    Returns:
+        moderngl.Context: The context, made current.
+    """
+
+    if backend is None and platform.system() == "Linux":
+        try:
+            return moderngl.create_standalone_context(require=330, backend='egl')
+        except Exception as error:
+            sys.stderr.write(f"EGL context failed, trying the default backend: {error}\n")
+
+    kwargs = {'backend': backend} if backend else {}
+    return moderngl.create_standalone_context(require=330, **kwargs)
+
+
+
+def create_framebuffer(ctx, width, height):
+    """
+    Create a framebuffer object (FBO) using ModernGL.
+    """
+    color_texture = ctx.texture((width, height), 4)  # Create color attachment
+    depth_buffer  = ctx.depth_renderbuffer((width, height))  # Create depth attachment
+    fbo           = ctx.framebuffer(color_attachments=[color_texture], depth_attachment=depth_buffer)
+    return fbo, color_texture
+
+
+
+def render_viewport(ctx:moderngl.Context, fbo:moderngl.Framebuffer, camera:Camera,
+                    store:EntityStore, camera_ubo:CameraUniformBuffer, render_queue:RenderQueue,
+                    clear_color=(0.125, 0.125, 0.125, 1.0), viewport:tuple=None):
+    """
+    Renders one frame of the scene into a framebuffer.
+
+    Args:
+        ctx (moderngl.Context): The rendering context.
+        fbo (moderngl.Framebuffer): The target, see `create_framebuffer()`.
+        camera (Camera): The camera the scene is rendered from.
+        store (EntityStore): The entities to draw. Its edits are published first.
+        camera_ubo (CameraUniformBuffer): Receives the camera data of the frame.
+        render_queue (RenderQueue): Sorts and submits the draws.
+        clear_color (tuple, optional): The background colour.
+        viewport (tuple, optional): The (x, y, width, height) to render into.
+                                    Defaults to the whole framebuffer.
+    """
+
+    viewport = viewport if viewport else (0, 0, *fbo.size)
+
+    # Bind the Frame Buffer to render the viewport into the texture
+    fbo.use()
+    ctx.viewport = viewport
+    ctx.clear(*clear_color, viewport=viewport)
+
+    # Publish the scene edits made since the last frame
+    store.swap()
+
+    # Upload the camera matrices once for the whole frame
+    camera_ubo.update(camera)
+
+    render_queue.begin(camera)
+    render_queue.submit(store)
+    render_queue.flush()
+
+
+
+class RenderTarget:
+    """
+    RenderTarget class
+
+    The framebuffer the viewport is rendered into, with optional multi-sample
+    anti-aliasing (MSAA).
+
+    With one sample the scene is rendered straight into `texture`. With more,
+    it is rendered into multi-sample renderbuffers and `resolve()` blits them
+    into `texture`, only when something was rendered since the last resolve.
+    The multi-sample framebuffers are kept per sample count until the next
+    resize, so switching the sample count back and forth (see the adaptive
+    MSAA of the demo) does not reallocate them.
+
+    The buffers can be allocated larger than the rendered size, see the
+    `capacity` of `resize()`: the frame is then rendered into the bottom-left
+    `viewport` of the buffers and shown with the `uvs` of that corner. This
+    is how the dynamic resolution of the demo changes the render size every
+    few frames without reallocating anything.
+
+    Attributes:
+        size (tuple): The (width, height) rendered, in pixels.
+        allocated_size (tuple): The (width, height) of the buffers.
+        samples (int): The sample count used by the next `begin()`, clamped
+                       to the maximum supported by the context.
+        texture (moderngl.Texture): The single-sample colour texture sampled
+                                    by ImGui.
+        output_fbo (moderngl.Framebuffer): The single-sample framebuffer of
+                                           `texture`, the one to read back.
+    """
+
+    def __init__(self, ctx:moderngl.Context, size:tuple, samples:int=1):
+
+        self.ctx            = ctx
+        self.size           = None
+        self.allocated_size = None
+        self.samples        = 1
+
+        self.output_fbo = None
+        self.texture    = None
+
+        self._multisample = {}  # samples -> (fbo, colour renderbuffer, depth renderbuffer)
+        self._rendered    = False
+
+        self.resize(size)
+        self.set_samples(samples)
+
+
+    @property
+    def fbo(self) -> moderngl.Framebuffer:
+        """
+        The framebuffer rendered into with the current sample count.
+        """
+
+        if self.samples == 1:
+            return self.output_fbo
+
+        entry = self._multisample.get(self.samples)
+        if entry is None:
+            color = self.ctx.renderbuffer(self.allocated_size, 4, samples=self.samples)
+            depth = self.ctx.depth_renderbuffer(self.allocated_size, samples=self.samples)
+            entry = (self.ctx.framebuffer(color_attachments=[color], depth_attachment=depth), color, depth)
+            self._multisample[self.samples] = entry
+        return entry[0]
+
+
+    @property
+    def viewport(self) -> tuple:
+        """
+        The (x, y, width, height) of the buffers the frame is rendered into.
+        """
+        return (0, 0, *self.size)
+
+
+    @property
+    def uvs(self) -> tuple:
+        """
+        The (uv0, uv1) of the rendered area for `imgui.image`, flipped from
+        OpenGL's bottom-left origin to ImGui's top-left one.
+        """
+
+        width, height = self.size
+        allocated_width, allocated_height = self.allocated_size
+        return (0.0, height / allocated_height), (width / allocated_width, 0.0)
+
+
+    def set_samples(self, samples:int):
+        self.samples = max(1, min(int(samples), self.ctx.max_samples))
+
+
+    def resize(self, size:tuple, capacity:tuple=None) -> bool:
+        """
+        Sets the rendered size. The buffers are only reallocated when they
+        are too small for it, or for `capacity`, or when the rendered size
+        (without a capacity) changed.
+
+        Args:
+            size (tuple): The (width, height) to render.
+            capacity (tuple, optional): The (width, height) to allocate at
+                                        least, to leave room for larger
+                                        render sizes.
+
+        Returns:
+            bool: The buffers were reallocated.
+        """
+
+        size     = (max(int(size[0]), 1), max(int(size[1]), 1))
+        capacity = size if capacity is None else (max(int(capacity[0]), size[0]), max(int(capacity[1]), size[1]))
+
+        if self.allocated_size == capacity or (capacity != size and self._fits(capacity)):
+            self.size = size
+            return False
+
+        self._release_buffers()
+
+        self.size                     = size
+        self.allocated_size           = capacity
+        self.output_fbo, self.texture = create_framebuffer(self.ctx, *capacity)
+        self._rendered                = False
+        return True
+
+
+    def _fits(self, capacity) -> bool:
+
+        # Not too small, nor more than twice as large as needed
+        allocated_width, allocated_height = self.allocated_size or (0, 0)
+        return (capacity[0] <= allocated_width <= 2 * capacity[0] and
+                capacity[1] <= allocated_height <= 2 * capacity[1])
+
+
+    def begin(self) -> moderngl.Framebuffer:
+        """
+        Returns the framebuffer to render the next frame into, and remembers
+        that it has to be resolved.
+        """
+
+        self._rendered = True
+        return self.fbo
+
+
+    def resolve(self) -> bool:
+        """
+        Blits the multi-sample buffer into `texture`, if anything was rendered
+        since the last resolve.
+
+        Returns:
+            bool: A blit was issued.
+        """
+
+        if not self._rendered:
+            return False
+
+        self._rendered = False
+        if self.samples == 1:
+            return False
+
+        # The blit honours the scissor, so only the rendered area is resolved
+        fbo = self.fbo
+        fbo.scissor = self.viewport
+        fbo.use()
+        self.ctx.copy_framebuffer(self.output_fbo, fbo)
+        fbo.scissor = None
+        return True
+
+
+    def _release_buffers(self):
+
+        for fbo, color, depth in self._multisample.values():
+            fbo.release()
+            color.release()
+            depth.release()
+        self._multisample.clear()
+
+        if self.output_fbo is not None:
+            self.output_fbo.release()
+            self.texture.release()
+
+
+    def release(self):
+        self._release_buffers()
+
+
+
+class FramebufferReader:
+    """
+    FramebufferReader class
+
+    Reads the colour attachment of a framebuffer into a pixel-pack buffer and
+    from there into a NumPy array. Both are allocated once and reused, so
+    reading a frame does not allocate (unlike `Framebuffer.read()`, which
+    returns new bytes every call). They are only reallocated when the size of
+    the framebuffer changes.
+
+    Attributes:
+        size (tuple): The (width, height) of the frames read.
+        components (int): The number of components per pixel.
+        buffer (moderngl.Buffer): The pixel-pack buffer.
+        pixels (np.ndarray): The (height, width, components) uint8 array the
+                             last frame is copied to, bottom row first as in
+                             OpenGL.
+    """
+
+    def __init__(self, ctx:moderngl.Context, size:tuple, components:int=4):
+
+        self.ctx        = ctx
+        self.components = components
+        self.size       = None
+        self.buffer     = None
+        self.pixels     = None
+
+        self._allocate(tuple(size))
+
+
+    def read(self, fbo:moderngl.Framebuffer, attachment:int=0, viewport:tuple=None) -> np.ndarray:
+        """
+        Reads a colour attachment of a framebuffer. This waits for the frame
+        to be rendered.
+
+        Args:
+            fbo (moderngl.Framebuffer): The framebuffer to read.
+            attachment (int, optional): The colour attachment index.
+            viewport (tuple, optional): The (x, y, width, height) to read.
+                                        Defaults to the whole framebuffer.
+
+        Returns:
+            np.ndarray: A top row first view of `pixels`. It is overwritten by
+                        the next read, copy it to keep it.
+        """
+
+        viewport = viewport if viewport else (0, 0, *fbo.size)
+        if tuple(viewport[2:]) != self.size:
+            self._allocate(tuple(viewport[2:]))
+
+        fbo.read_into(self.buffer, viewport, components=self.components, attachment=attachment, alignment=1)
+        self.buffer.read_into(self.pixels)
+
+        return self.pixels[::-1]
+
+
+    def _allocate(self, size):
+
+        if self.buffer is not None:
+            self.buffer.release()
+
+        width, height = size
+        self.size     = size
+        self.buffer   = self.ctx.buffer(reserve=width * height * self.components)
+        self.pixels   = np.empty((height, width, self.components), dtype=np.uint8)
+
+
+    def release(self):
+        self.buffer.release()
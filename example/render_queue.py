@@ -0,0 +1,342 @@
+"""
+File Name: render_queue.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides a RenderQueue that collects the entities to draw
+             in a frame, sorts them by a packed 64-bit key (program, texture,
+             vertex array, front-to-back depth) and submits them skipping the
+             state changes that are already in place: an optional depth-only
+             pre-pass, the opaque entities without blending and then the
+             transparent ones, back to front. The number of state changes is
+             reported per frame, and the GPU time of its passes when a
+             profiler is attached.
+
+TODO:
+    -
+"""
+
+import contextlib
+
+import moderngl
+import numpy as np
+
+from PyImOGuizmo import Camera
+from entity_store import EntityStore, MaterialFlags
+from scene_buffer import SceneSnapshot
+
+
+
+class RenderStats:
+    """
+    State changes issued while submitting one frame.
+    """
+
+    def __init__(self):
+        self.reset()
+
+
+    def reset(self):
+        self.draws:int          = 0
+        self.prepass_draws:int  = 0
+        self.program_binds:int  = 0
+        self.texture_binds:int  = 0
+        self.vao_binds:int      = 0
+        self.uniform_writes:int = 0
+
+
+    def state_changes(self):
+        return self.program_binds + self.texture_binds + self.vao_binds
+
+
+
+class RenderQueue:
+    """
+    RenderQueue class
+
+    The sort key is laid out from the most to the least significant bits as:
+
+        | program (12) | texture (12) | vertex array (16) | depth (24) |
+
+    so packets sharing a program are drawn together, then the ones sharing a
+    texture, then the ones sharing a vertex array, and finally front to back.
+    Programs, textures and vertex arrays get a small id the first time they are
+    seen. Ids wrap around when a field overflows, which only costs extra binds.
+
+    The keys of all the entities of a store are computed with NumPy in one
+    pass, only the submission loop runs per entity.
+
+    The packets are drawn in up to three steps:
+
+    1. With `depth_prepass`, the opaque triangles are drawn front to back
+       with the depth-only program and the colour writes masked out. The
+       colour pass then tests with `<=` and only shades the visible fragment
+       of each pixel, whatever its sort order. Worth it on dense scenes, where
+       the fragments shaded and then hidden cost more than the second pass.
+    2. The opaque packets, in the sort order, with blending disabled.
+    3. The transparent packets (see MaterialFlags.TRANSPARENT), back to
+       front, with blending enabled. It is left enabled after the flush.
+
+    With a `profiler` (see GpuProfiler) each step is measured on its own, and
+    the opaque packets are split by the kind of their entity: "scene" for the
+    meshes, "grid" and "axes" for the helpers. Every pass of `PASSES` is
+    measured each flush, even when empty, so they keep the same number of
+    measurements.
+
+    Attributes:
+        sort (bool): Sort the packets before submitting them. Disable it to
+                     measure the submission order the scene was built with.
+        depth_prepass (bool): Draw the opaque triangles in a depth-only
+                              pre-pass first.
+        stats (RenderStats): The state changes of the last flush.
+        profiler (GpuProfiler): Measures the GPU time of the passes, or None.
+    """
+
+    PROGRAM_BITS = 12
+    TEXTURE_BITS = 12
+    VAO_BITS     = 16
+    DEPTH_BITS   = 24
+
+    DEPTH_SHIFT   = 0
+    VAO_SHIFT     = DEPTH_SHIFT + DEPTH_BITS
+    TEXTURE_SHIFT = VAO_SHIFT + VAO_BITS
+    PROGRAM_SHIFT = TEXTURE_SHIFT + TEXTURE_BITS
+
+    DEPTH_MAX = (1 << DEPTH_BITS) - 1
+
+    PASSES        = ("depth", "scene", "grid", "axes", "transparent")
+    OPAQUE_PASSES = ("scene", "grid", "axes")
+    PASS_OF_KIND  = {"Grid": 1, "Axes": 2}
+
+
+    def __init__(self, sort:bool=True, depth_prepass:bool=False):
+
+        self.sort          = sort
+        self.depth_prepass = depth_prepass
+        self.batches       = []
+        self.stats    = RenderStats()
+        self.profiler = None
+
+        self._last_program     = None
+        self._last_texture     = None
+        self._last_vao         = None
+        self._last_use_texture = None
+
+        self._ctx = None
+
+        self._program_ids = {}
+        self._texture_ids = {None: 0}
+        self._vao_ids     = {}
+
+        self._view_z      = np.array((0, 0, -1, 0), dtype='f4')
+        self._depth_scale = 1.0
+
+
+    def begin(self, camera:Camera):
+        """
+        Starts collecting the packets of a new frame.
+
+        Args:
+            camera (Camera): The camera used to compute the depth of the packets.
+        """
+
+        self.batches.clear()
+
+        # Row of the view matrix giving the view-space z of a world position
+        m_view = camera.get_view_matrix()
+        self._view_z      = np.array([m_view[column][2] for column in range(4)], dtype='f4')
+        self._depth_scale = self.DEPTH_MAX / camera.FAR
+
+
+    def submit(self, store:EntityStore, snapshot:SceneSnapshot=None):
+        """
+        Queues the visible entities of a store for this frame.
+
+        Args:
+            store (EntityStore): The entities to draw.
+            snapshot (SceneSnapshot, optional): The snapshot to draw. Defaults
+                                                to the current one of the store.
+        """
+
+        snapshot = snapshot if snapshot else store.snapshot
+
+        rows = np.flatnonzero(snapshot.visible & (snapshot.geometry_id >= 0) & (snapshot.material_id >= 0))
+        if not rows.size:
+            return
+
+        # One binding per (geometry, material) pair in use
+        material_count = len(store.materials)
+        pairs = snapshot.geometry_id[rows].astype(np.int64) * material_count + snapshot.material_id[rows]
+        unique_pairs, binding_index = np.unique(pairs, return_inverse=True)
+
+        bindings       = []
+        depth_bindings = []
+        pair_keys      = np.empty(len(unique_pairs), dtype=np.uint64)
+        for i, pair in enumerate(unique_pairs.tolist()):
+            geometry_id, material_id = divmod(pair, material_count)
+
+            binding = store.get_binding(geometry_id, material_id)
+            bindings.append(binding)
+
+            # Only the opaque triangles go through the depth pre-pass
+            if self.depth_prepass and binding.render_mode == moderngl.TRIANGLES and not binding.flags & MaterialFlags.TRANSPARENT:
+                depth_bindings.append(store.get_depth_binding(geometry_id))
+            else:
+                depth_bindings.append(None)
+
+            program_id = self._get_id(self._program_ids, binding.program.glo, self.PROGRAM_BITS)
+            texture_id = self._get_id(self._texture_ids, binding.texture.glo if binding.texture else None, self.TEXTURE_BITS)
+            vao_id     = self._get_id(self._vao_ids, binding.vao.glo, self.VAO_BITS)
+
+            pair_keys[i] = (  (program_id << self.PROGRAM_SHIFT)
+                            | (texture_id << self.TEXTURE_SHIFT)
+                            | (vao_id     << self.VAO_SHIFT) )
+
+        # Distance in front of the camera, quantized over [0, FAR]
+        view_z = snapshot.position[rows] @ self._view_z[:3] + self._view_z[3]
+        depth  = np.clip(-view_z * self._depth_scale, 0, self.DEPTH_MAX).astype(np.uint64)
+
+        keys = pair_keys[binding_index] | (depth << np.uint64(self.DEPTH_SHIFT))
+
+        self.batches.append((store, snapshot, rows, keys, bindings, depth_bindings, binding_index))
+        self._ctx = bindings[0].vao.ctx
+
+
+    def flush(self):
+        """
+        Sorts and draws the queued entities, skipping redundant binds. Each
+        submitted store is sorted on its own.
+
+        moderngl issues glUseProgram and glBindVertexArray inside every
+        `VertexArray.render` call, so for those two the stats count the real
+        changes the driver sees, while texture binds and the per-program
+        uniforms are only written when they change.
+
+        Returns:
+            RenderStats: The state changes of this frame.
+        """
+
+        self.stats.reset()
+
+        self._last_program     = None
+        self._last_texture     = None
+        self._last_vao         = None
+        self._last_use_texture = None
+
+        batches = [self._prepare(*batch) for batch in self.batches]
+        ctx     = self._ctx if batches else None
+
+        # 1. Depth pre-pass, front to back, only the depth is written
+        with self._scope("depth"):
+            if ctx and self.depth_prepass:
+                ctx.fbo.color_mask = (False, False, False, False)
+
+                for rows, binding_index, depth, transparent, passes, bindings, depth_bindings, matrices in batches:
+                    selection = np.flatnonzero(self._prepassed(depth_bindings, binding_index))
+                    selection = selection[np.argsort(depth[selection], kind='stable')]
+                    self._draw(rows[selection], binding_index[selection], depth_bindings, matrices)
+
+                ctx.fbo.color_mask = (True, True, True, True)
+                ctx.depth_func     = '<='
+
+                self.stats.prepass_draws = self.stats.draws
+
+        # 2. Opaque, in the sort order
+        if ctx:
+            ctx.disable(moderngl.BLEND)
+
+        for pass_index, name in enumerate(self.OPAQUE_PASSES if self.profiler else (None,)):
+            with self._scope(name):
+                for rows, binding_index, depth, transparent, passes, bindings, depth_bindings, matrices in batches:
+                    selection = ~transparent if name is None else ~transparent & (passes == pass_index)
+                    self._draw(rows[selection], binding_index[selection], bindings, matrices)
+
+        # 3. Transparent, back to front and blended
+        if ctx:
+            ctx.enable(moderngl.BLEND)
+
+        with self._scope("transparent"):
+            for rows, binding_index, depth, transparent, passes, bindings, depth_bindings, matrices in batches:
+                selection = np.flatnonzero(transparent)
+                selection = selection[np.argsort(depth[selection], kind='stable')[::-1]]
+                self._draw(rows[selection], binding_index[selection], bindings, matrices)
+
+        if ctx:
+            ctx.depth_func = '<'
+
+        self.batches.clear()
+
+        return self.stats
+
+
+    def _prepare(self, store, snapshot, rows, keys, bindings, depth_bindings, binding_index):
+
+        order = np.argsort(keys, kind='stable') if self.sort else np.arange(len(rows))
+        rows, keys, binding_index = rows[order], keys[order], binding_index[order]
+
+        transparent = np.array([bool(binding.flags & MaterialFlags.TRANSPARENT) for binding in bindings])[binding_index]
+        depth       = keys & np.uint64(self.DEPTH_MAX)
+        passes      = self._get_passes(store, rows) if self.profiler else None
+
+        return rows, binding_index, depth, transparent, passes, bindings, depth_bindings, store.model_matrices(snapshot)
+
+
+    @staticmethod
+    def _prepassed(depth_bindings, binding_index) -> np.ndarray:
+        return np.array([binding is not None for binding in depth_bindings], dtype=bool)[binding_index]
+
+
+    def _scope(self, name):
+        return self.profiler.scope(name) if self.profiler and name else contextlib.nullcontext()
+
+
+    def _draw(self, rows, binding_index, bindings, matrices):
+
+        stats = self.stats
+
+        for row, i in zip(rows.tolist(), binding_index.tolist()):
+
+            binding = bindings[i]
+            program = binding.program
+
+            if program is not self._last_program:
+                self._last_program     = program
+                self._last_use_texture = None
+                stats.program_binds += 1
+
+            if binding.texture is not None and binding.texture is not self._last_texture:
+                self._last_texture = binding.texture
+                self._last_texture.use()
+                stats.texture_binds += 1
+
+            use_texture = binding.texture is not None
+            if binding.u_use_texture and use_texture != self._last_use_texture:
+                self._last_use_texture = use_texture
+                binding.u_use_texture.value = use_texture
+                stats.uniform_writes += 1
+
+            if binding.vao is not self._last_vao:
+                self._last_vao = binding.vao
+                stats.vao_binds += 1
+
+            binding.u_model.write(matrices[row])
+            binding.vao.render(binding.render_mode)
+
+            stats.uniform_writes += 1
+            stats.draws += 1
+
+
+    def _get_passes(self, store, rows) -> np.ndarray:
+
+        kinds = store.kinds
+        return np.fromiter((self.PASS_OF_KIND.get(kinds[row], 0) for row in rows.tolist()), dtype=np.int8, count=len(rows))
+
+
+    @staticmethod
+    def _get_id(ids, gl_object, bits):
+
+        object_id = ids.get(gl_object)
+        if object_id is None:
+            object_id = len(ids) & ((1 << bits) - 1)
+            ids[gl_object] = object_id
+        return object_id
@@ -0,0 +1,263 @@
+"""
+File Name: scene_buffer.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides a double-buffered, struct-of-arrays store of the
+             entity transforms. Any thread writes into the back buffer, while the
+             render thread swaps in an immutable SceneSnapshot once per frame and
+             only reads from it, so updates never cause torn reads.
+
+TODO:
+    -
+"""
+
+import threading
+
+import numpy as np
+
+
+
+class SceneSnapshot:
+    """
+    Read-only view of the scene for one frame.
+
+    The arrays can not be written and stay valid until the second swap after
+    the one that produced them (the buffers are reused ping-pong).
+
+    Attributes:
+        version (int): The version of the scene buffer the snapshot was taken at.
+        count (int): The number of allocated rows.
+        arrays (dict): Field name -> read-only array of `count` rows.
+    """
+
+    def __init__(self, version:int, count:int, arrays:dict):
+        self.version = version
+        self.count   = count
+        self.arrays  = arrays
+
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['arrays'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+
+class SceneBuffer:
+    """
+    SceneBuffer class
+
+    Each field is a contiguous NumPy array with one row per entity. Rows are
+    allocated and freed with `allocate()` / `free()` and addressed by index.
+
+    Writers (any thread) call `set()` / `write()`, which only touch the back
+    buffer under a short lock. The render thread calls `swap()` once per frame
+    and renders from the returned snapshot. When nothing was written since the
+    last swap no copy happens and the same snapshot is returned.
+
+    Attributes:
+        FIELDS (dict): Field name -> (row shape, dtype, default value).
+        version (int): Incremented on every write.
+    """
+
+    FIELDS = {
+        'position': (3,  'f4', (0, 0, 0)),
+        'rotation': (3,  'f4', (0, 0, 0)),
+        'scale':    (3,  'f4', (1, 1, 1)),
+        'visible':  ((), '?',  True),
+    }
+
+    _default = None
+
+
+    def __init__(self, capacity:int=256):
+
+        self._lock     = threading.Lock()
+        self._capacity = max(int(capacity), 1)
+        self._count    = 0
+        self._free     = []
+
+        self.version = 0
+
+        self._back        = self._allocate_arrays(self._capacity)
+        self._fronts      = [self._allocate_arrays(self._capacity), self._allocate_arrays(self._capacity)]
+        self._front_index = 0
+
+        for front in self._fronts:
+            for array in front.values():
+                array.flags.writeable = False
+
+        self._snapshot = self._make_snapshot(self._fronts[0], 0)
+
+
+    @classmethod
+    def get_default(cls):
+        """
+        Returns the scene buffer shared by the meshes that are not given one.
+        """
+
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+
+    def allocate(self, **values) -> int:
+        """
+        Allocates a row initialized with the default values of each field, or
+        with `values`, all written with one version so no snapshot can see
+        the row half initialized.
+
+        Returns:
+            int: The index of the row.
+        """
+
+        with self._lock:
+
+            if self._free:
+                index = self._free.pop()
+            else:
+                if self._count == self._capacity:
+                    self._grow(self._capacity * 2)
+                index = self._count
+                self._count += 1
+
+            for name, (_, _, default) in self.FIELDS.items():
+                self._back[name][index] = default
+
+            self._write_row(index, values)
+
+        return index
+
+
+    def free(self, index:int):
+        """
+        Releases a row. It is hidden and reused by the next `allocate()`.
+        """
+
+        with self._lock:
+            if 'visible' in self._back:
+                self._back['visible'][index] = False
+            self._free.append(index)
+            self.version += 1
+
+
+    def set(self, index:int, field:str, value):
+        """
+        Writes one row of a field in the back buffer. Thread safe.
+        """
+
+        with self._lock:
+            self._back[field][index] = value
+            self.version += 1
+
+
+    def set_row(self, index:int, **values):
+        """
+        Writes several fields of one row in the back buffer at once, so a 
+        snapshot has either all of them or none. Thread safe.
+        """
+
+        with self._lock:
+            self._write_row(index, values)
+
+
+    def _write_row(self, index, values):
+
+        for field, value in values.items():
+            self._back[field][index] = value
+        self.version += 1
+
+
+    def write(self, field:str, indices, values):
+        """
+        Writes many rows of a field in the back buffer at once. Thread safe.
+
+        Args:
+            field (str): The name of the field.
+            indices (array_like): The row indices.
+            values (array_like): The values, one per index.
+        """
+
+        with self._lock:
+            self._back[field][indices] = values
+            self.version += 1
+
+
+    def get(self, index:int, field:str):
+        """
+        Reads one row of a field from the back buffer, i.e. the latest value
+        written, which may not be rendered yet.
+
+        Returns:
+            A copy of the row (a Python scalar for scalar fields).
+        """
+
+        with self._lock:
+            value = self._back[field][index]
+            return value.copy() if isinstance(value, np.ndarray) else value.item()
+
+
+    @property
+    def snapshot(self) -> SceneSnapshot:
+        """
+        The snapshot returned by the last `swap()`.
+        """
+        return self._snapshot
+
+
+    def swap(self) -> SceneSnapshot:
+        """
+        Publishes the back buffer as a new immutable snapshot. Call it from the
+        render thread once per frame, before rendering.
+
+        Returns:
+            SceneSnapshot: The snapshot to render this frame.
+        """
+
+        with self._lock:
+
+            if self._snapshot.version == self.version:
+                return self._snapshot
+
+            self._front_index ^= 1
+            front = self._fronts[self._front_index]
+
+            if len(next(iter(front.values()))) != self._capacity:
+                front = self._allocate_arrays(self._capacity)
+                self._fronts[self._front_index] = front
+
+            count = self._count
+            for name, array in front.items():
+                array.flags.writeable = True
+                np.copyto(array[:count], self._back[name][:count])
+                array.flags.writeable = False
+
+            self._snapshot = self._make_snapshot(front, count)
+
+        return self._snapshot
+
+
+    def _make_snapshot(self, arrays, count):
+        return SceneSnapshot(self.version, count, {name: array[:count] for name, array in arrays.items()})
+
+
+    def _allocate_arrays(self, capacity):
+
+        arrays = {}
+        for name, (shape, dtype, default) in self.FIELDS.items():
+            row_shape    = shape if isinstance(shape, tuple) else (shape,)
+            arrays[name] = np.empty((capacity, *row_shape), dtype=dtype)
+            arrays[name][:] = default
+        return arrays
+
+
+    def _grow(self, capacity):
+
+        back = self._allocate_arrays(capacity)
+        for name, array in self._back.items():
+            back[name][:self._count] = array[:self._count]
+
+        self._back     = back
+        self._capacity = capacity
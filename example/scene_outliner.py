@@ -0,0 +1,308 @@
+"""
+File Name: scene_outliner.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the SceneOutliner, the tree of the Scene
+             Manager window. Entities are grouped by type and the tree is
+             flattened into a list of rows, rebuilt only when the structure of
+             the store or the expanded groups change, and drawn through an
+             ImGuiListClipper so only the rows scrolled into view are emitted.
+             A search box filters the rows through the SearchIndex of the store.
+
+TODO:
+    -
+"""
+
+from imgui_bundle import imgui
+
+from entity_store import EntityStore
+
+
+
+class SceneOutliner:
+    """
+    SceneOutliner class
+
+    The rows are plain integers: a handle (>= 0) for an entity and
+    `-(group index + 1)` for a group header. The children of a collapsed group
+    are never added to the rows, so expanding a group is the only time its
+    entities are visited.
+
+    The labels of the entities are built the first time their row is drawn
+    and kept until the store structure changes (create, destroy, rename).
+
+    While a search is active only the matching entities are added to the
+    rows, and the groups with matches are shown expanded unless collapsed
+    during the search. The query is run again when the store changes.
+
+    Attributes:
+        store (EntityStore): The entities shown.
+        selected (set): The handles of the selected entities.
+        active (int): The handle of the last entity clicked, or None. This is
+                      the one shown in the Property Inspector.
+        expanded (set): The types whose group is expanded.
+        search_text (str): The current query of the search box.
+        matches (set): The handles matching the query, or None when there is
+                       no query.
+    """
+
+    ICON_ENTITY = '\uf1b2'
+
+    # Groups with more entities than this start collapsed
+    AUTO_EXPAND_LIMIT = 100
+
+    # Width reserved at the right of each row for the visibility checkbox
+    CHECKBOX_WIDTH = 40
+
+
+    def __init__(self, store:EntityStore):
+
+        self.store = store
+
+        self.selected:set = set()
+        self.active:int   = None
+        self.expanded:set = set()
+
+        self.search_text:str = ""
+        self.matches:set     = None
+
+        self._groups       = []  # [(kind, [handles])]
+        self._group_labels = []
+        self._rows         = []
+        self._labels       = {}  # handle -> label
+        self._seen_kinds   = set()
+
+        self._search_collapsed = set()
+
+        self._structure_version = None
+        self._dirty             = True
+
+
+    @property
+    def rows(self) -> list:
+        """
+        The flattened rows of the tree, rebuilt if needed.
+        """
+
+        if self._structure_version != self.store.structure_version:
+            self._rebuild_groups()
+
+        if self._dirty:
+            self._rebuild_rows()
+
+        return self._rows
+
+
+    def search(self, text:str):
+        """
+        Filters the rows by a query (see SearchIndex.query). An empty query
+        shows every entity again.
+        """
+
+        self.search_text = text
+        self.matches     = self.store.search_index.query(text) if text.strip() else None
+        self._dirty      = True
+
+
+    def select_all_matches(self):
+        """
+        Selects every entity matching the current query.
+        """
+
+        if not self.matches:
+            return
+
+        self.selected = set(self.matches)
+        if self.active not in self.selected:
+            self.active = min(self.selected)
+
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.active = None
+
+
+    def select(self, handle:int, add:bool=False):
+        """
+        Selects an entity.
+
+        Args:
+            handle (int): The handle of the entity.
+            add (bool, optional): Toggle it in the current selection instead of
+                                  replacing the selection.
+        """
+
+        if add:
+            if handle in self.selected:
+                self.selected.discard(handle)
+                self.active = next(iter(self.selected), None) if self.active == handle else self.active
+                return
+        else:
+            self.selected.clear()
+
+        self.selected.add(handle)
+        self.active = handle
+
+
+    def is_expanded(self, kind:str) -> bool:
+
+        if self.matches is not None:
+            return kind not in self._search_collapsed
+        return kind in self.expanded
+
+
+    def set_expanded(self, kind:str, expanded:bool):
+
+        if self.matches is not None:
+            if expanded:
+                self._search_collapsed.discard(kind)
+            else:
+                self._search_collapsed.add(kind)
+        elif expanded:
+            self.expanded.add(kind)
+        else:
+            self.expanded.discard(kind)
+        self._dirty = True
+
+
+    def draw_search_bar(self):
+        """
+        Draws the search box and the "Select All" button of the matches.
+        """
+
+        button_width = imgui.calc_text_size("Select All").x + imgui.get_style().frame_padding.x * 2
+
+        imgui.set_next_item_width(imgui.get_content_region_avail().x - button_width - imgui.get_style().item_spacing.x)
+        changed, text = imgui.input_text_with_hint("##outliner_search", "Search by name or type", self.search_text)
+        if changed:
+            self.search(text)
+
+        imgui.same_line()
+        imgui.begin_disabled(not self.matches)
+        if imgui.button("Select All"):
+            self.select_all_matches()
+        imgui.end_disabled()
+
+
+    def draw(self):
+        """
+        Draws the rows of the tree in the current window. Call it inside the
+        tree node of the scene.
+        """
+
+        rows    = self.rows
+        toggled = None
+
+        clipper = imgui.ListClipper()
+        clipper.begin(len(rows))
+
+        while clipper.step():
+            for row in rows[clipper.display_start:clipper.display_end]:
+
+                if row < 0:
+                    kind, opened = self._draw_group(-row - 1)
+                    if opened != self.is_expanded(kind):
+                        toggled = (kind, opened)
+                else:
+                    self._draw_entity(row)
+
+        clipper.end()
+
+        # The rows are only rebuilt once the clipper is done with them
+        if toggled:
+            self.set_expanded(*toggled)
+
+
+    def _draw_group(self, group_index):
+
+        kind, _ = self._groups[group_index]
+
+        imgui.set_next_item_open(self.is_expanded(kind))
+        opened = imgui.tree_node_ex(self._group_labels[group_index],
+                                    imgui.TreeNodeFlags_.no_tree_push_on_open | imgui.TreeNodeFlags_.span_full_width)
+        return kind, opened
+
+
+    def _draw_entity(self, handle):
+
+        label = self._labels.get(handle)
+        if label is None:
+            label = f'{self.ICON_ENTITY}  {self.store.names[handle]}'
+            self._labels[handle] = label
+
+        imgui.push_id(handle)
+        imgui.indent()
+
+        clicked, _ = imgui.selectable(label,
+                                      handle in self.selected,
+                                      imgui.SelectableFlags_.allow_overlap | imgui.SelectableFlags_.span_all_columns)
+        if clicked:
+            self.select(handle, imgui.get_io().key_ctrl)
+
+        imgui.same_line()
+        imgui.dummy((imgui.get_content_region_avail().x - self.CHECKBOX_WIDTH, 0))
+        imgui.same_line()
+
+        visible = self.store.get(handle, 'visible')
+        changed, visible = imgui.checkbox("##node_visible", visible)
+        if changed:
+            self.store.set(handle, 'visible', visible)
+
+        imgui.unindent()
+        imgui.pop_id()
+
+
+    def _rebuild_groups(self):
+
+        store  = self.store
+        groups = {}
+        for handle in store.handles():
+            groups.setdefault(store.kinds[handle], []).append(handle)
+
+        for kind, handles in groups.items():
+            if kind not in self._seen_kinds:
+                self._seen_kinds.add(kind)
+                if len(handles) <= self.AUTO_EXPAND_LIMIT:
+                    self.expanded.add(kind)
+
+        self._groups = list(groups.items())
+        self._labels.clear()
+
+        if self.matches is not None:
+            self.matches = store.search_index.query(self.search_text)
+
+        # Forget the selected entities that were destroyed
+        self.selected.intersection_update(handle for _, handles in self._groups for handle in handles)
+        if self.active not in self.selected:
+            self.active = next(iter(self.selected), None)
+
+        self._structure_version = store.structure_version
+        self._dirty             = True
+
+
+    def _rebuild_rows(self):
+
+        if self.matches is None:
+            children = dict(self._groups)
+            labels   = [f'{kind} ({len(handles)})###group_{kind}' for kind, handles in self._groups]
+        else:
+            # Only the matches are visited, never the whole store
+            kinds    = self.store.kinds
+            children = {}
+            for handle in sorted(self.matches):
+                children.setdefault(kinds[handle], []).append(handle)
+            labels   = [f'{kind} ({len(children.get(kind, ()))}/{len(handles)})###group_{kind}' for kind, handles in self._groups]
+
+        rows = []
+        for group_index, (kind, _) in enumerate(self._groups):
+            handles = children.get(kind)
+            if not handles:
+                continue
+            rows.append(-group_index - 1)
+            if self.is_expanded(kind):
+                rows.extend(handles)
+
+        self._rows         = rows
+        self._group_labels = labels
+        self._dirty        = False
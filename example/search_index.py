@@ -0,0 +1,164 @@
+"""
+File Name: search_index.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the SearchIndex, an incrementally maintained
+             index over the names and types of the entities of a scene. Queries
+             of three or more characters are answered with a trigram index,
+             shorter ones with a sorted index of word prefixes, so a search
+             never scans every entity.
+
+TODO:
+    -
+"""
+
+import bisect
+
+
+
+class SearchIndex:
+    """
+    SearchIndex class
+
+    The texts indexed for an entity are its name and its type, in lower case
+    and each on its own, so a query never matches across the two. A query
+    matches an entity when:
+
+        - it has three or more characters and is a substring of one of its
+          texts. The candidates are the intersection of the posting sets of
+          the trigrams of the query (smallest first), then checked with `in`.
+        - it has one or two characters and is the prefix of a word of one of
+          its texts. Each word maps to the set of its entities, and the
+          distinct words are kept in a sorted list searched with bisect.
+
+    Every entity is added, removed or renamed in O(length of its texts). The
+    sorted word list only changes when a word is used for the first time or
+    no entity uses it anymore.
+
+    Attributes:
+        texts (dict): Handle -> indexed texts, (name, type).
+    """
+
+    MIN_TRIGRAM_QUERY = 3
+
+
+    def __init__(self):
+
+        self.texts:dict = {}
+
+        self._trigrams = {}  # trigram -> set of handles
+        self._words    = {}  # word -> set of handles
+        self._sorted   = []  # sorted distinct words, for the prefix queries
+
+
+    def __len__(self):
+        return len(self.texts)
+
+
+    def add(self, handle:int, name:str, kind:str=""):
+        """
+        Indexes an entity. An entity already indexed is re-indexed.
+        """
+
+        if handle in self.texts:
+            self.remove(handle)
+
+        texts = (name.lower(), kind.lower())
+        self.texts[handle] = texts
+
+        for trigram in self._get_trigrams(texts):
+            self._trigrams.setdefault(trigram, set()).add(handle)
+
+        for word in self._get_words(texts):
+            postings = self._words.get(word)
+            if postings is None:
+                postings = self._words[word] = set()
+                bisect.insort(self._sorted, word)
+            postings.add(handle)
+
+
+    def remove(self, handle:int):
+        """
+        Removes an entity from the index. Unknown handles are ignored.
+        """
+
+        texts = self.texts.pop(handle, None)
+        if texts is None:
+            return
+
+        for trigram in self._get_trigrams(texts):
+            postings = self._trigrams[trigram]
+            postings.discard(handle)
+            if not postings:
+                del self._trigrams[trigram]
+
+        for word in self._get_words(texts):
+            postings = self._words[word]
+            postings.discard(handle)
+            if not postings:
+                del self._words[word]
+                del self._sorted[bisect.bisect_left(self._sorted, word)]
+
+
+    def rename(self, handle:int, name:str, kind:str=""):
+        self.add(handle, name, kind)
+
+
+    def query(self, text:str) -> set:
+        """
+        Finds the entities matching a query.
+
+        Args:
+            text (str): The query. Case insensitive, surrounding blanks are
+                        ignored.
+
+        Returns:
+            set: The handles of the matching entities. An empty query matches
+                 nothing, callers show everything in that case.
+        """
+
+        text = text.strip().lower()
+        if not text:
+            return set()
+
+        if len(text) < self.MIN_TRIGRAM_QUERY:
+            return self._query_prefix(text)
+
+        postings = []
+        for trigram in self._get_trigrams((text,)):
+            found = self._trigrams.get(trigram)
+            if not found:
+                return set()
+            postings.append(found)
+
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+
+        # A query longer than a trigram may match all its trigrams in the
+        # wrong order, so the candidates are checked
+        if len(text) == self.MIN_TRIGRAM_QUERY:
+            return candidates
+        return {handle for handle in candidates if any(text in indexed for indexed in self.texts[handle])}
+
+
+    def _query_prefix(self, prefix):
+
+        words = self._sorted
+        start = bisect.bisect_left(words, prefix)
+        end   = bisect.bisect_left(words, prefix + '\uffff', start)
+
+        matches = set()
+        for word in words[start:end]:
+            matches.update(self._words[word])
+        return matches
+
+
+    @staticmethod
+    def _get_trigrams(texts):
+        return {text[i:i + 3] for text in texts for i in range(len(text) - 2)}
+
+
+    @staticmethod
+    def _get_words(texts):
+        return {word for text in texts for word in text.split()}
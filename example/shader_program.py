@@ -2,57 +2,283 @@
 File Name: shader_program.py
 Author: JuanMa Romero Martin <juanma@ihm.solutions>
 Date Created:  2025-02-15
-Last Modified: 2025-03-08
-Description: This module defines a ShaderProgram class for handling shader programs 
-             in a graphical context.
-             
-TODO: 
-    - 
+Last Modified: 2026-10-19
+Description: This module defines a ShaderProgram class for handling shader programs
+             in a graphical context. Shaders are loaded from `assets/shaders`,
+             `#include` directives and defines are resolved by a small
+             preprocessor, compiled programs are cached per source hash and
+             the source files are watched so they can be hot-reloaded.
+
+TODO:
+    - Persist program binaries once moderngl can wrap a program created with
+      glProgramBinary. Until then the driver's own shader cache is used.
 """
 
 import os
+import re
+import sys
+import time
+import hashlib
 from enum import StrEnum
 
+import moderngl
+
+
+
+INCLUDE_REGEX = re.compile(r'^\s*#\s*include\s+["<]([^">]+)[">]\s*$')
+VERSION_REGEX = re.compile(r'^\s*#\s*version\b')
+
+
+
+class ShaderSource:
+    """
+    The preprocessed source of one shader stage.
+
+    Attributes:
+        code (str): The GLSL code with includes and defines resolved.
+        files (list): The files the code was built from. The position of a file
+                      in the list is the source-string number used by the
+                      `#line` directives, so compile errors can be mapped back.
+    """
+
+    def __init__(self, code:str, files:list):
+        self.code  = code
+        self.files = files
+
 
 
 class ShaderProgram:
-    
+
     class ATTRIBS_(StrEnum):
-        POSITION        = "in_position", 
-        COLOR           = "in_color",
-        UV              = "in_texcoord",
-        M_MODEL         = "in_m_model",
-        M_VIEW          = "in_m_view",
-        M_PROJECTION    = "in_m_proj",
-        USE_TEXTURE     = "in_use_texture",
-        TEXTURE0        = "in_texture_0",
-        LIGHT0_POSITION = "in_light0_position",
-        LIGHT0_COLOR    = "in_light0_color",
-        NEAR            = "in_near",
-        FAR             = "in_far",
-        GRID_BASE_SCALE = "in_grid_base_scale",
-        MIN_GRID_SCALE  = "in_min_grid_scale",
-        MAX_GRID_SCALE  = "in_max_grid_scale",
-        
-
-    
-    def __init__(self, ctx):
-        self.ctx = ctx
+        POSITION         = "in_position",
+        COLOR            = "in_color",
+        UV               = "in_texcoord",
+        M_MODEL          = "in_m_model",
+        M_VIEW           = "in_m_view",
+        M_PROJECTION     = "in_m_proj",
+        USE_TEXTURE      = "in_use_texture",
+        TEXTURE0         = "in_texture_0",
+        LIGHT0_POSITION  = "in_light0_position",
+        LIGHT0_COLOR     = "in_light0_color",
+        NEAR             = "in_near",
+        FAR              = "in_far",
+        GRID_BASE_SCALE  = "in_grid_base_scale",
+        MIN_GRID_SCALE   = "in_min_grid_scale",
+        MAX_GRID_SCALE   = "in_max_grid_scale",
+        CAMERA_BLOCK     = "CameraBlock",
+        MULTI_VIEW_BLOCK = "MultiViewBlock",
+
+
+    # Fixed binding points of the uniform blocks shared by all the programs
+    UNIFORM_BLOCK_BINDINGS = {
+        ATTRIBS_.CAMERA_BLOCK:     0,
+        ATTRIBS_.MULTI_VIEW_BLOCK: 1,
+    }
+
+    SHADERS_DIR   = os.path.join(os.path.dirname(__file__), 'assets', 'shaders')
+    POLL_INTERVAL = 0.5 # seconds between two checks of the shader files
+
+    _default = None
+
+
+    def __init__(self, ctx, shaders_dir=SHADERS_DIR):
+        self.ctx         = ctx
+        self.shaders_dir = shaders_dir
+
+        # (name, defines) -> [source hash, program, {path: mtime}]
         self.programs = {}
-        self.programs['default'] = self.get_program('default')
 
-    def get_program(self, shader_program_name):
-        
-        this_dir = os.path.dirname(__file__)
-        
-        with open( this_dir +  f'/assets/shaders/{shader_program_name}.vert') as file:
-            vertex_shader = file.read()
+        # source hash -> program, so variants with identical code share one program
+        self._compiled = {}
+
+        self._last_poll = time.perf_counter()
+
+
+    @staticmethod
+    def get_default(ctx=None):
+        """
+        Returns the shader library shared by the built-in meshes, creating it
+        for `ctx` (or the current moderngl context) on first use.
+        """
+
+        if ShaderProgram._default is None:
+            ShaderProgram._default = ShaderProgram(ctx if ctx else moderngl.get_context())
+        return ShaderProgram._default
+
+
+    def get_program(self, shader_program_name, defines=None):
+        """
+        Returns the program made of `{name}.vert` and `{name}.frag`.
+
+        Args:
+            shader_program_name (str): The base name of the shader files.
+            defines (dict, optional): Extra `#define NAME VALUE` lines used to
+                                      select a variant of the program.
+
+        Returns:
+            moderngl.Program: The compiled program. Calling it again with the
+                              same name and defines returns the same object.
+        """
+
+        key = (shader_program_name, tuple(sorted(defines.items())) if defines else ())
+
+        entry = self.programs.get(key)
+        if entry is None:
+            entry = self._load(key)
+            self.programs[key] = entry
+
+        return entry[1]
+
+
+    def reload_changed(self):
+        """
+        Recompiles the programs whose source files changed on disk.
+
+        It is cheap to call it every frame, the files are only checked every
+        `POLL_INTERVAL` seconds. A program that fails to compile keeps its
+        previous version. Replaced programs are released, so the vertex arrays
+        built with them have to be rebuilt before the next render.
+
+        Returns:
+            list: The (name, defines) keys of the programs that were replaced.
+        """
+
+        now = time.perf_counter()
+        if now - self._last_poll < self.POLL_INTERVAL:
+            return []
+
+        self._last_poll = now
+
+        reloaded = []
+        for key, (source_hash, program, mtimes) in list(self.programs.items()):
+
+            if all(self._mtime(path) == mtime for path, mtime in mtimes.items()):
+                continue
 
-        with open( this_dir + f'/assets/shaders/{shader_program_name}.frag') as file:
-            fragment_shader = file.read()
+            try:
+                entry = self._load(key)
+            except (OSError, moderngl.Error) as error:
+                sys.stderr.write(f"Shader '{key[0]}' reload failed: {error}\n")
+
+                # Do not retry until the files change again
+                self.programs[key][2] = {path: self._mtime(path) for path in mtimes}
+                continue
+
+            self.programs[key] = entry
+
+            if entry[1] is not program:
+                if not any(other[1] is program for other in self.programs.values()):
+                    self._compiled.pop(source_hash, None)
+                    program.release()
+                reloaded.append(key)
+
+        return reloaded
+
+
+    def preprocess(self, path, defines=None):
+        """
+        Resolves the `#include` directives of a shader file and injects the
+        defines right after its `#version` line.
+
+        Includes are looked up relative to the including file first and then
+        relative to the shaders directory. Every file is included only once.
+
+        Args:
+            path (str): The path of the shader file.
+            defines (tuple, optional): (name, value) pairs to define.
+
+        Returns:
+            ShaderSource: The preprocessed code and the files it depends on.
+        """
+
+        files = []
+        lines = self._expand(os.path.abspath(path), files)
+
+        if defines:
+            define_lines = [f'#define {name} {value}' for name, value in defines]
+            at = next((i + 1 for i, line in enumerate(lines) if VERSION_REGEX.match(line)), 0)
+            define_lines.append(f'#line {at + 1} 0')
+            lines[at:at] = define_lines
+
+        return ShaderSource('\n'.join(lines) + '\n', files)
+
+
+    def _expand(self, path, files):
+
+        files.append(path)
+        file_index = len(files) - 1
+
+        with open(path) as file:
+            source_lines = file.read().splitlines()
+
+        lines = []
+        for line_number, line in enumerate(source_lines, start=1):
+
+            match = INCLUDE_REGEX.match(line)
+            if not match:
+                lines.append(line)
+                continue
+
+            include_path = self._resolve_include(match.group(1), os.path.dirname(path))
+            if include_path not in files:
+                lines.append(f'#line 1 {len(files)}')
+                lines.extend(self._expand(include_path, files))
+            lines.append(f'#line {line_number + 1} {file_index}')
+
+        return lines
+
+
+    def _resolve_include(self, include, current_dir):
+
+        for base_dir in (current_dir, self.shaders_dir):
+            include_path = os.path.abspath(os.path.join(base_dir, include))
+            if os.path.isfile(include_path):
+                return include_path
+
+        raise FileNotFoundError(f"Shader include '{include}' not found (from {current_dir})")
+
+
+    def _load(self, key):
+
+        shader_program_name, defines = key
+
+        vertex_shader   = self.preprocess(os.path.join(self.shaders_dir, f'{shader_program_name}.vert'), defines)
+        fragment_shader = self.preprocess(os.path.join(self.shaders_dir, f'{shader_program_name}.frag'), defines)
+
+        source_hash = hashlib.sha1(f'{vertex_shader.code}\0{fragment_shader.code}'.encode()).hexdigest()
+
+        program = self._compiled.get(source_hash)
+        if program is None:
+            try:
+                program = self.ctx.program(vertex_shader=vertex_shader.code, fragment_shader=fragment_shader.code)
+            except moderngl.Error as error:
+                vertex_files   = ', '.join(f'{i}: {path}' for i, path in enumerate(vertex_shader.files))
+                fragment_files = ', '.join(f'{i}: {path}' for i, path in enumerate(fragment_shader.files))
+                raise moderngl.Error(f"{error}\nVertex source strings: {vertex_files}"
+                                     f"\nFragment source strings: {fragment_files}") from error
+
+            for block_name, binding in self.UNIFORM_BLOCK_BINDINGS.items():
+                if block_name in program:
+                    program[block_name].binding = binding
+
+            self._compiled[source_hash] = program
+
+        mtimes = {path: self._mtime(path) for path in vertex_shader.files + fragment_shader.files}
+        return [source_hash, program, mtimes]
+
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
 
-        program = self.ctx.program(vertex_shader=vertex_shader, fragment_shader=fragment_shader)
-        return program
 
     def destroy(self):
-        [program.release() for program in self.programs.values()]
+        [program.release() for program in self._compiled.values()]
+        self._compiled.clear()
+        self.programs.clear()
+
+        if ShaderProgram._default is self:
+            ShaderProgram._default = None
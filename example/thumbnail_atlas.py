@@ -0,0 +1,334 @@
+"""
+File Name: thumbnail_atlas.py
+Author: JuanMa Romero Martin <juanma@ihm.solutions>
+Date Created:  2026-10-19
+Last Modified: 2026-10-19
+Description: This module provides the ThumbnailAtlas, which renders many small
+             previews of entities into the tiles of one atlas texture. Each tile
+             has its own viewport and orbit camera, only the dirty tiles are
+             re-rendered, within a time budget per frame, and ImGui shows them
+             with `imgui.image` and the UVs of their tile, so all the previews
+             share one texture.
+
+TODO:
+    -
+"""
+
+import time
+
+import glm
+import moderngl
+import numpy as np
+from imgui_bundle import imgui
+
+from camera_buffer import CameraUniformBuffer
+from entity_store import EntityStore
+from scene_buffer import SceneSnapshot
+from multi_view import orbit_view_matrices
+from offscreen import create_framebuffer
+
+
+
+class Thumbnail:
+    """
+    One tile of the atlas.
+
+    Attributes:
+        index (int): The index of the tile in the atlas.
+        handles (list): The entities drawn in the tile.
+        yaw (float): The yaw of its orbit camera, in degrees.
+        pitch (float): The pitch of its orbit camera, in degrees.
+        distance (float): The distance of its camera to the target.
+        target (tuple): The point its camera looks at, or None to follow the
+                        first entity.
+        dirty (bool): It has to be rendered again.
+        rendered_at (float): The `perf_counter()` time it was last rendered.
+    """
+
+    __slots__ = ('index', 'handles', 'yaw', 'pitch', 'distance', 'target', 'dirty', 'rendered_at')
+
+    def __init__(self, index:int, handles:list, yaw:float, pitch:float, distance:float, target:tuple):
+        self.index       = index
+        self.handles     = handles
+        self.yaw         = yaw
+        self.pitch       = pitch
+        self.distance    = distance
+        self.target      = target
+        self.dirty       = True
+        self.rendered_at = 0.0
+
+
+
+class ThumbnailAtlas:
+    """
+    ThumbnailAtlas class
+
+    The atlas is a square grid of `tile_size` tiles in one framebuffer. Each
+    tile is rendered with its own viewport (the depth and colour are cleared
+    only inside it) and its own camera data, and only draws its entities.
+
+    `update()` advances the rotation of the previews and marks them dirty,
+    `render()` then renders the dirty tiles that have waited the longest
+    until the time budget of the frame is spent, so the cost per frame stays
+    bounded however many previews there are, and the previews just refresh
+    less often.
+
+    Attributes:
+        tile_size (int): The width and height of each tile, in pixels.
+        columns (int): The tiles per row (and rows) of the atlas.
+        budget (float): The seconds `render()` may spend per frame. At least
+                        one tile is rendered per call.
+        rotation_speed (float): The yaw speed of the previews, in degrees per
+                                second. 0 renders each preview once.
+        fov (float): The vertical field of view of the previews, in degrees.
+        texture (moderngl.Texture): The atlas texture.
+    """
+
+    NEAR = 0.1
+    FAR  = 1000.0
+
+
+    def __init__(self, ctx:moderngl.Context, store:EntityStore=None, tile_size:int=128, capacity:int=256,
+                 budget:float=0.004, rotation_speed:float=30.0):
+
+        self.ctx            = ctx
+        self.store          = store if store else EntityStore.get_default()
+        self.tile_size      = tile_size
+        self.budget         = budget
+        self.rotation_speed = rotation_speed
+        self.fov            = 35.0
+
+        max_columns  = ctx.info['GL_MAX_TEXTURE_SIZE'] // tile_size
+        self.columns = min(max(int(np.ceil(np.sqrt(capacity))), 1), max_columns)
+
+        size = self.columns * tile_size
+        self.fbo, self.texture = create_framebuffer(ctx, size, size)
+        self.fbo.clear(0.0, 0.0, 0.0, 0.0)
+
+        self.camera_ubo = CameraUniformBuffer(ctx)
+
+        self.thumbnails:dict = {}  # key -> Thumbnail
+        self._free           = list(range(self.columns * self.columns - 1, -1, -1))
+
+        self._projection = glm.perspective(glm.radians(self.fov), 1.0, self.NEAR, self.FAR)
+
+        self._structure_version = None
+        self._scene_version     = None
+
+
+    @property
+    def capacity(self) -> int:
+        return self.columns * self.columns
+
+
+    def add(self, key, handles, distance:float=4.0, yaw:float=-60.0, pitch:float=25.0, target=None) -> Thumbnail:
+        """
+        Adds a preview.
+
+        Args:
+            key: Any hashable to find the preview again, e.g. an entity handle.
+            handles (int | list): The entity or entities drawn in the preview.
+            distance (float, optional): The distance of the camera to the target.
+            yaw (float, optional): The initial yaw of the camera, in degrees.
+            pitch (float, optional): The pitch of the camera, in degrees.
+            target (tuple, optional): The point looked at. Defaults to the
+                                      position of the first entity, updated
+                                      when it moves.
+
+        Returns:
+            Thumbnail: The tile of the preview.
+        """
+
+        if key in self.thumbnails:
+            self.remove(key)
+
+        if not self._free:
+            raise RuntimeError(f"The thumbnail atlas is full ({self.capacity} tiles)")
+
+        handles = [handles] if isinstance(handles, int) else list(handles)
+
+        thumbnail = Thumbnail(self._free.pop(), handles, yaw, pitch, distance, target)
+        self.thumbnails[key] = thumbnail
+        return thumbnail
+
+
+    def remove(self, key):
+
+        thumbnail = self.thumbnails.pop(key, None)
+        if thumbnail is not None:
+            self._free.append(thumbnail.index)
+
+
+    def sync_entities(self, handles=None, **kwargs):
+        """
+        Keeps one preview per entity of the store, keyed by its handle: adds
+        the new entities and removes the destroyed ones. Cheap when the store
+        structure did not change.
+
+        Args:
+            handles (list, optional): The entities to preview. Defaults to all.
+            **kwargs: Passed to `add()` for the new previews.
+        """
+
+        if handles is None:
+            if self._structure_version == self.store.structure_version:
+                return
+            self._structure_version = self.store.structure_version
+            handles = self.store.handles()
+
+        handles = set(handles)
+        for key in [key for key in self.thumbnails if key not in handles]:
+            self.remove(key)
+
+        for handle in sorted(handles):
+            if handle not in self.thumbnails and self._free:
+                self.add(handle, handle, **kwargs)
+
+
+    def invalidate(self, key=None):
+        """
+        Marks a preview, or all of them, to be rendered again.
+        """
+
+        for thumbnail in (self.thumbnails.values() if key is None else (self.thumbnails[key],)):
+            thumbnail.dirty = True
+
+
+    def update(self, delta_time:float):
+        """
+        Advances the rotation of the previews. When the scene was edited
+        since the last update every preview is invalidated.
+
+        Args:
+            delta_time (float): The seconds since the last update.
+        """
+
+        if self._scene_version != self.store.version:
+            self._scene_version = self.store.version
+            self.invalidate()
+
+        if not self.rotation_speed:
+            return
+
+        delta_yaw = self.rotation_speed * delta_time
+        for thumbnail in self.thumbnails.values():
+            thumbnail.yaw   = (thumbnail.yaw + delta_yaw) % 360.0
+            thumbnail.dirty = True
+
+
+    def render(self, snapshot:SceneSnapshot=None) -> int:
+        """
+        Renders the dirty tiles, the ones that waited the longest first, until
+        the time budget is spent.
+
+        Args:
+            snapshot (SceneSnapshot, optional): The snapshot of the frame.
+                                                Defaults to the current one of
+                                                the store, it is not swapped
+                                                again.
+
+        Returns:
+            int: The number of tiles rendered.
+        """
+
+        dirty = [thumbnail for thumbnail in self.thumbnails.values() if thumbnail.dirty]
+        if not dirty:
+            return 0
+
+        start = time.perf_counter()
+        dirty.sort(key=lambda thumbnail: thumbnail.rendered_at)
+
+        # The view matrices of all the dirty tiles in one call
+        views = orbit_view_matrices([thumbnail.yaw      for thumbnail in dirty],
+                                    [thumbnail.pitch    for thumbnail in dirty],
+                                    [thumbnail.distance for thumbnail in dirty])
+
+        snapshot = snapshot if snapshot else self.store.snapshot
+        matrices = self.store.model_matrices(snapshot)
+
+        self.fbo.use()
+
+        rendered = 0
+        for thumbnail, m_view in zip(dirty, views):
+
+            if rendered and time.perf_counter() - start > self.budget:
+                break
+
+            viewport = self.get_viewport(thumbnail.index)
+            self.ctx.viewport = viewport
+            self.ctx.clear(0.125, 0.125, 0.125, 1.0, viewport=viewport)
+
+            target = thumbnail.target
+            if target is None:
+                target = snapshot.position[thumbnail.handles[0]] if thumbnail.handles else (0, 0, 0)
+
+            # The orbit is computed around the origin, the target is moved there
+            m_view = glm.mat4(*m_view.ravel()) * glm.translate(-glm.vec3(*target))
+            self.camera_ubo.write(m_view, self._projection, self.NEAR, self.FAR)
+
+            for handle in thumbnail.handles:
+                self._draw_entity(snapshot, matrices, handle)
+
+            thumbnail.dirty       = False
+            thumbnail.rendered_at = time.perf_counter()
+            rendered += 1
+
+        return rendered
+
+
+    def _draw_entity(self, snapshot, matrices, handle):
+
+        if handle >= snapshot.count or not snapshot.visible[handle] or snapshot.geometry_id[handle] < 0 or snapshot.material_id[handle] < 0:
+            return
+
+        binding = self.store.get_binding(int(snapshot.geometry_id[handle]), int(snapshot.material_id[handle]))
+
+        if binding.u_use_texture:
+            binding.u_use_texture.value = binding.texture is not None
+
+        if binding.texture:
+            binding.texture.use()
+
+        binding.u_model.write(matrices[handle])
+        binding.vao.render(binding.render_mode)
+
+
+    def get_viewport(self, index:int) -> tuple:
+        """
+        Returns the (x, y, width, height) of a tile in the atlas, in pixels.
+        """
+
+        row, column = divmod(index, self.columns)
+        return (column * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size)
+
+
+    def get_uvs(self, index:int) -> tuple:
+        """
+        Returns the (uv0, uv1) of a tile for `imgui.image`, flipped from
+        OpenGL's bottom-left origin to ImGui's top-left one.
+        """
+
+        row, column = divmod(index, self.columns)
+        step = 1.0 / self.columns
+        return (column * step, (row + 1) * step), ((column + 1) * step, row * step)
+
+
+    def image(self, key, size:float=None):
+        """
+        Draws a preview with `imgui.image`. All the previews sample the same
+        texture, so ImGui batches them in the same draw call.
+
+        Args:
+            key: The key the preview was added with.
+            size (float, optional): The displayed size. Defaults to the tile size.
+        """
+
+        uv0, uv1 = self.get_uvs(self.thumbnails[key].index)
+        size     = size if size else self.tile_size
+        imgui.image(self.texture.glo, (size, size), uv0, uv1)
+
+
+    def release(self):
+        self.camera_ubo.release()
+        self.fbo.release()
+        self.texture.release()